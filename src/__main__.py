@@ -1,66 +1,139 @@
-import typer
+import sys
 
-from src.code_generator import CodeGenerator
-from src.json_parser import extract_json, filter_json
-from src.visitor import Visitor
+from src.cli import add_compile_options, add_flag, create_parser
 
 
-def main(
-    input_filename: str = typer.Argument(
-        ..., help="The path to the file that should be converted."
-    ),
-    output_filename: str = typer.Option(
-        "",
+def main_parser():
+    parser = create_parser(
+        "python -m src",
+        "Compiles a Mindstorms .lms file to Python. Use 'python -m src batch --help' and 'python -m src serve --help' for the batch mode and the compile server.",
+    )
+    parser.add_argument(
+        "input_filename", help="The path to the file that should be converted."
+    )
+    parser.add_argument(
+        "--output-filename",
+        default="",
         help="The name of the file the code should be written to. If none is provided the code will just be printed.",
-    ),
-    ast: bool = typer.Option(
-        False, help="Indicates if the AST representation should also be outputted."
-    ),
-    ast_filename: str = typer.Option(
-        "",
+    )
+    add_flag(
+        parser,
+        "ast",
+        False,
+        "Indicates if the AST representation should also be outputted.",
+    )
+    parser.add_argument(
+        "--ast-filename",
+        default="",
         help="Indicates where to write the AST representation to if --ast is used. If none is provided the representation will just be printed.",
-    ),
-    safe: bool = typer.Option(
+    )
+    add_compile_options(
+        parser,
+        "The directory in which compiled projects are cached, an unchanged project is then not compiled again. If none is provided nothing is cached.",
+    )
+    add_flag(
+        parser,
+        "profile",
         False,
-        help="Indicates if safer code should be outputted, the code might be more verbose.",
-    ),
-    best_effort: bool = typer.Option(
-        True,
-        help="Indicates if the code should be generated even if it contains blocks that are not translatable (will be skipped).",
-    ),
+        "Indicates if a profile of the compilation (the wall time and peak memory of every stage, the number of nodes per AST class and of blocks per opcode) should be written to stderr. The cache is not used when profiling.",
+    )
+    parser.add_argument(
+        "--profile-format",
+        default="text",
+        choices=["text", "json"],
+        help="The format the profile is written in if --profile is used.",
+    )
+    return parser
+
+
+def main(
+    input_filename: str,
+    output_filename: str = "",
+    ast: bool = False,
+    ast_filename: str = "",
+    safe: bool = False,
+    best_effort: bool = True,
+    optimize: bool = False,
+    cache_dir: str = "",
+    profile: bool = False,
+    profile_format: str = "text",
 ):
-    # Extract the JSON from the input file
-    concrete_syntax_tree = filter_json(extract_json(input_filename))
-    # print(json.dumps(concrete_syntax_tree, indent=2)) # Print the interesting file content
+    # Extract the JSON, generate the AST and the code (unless the cache already holds them)
+    # The compiler is only imported now, so --help and argument errors don't have to wait for it
+    if profile:
+        from src.profiling import profile_file
+
+        compilation, report = profile_file(
+            input_filename, safe, best_effort, ast, optimize
+        )
+    else:
+        from src.compiler import compile_lms
+
+        cache = None
+        if cache_dir:
+            from src.cache import CompilationCache
 
-    # Generate the AST
-    visitor = Visitor(best_effort)
-    abstract_syntax_tree = visitor.visit(concrete_syntax_tree)
+            cache = CompilationCache(cache_dir)
+        # The AST representation is written to ast_filename by the compiler itself, so it can be streamed
+        compilation = compile_lms(
+            input_filename,
+            safe,
+            best_effort,
+            ast,
+            cache,
+            ast_filename or None,
+            optimize,
+        )
 
     # Output the AST
     if ast:
         if ast_filename == "":
             print(f"{'-'*10} Begin: AST Representation {'-'*10}")
-            print(abstract_syntax_tree.tree_representation())
+            compilation.write_ast_representation(sys.stdout)
+            print()
             print(f"{'-'*10} End: AST Representation {'-'*10}")
-        else:
+        elif compilation.ast_representation is not None:
             f = open(ast_filename, "x")
-            f.write(abstract_syntax_tree.tree_representation())
+            f.write(compilation.ast_representation)
             f.close()
 
-    # Generate the code
-    code_generator = CodeGenerator(safe)
-
     # Output the Code
     if output_filename == "":
         print(f"{'-'*10} Begin: Code {'-'*10}")
-        print(code_generator.generate(abstract_syntax_tree))
+        print(compilation.code)
         print(f"{'-'*10} End: Code {'-'*10}")
     else:
         f = open(output_filename, "x")
-        f.write(code_generator.generate(abstract_syntax_tree))
+        f.write(compilation.code)
         f.close()
 
+    # Output what the optimizer changed, to stderr so it does not mix with the code
+    for change in compilation.report:
+        print(change, file=sys.stderr)
+
+    # Output the profile, to stderr so it does not mix with the code
+    if profile:
+        print(report.to_json() if profile_format == "json" else report, file=sys.stderr)
+
+
+def run(arguments: list) -> int:
+    """Runs the command that is selected by the arguments.
+
+    :param arguments: The command line arguments, without the name of the program.
+    :return: The exit code.
+    """
+    if arguments and arguments[0] == "batch":
+        # python -m src batch DIRECTORY [OPTIONS] compiles an entire directory tree
+        from src.batch import batch, batch_parser
+
+        return batch(**vars(batch_parser().parse_args(arguments[1:])))
+    if arguments and arguments[0] == "serve":
+        # python -m src serve [OPTIONS] starts a compile server
+        from src.server import serve, serve_parser
+
+        return serve(**vars(serve_parser().parse_args(arguments[1:])))
+    return main(**vars(main_parser().parse_args(arguments)))
+
 
 if __name__ == "__main__":
-    typer.run(main)
+    sys.exit(run(sys.argv[1:]))
@@ -1,12 +1,10 @@
-class UIDGenerator:
-    """Simple UID generator."""
+import io
+import shutil
+import tempfile
+from typing import TextIO
 
-    def __init__(self) -> None:
-        self.count = -1
-
-    def get_uid(self) -> int:
-        self.count += 1
-        return self.count
+# Number of characters of connections that are kept in memory before they are spooled to disk
+SPOOL_THRESHOLD = 1024 * 1024
 
 
 class AST:
@@ -19,6 +17,17 @@ class AST:
     def __init__(self) -> None:
         self.hat_nodes = []
 
+    def nodes(self):
+        """Iterates over all the nodes of the AST, without recursion so even very long stacks can be handled.
+
+        :return: Generator of all the nodes (depth first).
+        """
+        pending = list(reversed(self.hat_nodes))
+        while pending:
+            node = pending.pop()
+            yield node
+            pending.extend(reversed(node.children()))
+
     def tree_representation(self, file_name: str = None) -> str:
         """Generates a dot representation of the AST and writes it to a file is file_name is provided.
 
@@ -27,104 +36,93 @@ class AST:
         :return: The dot source code, or a string specifying where the code is written to.
         :rtype: str
         """
-        nodes = []
-        connections = []
-        uid_generator = UIDGenerator()
-        for hat_root in self.hat_nodes:
-            hat_root.generate_tree_representation(nodes, connections, -1, uid_generator)
-
-        full_representation = (
-            'digraph {rankdir="TB"\n'
-            + "\n".join(nodes)
-            + "\n"
-            + "\n".join(connections)
-            + "}"
-        )
-
         if file_name:
-            with open(file_name + ".gv", "a") as file:
-                file += full_representation
+            with open(file_name + ".gv", "w") as file:
+                self.write_tree_representation(file)
             return f"The representation is written to {file_name}.gv"
         else:
-            return full_representation
+            representation = io.StringIO()
+            self.write_tree_representation(representation)
+            return representation.getvalue()
+
+    def write_tree_representation(self, file: TextIO):
+        """Writes a dot representation of the AST to a file while the tree is walked (without recursion),
+        so the representation is never held in memory as a whole.
+        The nodes are written right away, the connections are spooled (to disk once they get large) and
+        written after the nodes.
+
+        :param file: The text file (or stream) to write the representation to.
+        :type file: TextIO
+        """
+        file.write('digraph {rankdir="TB"\n')
+        with tempfile.SpooledTemporaryFile(
+            max_size=SPOOL_THRESHOLD, mode="w+"
+        ) as connections:
+            # Every node gets the next uid in depth first order, together with the uid of its parent
+            node_id = -1
+            separator = ""
+            pending = [(hat_root, -1) for hat_root in reversed(self.hat_nodes)]
+            while pending:
+                node, parent_id = pending.pop()
+                node_id += 1
+                file.write(f'{node_id} [label="{node}"]\n')
+                if parent_id != -1:
+                    connections.write(f"{separator}{parent_id} -> {node_id}")
+                    separator = "\n"
+                pending.extend((child, node_id) for child in reversed(node.children()))
+            if node_id == -1:
+                file.write("\n")
+
+            connections.seek(0)
+            shutil.copyfileobj(connections, file)
+        file.write("}")
 
 
 class Node:
     """Base class for all the nodes that can be found in the AST."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         pass
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Should be called if there is any custom representation logic that needs to be done
-        pass
+    def children(self) -> list:
+        """Lists the nodes this node refers to, based on the __slots__ of its classes.
+        The attributes of the class itself come first, so the next node of a stack node is always last.
 
-    def generate_tree_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        """Generates the representation for this node
-
-        :param nodes: Decelerations of all the nodes.
-        :type nodes: list
-        :param connections: Connections between the nodes.
-        :type connections: list
-        :param parent_id: The id of the parent node.
-        :type parent_id: int
-        :param uid_generator: UID-generator so that every node can generates its own uid.
-        :type uid_generator: UIDGenerator
+        :return: List of the child nodes.
+        :rtype: list
         """
-        # Claim a node_id and update the node_counter
-        node_id = uid_generator.get_uid()
-        # Add the node representation to nodes, based on __str__
-        nodes.append(f'{node_id} [label="{self}"]')
-        # Connect to parent, unless it is the first node
-        if parent_id != -1:
-            connections.append(f"{parent_id} -> {node_id}")
-        # Do any custom logic if necessary
-        self.custom_representation(nodes, connections, node_id, uid_generator)
+        children = []
+        for cls in type(self).__mro__:
+            for field in cls.__dict__.get("__slots__", ()):
+                value = getattr(self, field, None)
+                if isinstance(value, Node):
+                    children.append(value)
+                elif isinstance(value, (list, tuple)):
+                    children.extend(item for item in value if isinstance(item, Node))
+        return children
 
 
 class BooleanNode(Node):
-    pass
+    __slots__ = ()
 
 
 class StackNode(Node):
     """The Base class for all Stack block, that are blocks which have a next pointer."""
 
+    __slots__ = ("next",)
+
     def __init__(self, next) -> None:
         super().__init__()
         self.next = next
 
-    def generate_tree_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        # Claim a node_id and update the node_counter
-        node_id = uid_generator.get_uid()
-        # Add the node representation to nodes, based on __str__
-        nodes.append(f'{node_id} [label="{self}"]')
-        # Connect to parent, unless it is the first node
-        if parent_id != -1:
-            connections.append(f"{parent_id} -> {node_id}")
-        # Do any custom logic if necessary
-        self.custom_representation(nodes, connections, node_id, uid_generator)
-        # If there is a next node also generate the representation for it
-        if self.next:
-            self.next.generate_tree_representation(
-                nodes, connections, node_id, uid_generator
-            )
-
 
 class NumericalNode(Node):
     """Class to represent any numerical value, float or int."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value) -> None:
         super().__init__()
         self.value = value  # Could be both Float or Int
@@ -136,6 +134,8 @@ class NumericalNode(Node):
 class LiteralNode(Node):
     """Class to represent any string literal."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value) -> None:
         super().__init__()
         self.value = value  # String
@@ -144,9 +144,24 @@ class LiteralNode(Node):
         return f"LiteralNode('{self.value}')"
 
 
+class BooleanLiteralNode(BooleanNode):
+    """Class to represent True or False, only the optimizer creates them (e.g. for a comparison of constants)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool) -> None:
+        super().__init__()
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"BooleanLiteralNode({self.value})"
+
+
 class CommentNode(StackNode):
     """Class to represent any comment."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value, next: Node) -> None:
         super().__init__(next)
         self.value = value  # String
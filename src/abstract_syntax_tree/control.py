@@ -1,9 +1,11 @@
-from src.abstract_syntax_tree import BooleanNode, Node, StackNode, UIDGenerator
+from src.abstract_syntax_tree import BooleanNode, CommentNode, Node, StackNode
 
 
 class IfThenNode(StackNode):
     """Class to represent If then block."""
 
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: BooleanNode, body: Node, next: Node) -> None:
         super().__init__(next)
         self.condition = condition
@@ -12,25 +14,12 @@ class IfThenNode(StackNode):
     def __str__(self) -> str:
         return "IfThenNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.condition.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
-        self.body.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class WaitForSecondsNode(StackNode):
     """Class to represent WaitForSeconds block."""
 
+    __slots__ = ("seconds",)
+
     def __init__(self, seconds: Node, next: Node) -> None:
         super().__init__(next)
         self.seconds = seconds
@@ -38,21 +27,12 @@ class WaitForSecondsNode(StackNode):
     def __str__(self) -> str:
         return "WaitForSecondsNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.seconds.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class WaitUntilNode(StackNode):
     """Class to represent WaitUntil block."""
 
+    __slots__ = ("condition",)
+
     def __init__(self, condition: BooleanNode, next: Node) -> None:
         super().__init__(next)
         self.condition = condition
@@ -60,21 +40,12 @@ class WaitUntilNode(StackNode):
     def __str__(self) -> str:
         return "WaitUntilNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.condition.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class RepeatLoopNode(StackNode):
     """Class to represent Repeat Loop block."""
 
+    __slots__ = ("times", "body")
+
     def __init__(self, times: Node, body: Node, next: Node) -> None:
         super().__init__(next)
         self.times = times
@@ -83,25 +54,12 @@ class RepeatLoopNode(StackNode):
     def __str__(self) -> str:
         return "RepeatLoopNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.times.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
-        self.body.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class ForeverLoopNode(StackNode):
     """Class to represent Forever Loop block."""
 
+    __slots__ = ("body",)
+
     def __init__(self, body: Node, next: Node) -> None:
         super().__init__(next)
         self.body = body
@@ -109,21 +67,12 @@ class ForeverLoopNode(StackNode):
     def __str__(self) -> str:
         return "ForeverLoopNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.body.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class RepeatUntilNode(StackNode):
     """Class to represent Repeat Until block."""
 
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: BooleanNode, body: Node, next: Node) -> None:
         super().__init__(next)
         self.condition = condition
@@ -132,25 +81,12 @@ class RepeatUntilNode(StackNode):
     def __str__(self) -> str:
         return "RepeatUntilNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.condition.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
-        self.body.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class IfElseNode(StackNode):
     """Class to represent If Else block."""
 
+    __slots__ = ("condition", "body", "else_body")
+
     def __init__(
         self, condition: BooleanNode, body: Node, else_body: Node, next: Node
     ) -> None:
@@ -162,21 +98,9 @@ class IfElseNode(StackNode):
     def __str__(self) -> str:
         return "IfElseNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.condition.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
-        self.body.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
-        self.else_body.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
+
+class StopNode(CommentNode):
+    """Class to represent the Stop block, it ends the stack so the blocks after it are never run.
+    It is generated as a placeholder comment, like any other comment."""
+
+    __slots__ = ()
@@ -1,11 +1,13 @@
 from enum import Enum
 
-from src.abstract_syntax_tree import Node, StackNode, UIDGenerator
+from src.abstract_syntax_tree import Node, StackNode
 
 
 class TurnOnForDurationNode(StackNode):
     """Class to represent the TurnOnForDuration block."""
 
+    __slots__ = ("image", "duration")
+
     def __init__(self, image, duration: Node, next: Node) -> None:
         super().__init__(next)
         self.image = image
@@ -14,21 +16,12 @@ class TurnOnForDurationNode(StackNode):
     def __str__(self) -> str:
         return f"TurnOnForDurationNode(image: '{self.image}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.duration.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class TurnOnNode(StackNode):
     """Class to represent the TurnOnForDuration block."""
 
+    __slots__ = ("image",)
+
     def __init__(self, image, next: Node) -> None:
         super().__init__(next)
         self.image = image
@@ -40,6 +33,8 @@ class TurnOnNode(StackNode):
 class WriteNode(StackNode):
     """Class to represent the WriteNode block."""
 
+    __slots__ = ("text",)
+
     def __init__(self, text: Node, next: Node) -> None:
         super().__init__(next)
         self.text = text
@@ -47,21 +42,12 @@ class WriteNode(StackNode):
     def __str__(self) -> str:
         return "WriteNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.text.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class TurnOffPixelsNode(StackNode):
     """Class to represent the TurnOffPixels block."""
 
+    __slots__ = ()
+
     def __init__(self, next: Node) -> None:
         super().__init__(next)
 
@@ -72,6 +58,8 @@ class TurnOffPixelsNode(StackNode):
 class SetPixelBrightnessNode(StackNode):
     """Class to represent the SetPixelBrightness block."""
 
+    __slots__ = ("brightness",)
+
     def __init__(self, brightness: Node, next: Node) -> None:
         super().__init__(next)
         self.brightness = brightness
@@ -79,21 +67,12 @@ class SetPixelBrightnessNode(StackNode):
     def __str__(self) -> str:
         return "SetPixelBrightnessNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.brightness.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class SetPixelNode(StackNode):
     """Class to represent the SetPixel block."""
 
+    __slots__ = ("x", "y", "brightness")
+
     def __init__(self, x: Node, y: Node, brightness: Node, next: Node) -> None:
         super().__init__(next)
         self.x = x
@@ -103,23 +82,6 @@ class SetPixelNode(StackNode):
     def __str__(self) -> str:
         return "SetPixelNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.x.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.y.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.brightness.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class CenterButtonColor(Enum):
     """Enum for the color of the center button."""
@@ -160,6 +122,8 @@ class CenterButtonColor(Enum):
 class SetCenterButtonNode(StackNode):
     """Class to represent the SetCenterButton block."""
 
+    __slots__ = ("color",)
+
     def __init__(self, color: CenterButtonColor, next: Node) -> None:
         super().__init__(next)
         self.color = color
@@ -171,6 +135,8 @@ class SetCenterButtonNode(StackNode):
 class LightUpDistanceSensorNode(StackNode):
     """Class to represent the LightUpDistanceSensor block."""
 
+    __slots__ = ("port", "pattern")
+
     def __init__(self, port: Node, pattern, next: Node) -> None:
         super().__init__(next)
         self.port = port
@@ -178,14 +144,3 @@ class LightUpDistanceSensorNode(StackNode):
 
     def __str__(self) -> str:
         return f"LightUpDistanceSensorNode(pattern: '{self.pattern}')"
-
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.port.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
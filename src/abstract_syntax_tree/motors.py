@@ -1,6 +1,6 @@
 from enum import Enum
 
-from src.abstract_syntax_tree import Node, StackNode, UIDGenerator
+from src.abstract_syntax_tree import Node, StackNode
 
 
 class TurnDirection(Enum):
@@ -24,6 +24,8 @@ class Unit(Enum):
 class RunMotorForDurationNode(StackNode):
     """Class to represent RunMotorForDuration blocks."""
 
+    __slots__ = ("ports", "direction", "value", "unit")
+
     def __init__(
         self, ports: Node, direction: TurnDirection, value: Node, unit: Unit, next: Node
     ) -> None:
@@ -38,20 +40,6 @@ class RunMotorForDurationNode(StackNode):
             f"RunMotorForDurationNode(direction:'{self.direction}', unit:'{self.unit}')"
         )
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.ports.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class GoDirection(Enum):
     """Enum for the directions that can be used in the MotorGoToPosition blocks."""
@@ -67,6 +55,8 @@ class GoDirection(Enum):
 class MotorGoToPositionNode(StackNode):
     """Class to represent MotorGoToPosition block."""
 
+    __slots__ = ("ports", "direction", "value")
+
     def __init__(
         self, ports: Node, direction: GoDirection, value: Node, next: Node
     ) -> None:
@@ -78,24 +68,12 @@ class MotorGoToPositionNode(StackNode):
     def __str__(self) -> str:
         return f"MotorGoToPositionNode(direction:'{self.direction}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.ports.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class StartMotorNode(StackNode):
     """Class to represent StartMotor block."""
 
+    __slots__ = ("ports", "direction")
+
     def __init__(self, ports: Node, direction: TurnDirection, next: Node) -> None:
         super().__init__(next)
         self.ports = ports
@@ -104,21 +82,12 @@ class StartMotorNode(StackNode):
     def __str__(self) -> str:
         return f"StartMotorNode(direction:'{self.direction}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.ports.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class StopMotorNode(StackNode):
     """Class to represent StopMotor block."""
 
+    __slots__ = ("ports",)
+
     def __init__(self, ports: Node, next: Node) -> None:
         super().__init__(next)
         self.ports = ports
@@ -126,21 +95,12 @@ class StopMotorNode(StackNode):
     def __str__(self) -> str:
         return "StopMotorNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.ports.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class SetMotorSpeedNode(StackNode):
     """Class to represent SetMotorSpeed block."""
 
+    __slots__ = ("ports", "value")
+
     def __init__(self, ports: Node, value: Node, next: Node) -> None:
         super().__init__(next)
         self.ports = ports
@@ -149,24 +109,12 @@ class SetMotorSpeedNode(StackNode):
     def __str__(self) -> str:
         return "SetMotorSpeedNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.ports.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class MotorPositionNode(StackNode):
     """Class to represent MotorPosition block."""
 
+    __slots__ = ("port",)
+
     def __init__(self, port: Node, next: Node) -> None:
         super().__init__(next)
         self.port = port
@@ -174,35 +122,15 @@ class MotorPositionNode(StackNode):
     def __str__(self) -> str:
         return "MotorPositionNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.port.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class MotorSpeedNode(StackNode):
     """Class to represent MotorSpeed block."""
 
+    __slots__ = ("port",)
+
     def __init__(self, port: Node, next: Node) -> None:
         super().__init__(next)
         self.port = port
 
     def __str__(self) -> str:
         return "MotorSpeedNode"
-
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.port.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
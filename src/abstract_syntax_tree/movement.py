@@ -1,11 +1,13 @@
 from enum import Enum
 
-from src.abstract_syntax_tree import Node, StackNode, UIDGenerator
+from src.abstract_syntax_tree import Node, StackNode
 
 
 class SetMovementMotorsNode(StackNode):
     """Class to represent the SetMovementMotors block."""
 
+    __slots__ = ("ports",)
+
     def __init__(self, ports: Node, next: Node) -> None:
         super().__init__(next)
         self.ports = ports
@@ -13,17 +15,6 @@ class SetMovementMotorsNode(StackNode):
     def __str__(self) -> str:
         return "SetMovementMotorsNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.ports.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class MovementUnit(Enum):
     """Enum for the units that can be used in the MoveForDuration block."""
@@ -50,6 +41,8 @@ class MovementDirection(Enum):
 class MoveForDurationNode(StackNode):
     """Class to represent the MoveForDuration block."""
 
+    __slots__ = ("direction", "value", "unit")
+
     def __init__(
         self, direction: MovementDirection, value: Node, unit: MovementUnit, next: Node
     ) -> None:
@@ -61,21 +54,12 @@ class MoveForDurationNode(StackNode):
     def __str__(self) -> str:
         return f"MoveForDurationNode(direction:'{self.direction}', unit:'{self.unit}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class MoveWithSteeringNode(StackNode):
     """Class to represent the MoveWithSteeringNode block."""
 
+    __slots__ = ("steering", "value", "unit")
+
     def __init__(
         self, steering: Node, value: Node, unit: MovementUnit, next: Node
     ) -> None:
@@ -87,24 +71,12 @@ class MoveWithSteeringNode(StackNode):
     def __str__(self) -> str:
         return f"MoveWithSteeringNode(unit:'{self.unit}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.steering.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class StartMovingWithSteering(StackNode):
     """Class to represent the MoveWithSteering block."""
 
+    __slots__ = ("steering",)
+
     def __init__(self, steering: Node, next: Node) -> None:
         super().__init__(next)
         self.steering = steering
@@ -112,21 +84,12 @@ class StartMovingWithSteering(StackNode):
     def __str__(self) -> str:
         return "StartMowingWithSteeringNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.steering.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class StopMovingNode(StackNode):
     """Class to represent the StopMoving block."""
 
+    __slots__ = ()
+
     def __init__(self, next: Node) -> None:
         super().__init__(next)
 
@@ -137,6 +100,8 @@ class StopMovingNode(StackNode):
 class SetMovementSpeedNode(StackNode):
     """Class to represent the SetMovement block."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: Node, next: Node) -> None:
         super().__init__(next)
         self.value = value
@@ -144,17 +109,6 @@ class SetMovementSpeedNode(StackNode):
     def __str__(self) -> str:
         return "SetMovementSpeedNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class RotationUnit(Enum):
     """Enum for the units that can be used in the SetMotorRotation block."""
@@ -169,6 +123,8 @@ class RotationUnit(Enum):
 class SetMotorRotationNode(StackNode):
     """Class to represent the SetMotorRotation block."""
 
+    __slots__ = ("value", "unit")
+
     def __init__(self, value: Node, unit: MovementUnit, next: Node) -> None:
         super().__init__(next)
         self.value = value
@@ -176,14 +132,3 @@ class SetMotorRotationNode(StackNode):
 
     def __str__(self) -> str:
         return f"SetMotorRotationNode(unit:'{self.unit}')"
-
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
@@ -14,6 +14,8 @@ class Operation(Enum):
 
 
 class ArithmeticalNode(Node):
+    __slots__ = ("op", "left_hand", "right_hand")
+
     def __init__(self, operation: Operation, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.op = operation
@@ -23,17 +25,10 @@ class ArithmeticalNode(Node):
     def __str__(self) -> str:
         return f"ArithmeticalNode(op:'{self.op}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class PickRandomNumberNode(Node):
+    __slots__ = ("left_hand", "right_hand")
+
     def __init__(self, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -42,15 +37,6 @@ class PickRandomNumberNode(Node):
     def __str__(self) -> str:
         return "PickRandomNumberNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ComparisonOperator(Enum):
     EQUAL = "=="
@@ -65,6 +51,8 @@ class ComparisonOperator(Enum):
 
 
 class ComparisonNode(BooleanNode):
+    __slots__ = ("op", "left_hand", "right_hand")
+
     def __init__(
         self, operation: ComparisonOperator, left_hand: Node, right_hand: Node
     ) -> None:
@@ -76,17 +64,10 @@ class ComparisonNode(BooleanNode):
     def __str__(self) -> str:
         return f"ComparisonNode(op:'{self.op}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class NotNode(BooleanNode):
+    __slots__ = ("left_hand",)
+
     def __init__(self, left_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -94,14 +75,10 @@ class NotNode(BooleanNode):
     def __str__(self) -> str:
         return "NotNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class IsBetweenNode(BooleanNode):
+    __slots__ = ("value", "left_hand", "right_hand")
+
     def __init__(self, value: Node, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.value = value
@@ -111,19 +88,10 @@ class IsBetweenNode(BooleanNode):
     def __str__(self) -> str:
         return "IsBetweenNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.value.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class JoinStringsNode(Node):
+    __slots__ = ("left_hand", "right_hand")
+
     def __init__(self, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -132,16 +100,10 @@ class JoinStringsNode(Node):
     def __str__(self) -> str:
         return "JoinStringsNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class LetterOfStringNode(Node):
+    __slots__ = ("left_hand", "right_hand")
+
     def __init__(self, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -150,16 +112,10 @@ class LetterOfStringNode(Node):
     def __str__(self) -> str:
         return "LetterOfStringNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class LengthOfStringNode(Node):
+    __slots__ = ("left_hand",)
+
     def __init__(self, left_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -167,13 +123,10 @@ class LengthOfStringNode(Node):
     def __str__(self) -> str:
         return "LengthOfStringNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class StringContainsNode(BooleanNode):
+    __slots__ = ("left_hand", "right_hand")
+
     def __init__(self, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -182,16 +135,10 @@ class StringContainsNode(BooleanNode):
     def __str__(self) -> str:
         return "StringContainsNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ModNode(Node):
+    __slots__ = ("left_hand", "right_hand")
+
     def __init__(self, left_hand: Node, right_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -200,16 +147,10 @@ class ModNode(Node):
     def __str__(self) -> str:
         return "ModNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class RoundNode(Node):
+    __slots__ = ("left_hand",)
+
     def __init__(self, left_hand: Node) -> None:
         super().__init__()
         self.left_hand = left_hand
@@ -217,11 +158,6 @@ class RoundNode(Node):
     def __str__(self) -> str:
         return "RoundNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class UnaryFunction(Enum):
     TEN = "pow(10, "
@@ -276,6 +212,8 @@ class UnaryFunction(Enum):
 
 
 class UnaryMathFunctionNode(Node):
+    __slots__ = ("function", "left_hand")
+
     def __init__(self, function: UnaryFunction, left_hand: Node) -> None:
         super().__init__()
         self.function = function
@@ -284,11 +222,6 @@ class UnaryMathFunctionNode(Node):
     def __str__(self) -> str:
         return f"UnaryMathFunctionNode(function:'{self.function}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class BinaryFunction(Enum):
     ATAN2 = "math.atan2"
@@ -319,6 +252,8 @@ class BinaryFunction(Enum):
 
 
 class BinaryMathFunctionNode(Node):
+    __slots__ = ("function", "left_hand", "right_hand")
+
     def __init__(
         self, function: BinaryFunction, left_hand: Node, right_hand: Node
     ) -> None:
@@ -329,11 +264,3 @@ class BinaryMathFunctionNode(Node):
 
     def __str__(self) -> str:
         return f"BinaryMathFunction(function:'{self.function}')"
-
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        self.left_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-        self.right_hand.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
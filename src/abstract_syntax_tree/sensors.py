@@ -15,6 +15,8 @@ class HubInteraction(Enum):
 class HubInteractionNode(BooleanNode):
     """Class to represent the HubInteraction block."""
 
+    __slots__ = ("interaction",)
+
     def __init__(self, interaction: HubInteraction) -> None:
         super().__init__()
         self.interaction = interaction
@@ -63,6 +65,8 @@ class SensorColor(Enum):
 class IsColorNode(BooleanNode):
     """Class to represent the IsColor block."""
 
+    __slots__ = ("port", "color")
+
     def __init__(self, port: Node, color: SensorColor) -> None:
         super().__init__()
         self.port = port
@@ -71,16 +75,12 @@ class IsColorNode(BooleanNode):
     def __str__(self) -> str:
         return f"IsColorNode(color: '{self.color}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.port.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ColorNode(Node):
     """Class to represent the Color block."""
 
+    __slots__ = ("port",)
+
     def __init__(self, port: Node) -> None:
         super().__init__()
         self.port = port
@@ -88,12 +88,6 @@ class ColorNode(Node):
     def __str__(self) -> str:
         return "ColorNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.port.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ReflectionComparator(Enum):
     LESS = "<"
@@ -117,6 +111,8 @@ class ReflectionComparator(Enum):
 class IsReflectionNode(BooleanNode):
     """Class to represent the IsReflection block."""
 
+    __slots__ = ("port", "comparator", "reflection")
+
     def __init__(
         self, port: Node, comparator: ReflectionComparator, reflection: int
     ) -> None:
@@ -128,20 +124,12 @@ class IsReflectionNode(BooleanNode):
     def __str__(self) -> str:
         return f"IsReflectionNode(reflection: '{self.comparator}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.port.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
-        self.reflection.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ReflectedLightNode(Node):
     """Class to represent the ReflectedLight block."""
 
+    __slots__ = ("port",)
+
     def __init__(self, port: Node) -> None:
         super().__init__()
         self.port = port
@@ -149,12 +137,6 @@ class ReflectedLightNode(Node):
     def __str__(self) -> str:
         return "ReflectedLightNode"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.port.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class DistanceComparator(Enum):
     LESS = "<"
@@ -197,6 +179,8 @@ class DistanceUnit(Enum):
 class IsDistanceNode(BooleanNode):
     """Class to represent the IsDistance block."""
 
+    __slots__ = ("port", "comparator", "distance", "unit")
+
     def __init__(
         self,
         port: Node,
@@ -213,20 +197,12 @@ class IsDistanceNode(BooleanNode):
     def __str__(self) -> str:
         return f"IsDistanceNode(distance: '{self.comparator}', unit: '{self.unit}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.port.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
-        self.distance.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class DistanceNode(Node):
     """Class to represent the Distance block."""
 
+    __slots__ = ("port", "unit")
+
     def __init__(self, port: Node, unit: DistanceUnit) -> None:
         super().__init__()
         self.port = port
@@ -235,16 +211,12 @@ class DistanceNode(Node):
     def __str__(self) -> str:
         return f"DistanceNode(unit: '{self.unit}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the left and right side
-        self.port.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class GestureNode(Node):
     """Class to represent the Gesture block."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -264,6 +236,8 @@ class HubOrientation(Enum):
 class IsOrientationNode(BooleanNode):
     """Class to represent the IsOrientation block."""
 
+    __slots__ = ("orientation",)
+
     def __init__(self, orientation: HubOrientation) -> None:
         super().__init__()
         self.orientation = orientation
@@ -275,6 +249,8 @@ class IsOrientationNode(BooleanNode):
 class OrientationNode(Node):
     """Class to represent the Orientation block."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -285,6 +261,8 @@ class OrientationNode(Node):
 class SetYawAngleNode(StackNode):
     """Class to represent the SetYawAngle block."""
 
+    __slots__ = ()
+
     def __init__(self, next_node) -> None:
         super().__init__(next_node)
 
@@ -305,6 +283,8 @@ class ButtonAction(Enum):
 class IsButtonPressedNode(BooleanNode):
     """Class to represent the IsButtonPressed block."""
 
+    __slots__ = ("button", "action")
+
     def __init__(self, button: ButtonType, action: ButtonAction) -> None:
         super().__init__()
         self.button = button
@@ -323,6 +303,8 @@ class AngleUnit(Enum):
 class HubAngleNode(Node):
     """Class to represent the HubAngle block."""
 
+    __slots__ = ("unit",)
+
     def __init__(self, unit: AngleUnit) -> None:
         super().__init__()
         self.unit = unit
@@ -334,6 +316,8 @@ class HubAngleNode(Node):
 class TimerNode(Node):
     """Class to represent the Timer block."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -344,6 +328,8 @@ class TimerNode(Node):
 class ResetTimerNode(StackNode):
     """Class to represent the ResetTimer block."""
 
+    __slots__ = ()
+
     def __init__(self, next_node) -> None:
         super().__init__(next_node)
 
@@ -354,6 +340,8 @@ class ResetTimerNode(StackNode):
 class IsKeyPressedNode(BooleanNode):
     """Class to represent the IsKeyPressed block."""
 
+    __slots__ = ("key",)
+
     def __init__(self, key: str) -> None:
         super().__init__()
         self.key = key
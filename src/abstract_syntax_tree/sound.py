@@ -1,9 +1,11 @@
-from src.abstract_syntax_tree import Node, StackNode, UIDGenerator
+from src.abstract_syntax_tree import Node, StackNode
 
 
 class PlaySoundUntilDoneNode(StackNode):
     """Class to represent the Play Sound until Done block."""
 
+    __slots__ = ("sound",)
+
     def __init__(self, sound: str, next: Node) -> None:
         super().__init__(next)
         self.sound = sound
@@ -15,6 +17,8 @@ class PlaySoundUntilDoneNode(StackNode):
 class StartSoundNode(StackNode):
     """Class to represent the Start Sound block."""
 
+    __slots__ = ("sound",)
+
     def __init__(self, sound: str, next: Node) -> None:
         super().__init__(next)
         self.sound = sound
@@ -26,6 +30,8 @@ class StartSoundNode(StackNode):
 class PlayBeepNode(StackNode):
     """Class to represent the Play Beep block."""
 
+    __slots__ = ("pitch", "duration")
+
     def __init__(self, pitch: Node, duration: Node, next: Node) -> None:
         super().__init__(next)
         self.pitch = pitch
@@ -34,24 +40,12 @@ class PlayBeepNode(StackNode):
     def __str__(self):
         return "PlayBeepNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.pitch.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-        self.duration.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class StartBeepNode(StackNode):
     """Class to represent the Start Beep block."""
 
+    __slots__ = ("pitch",)
+
     def __init__(self, pitch: Node, next: Node) -> None:
         super().__init__(next)
         self.pitch = pitch
@@ -59,21 +53,12 @@ class StartBeepNode(StackNode):
     def __str__(self):
         return "StartBeepNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.pitch.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class StopBeepNode(StackNode):
     """Class to represent the Stop Beep block."""
 
+    __slots__ = ()
+
     def __init__(self, next: Node) -> None:
         super().__init__(next)
 
@@ -84,6 +69,8 @@ class StopBeepNode(StackNode):
 class SetVolumeNode(StackNode):
     """Class to represent the Set Volume block."""
 
+    __slots__ = ("volume",)
+
     def __init__(self, volume: Node, next: Node) -> None:
         super().__init__(next)
         self.volume = volume
@@ -91,21 +78,12 @@ class SetVolumeNode(StackNode):
     def __str__(self):
         return "SetVolumeNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.volume.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class ChangeVolumeNode(StackNode):
     """Class to represent the Change Volume block."""
 
+    __slots__ = ("volume",)
+
     def __init__(self, volume: Node, next: Node) -> None:
         super().__init__(next)
         self.volume = volume
@@ -113,21 +91,12 @@ class ChangeVolumeNode(StackNode):
     def __str__(self):
         return "ChangeVolumeNode"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.volume.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class VolumeNode(Node):
     """Class to represent the Volume block."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -1,9 +1,11 @@
-from src.abstract_syntax_tree import BooleanNode, Node, StackNode, UIDGenerator
+from src.abstract_syntax_tree import BooleanNode, Node, StackNode
 
 
 class ListLiteralNode(Node):
     """Class to represent any list literal."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value) -> None:
         super().__init__()
         self.value = value  # List
@@ -15,6 +17,8 @@ class ListLiteralNode(Node):
 class VariableNode(Node):
     """Class to represent the Variable and List block."""
 
+    __slots__ = ("name", "id")
+
     def __init__(self, name, id) -> None:
         super().__init__()
         self.name = name  # Variable name
@@ -27,6 +31,8 @@ class VariableNode(Node):
 class SetVariableToNode(StackNode):
     """Class to represent SetVariableTo block."""
 
+    __slots__ = ("variable", "value")
+
     def __init__(self, variable: str, value: Node, next: Node) -> None:
         super().__init__(next)
         self.variable = variable
@@ -35,21 +41,12 @@ class SetVariableToNode(StackNode):
     def __str__(self) -> str:
         return f"SetVariableToNode(variable:'{self.variable}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class ChangeVariableByNode(StackNode):
     """Class to represent ChangeVariableBy block."""
 
+    __slots__ = ("variable", "value")
+
     def __init__(self, variable: str, value: Node, next: Node) -> None:
         super().__init__(next)
         self.variable = variable
@@ -58,21 +55,12 @@ class ChangeVariableByNode(StackNode):
     def __str__(self) -> str:
         return f"ChangeVariableByNode(variable:'{self.variable}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class AddItemToListNode(StackNode):
     """Class to represent AddItemToList block."""
 
+    __slots__ = ("variable", "value")
+
     def __init__(self, variable: str, value: Node, next: Node) -> None:
         super().__init__(next)
         self.variable = variable
@@ -81,21 +69,12 @@ class AddItemToListNode(StackNode):
     def __str__(self) -> str:
         return f"AddItemToListNode(variable:'{self.variable}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.value.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class DeleteItemInListNode(StackNode):
     """Class to represent Delete Item in List block."""
 
+    __slots__ = ("list", "index")
+
     def __init__(self, list: str, index: Node, next: Node) -> None:
         super().__init__(next)
         self.list = list
@@ -104,21 +83,12 @@ class DeleteItemInListNode(StackNode):
     def __str__(self) -> str:
         return f"DeleteItemInListNode(variable:'{self.list}')"
 
-    def custom_representation(
-        self,
-        nodes: list,
-        connections: list,
-        parent_id: int,
-        uid_generator: UIDGenerator,
-    ):
-        self.index.generate_tree_representation(
-            nodes, connections, parent_id, uid_generator
-        )
-
 
 class DeleteAllItemsInListNode(StackNode):
     """Class to represent Delete all items in list block."""
 
+    __slots__ = ("list",)
+
     def __init__(self, list: str, next: Node) -> None:
         super().__init__(next)
         self.list = list
@@ -130,6 +100,8 @@ class DeleteAllItemsInListNode(StackNode):
 class LengthOfListNode(Node):
     """Class to represent the Length of List block."""
 
+    __slots__ = ("variable",)
+
     def __init__(self, variable) -> None:
         super().__init__()
         self.variable = variable
@@ -141,6 +113,8 @@ class LengthOfListNode(Node):
 class InsertItemAtIndexNode(StackNode):
     """Class to represent the Insert Item at Index block."""
 
+    __slots__ = ("variable", "value", "index")
+
     def __init__(self, variable: str, value: Node, index: Node, next: Node) -> None:
         super().__init__(next)
         self.variable = variable
@@ -150,21 +124,12 @@ class InsertItemAtIndexNode(StackNode):
     def __str__(self) -> str:
         return f"InsertItemAtIndexNode(variable:'{self.variable}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the value
-        self.value.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
-        # Generate the representation of the index
-        self.index.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ItemAtIndexNode(Node):
     """Class to represent the Item at Index block."""
 
+    __slots__ = ("variable", "index")
+
     def __init__(self, variable, index) -> None:
         super().__init__()
         self.variable = variable
@@ -173,16 +138,12 @@ class ItemAtIndexNode(Node):
     def __str__(self) -> str:
         return f"ItemAtIndexNode(variable:'{self.variable}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the index
-        self.index.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ReplaceItemAtIndexNode(StackNode):
     """Class to represent the Replace Item at Index block."""
 
+    __slots__ = ("variable", "index", "value")
+
     def __init__(self, variable, index, value, next) -> None:
         super().__init__(next)
         self.variable = variable
@@ -192,21 +153,12 @@ class ReplaceItemAtIndexNode(StackNode):
     def __str__(self) -> str:
         return f"ReplaceItemAtIndexNode(variable:'{self.variable}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the index
-        self.index.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
-        # Generate the representation of the value
-        self.value.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class IndexOfItemNode(Node):
     """Class to represent the Index of Item block."""
 
+    __slots__ = ("variable", "value")
+
     def __init__(self, variable: str, value: Node) -> None:
         super().__init__()
         self.variable = variable
@@ -215,16 +167,12 @@ class IndexOfItemNode(Node):
     def __str__(self) -> str:
         return f"IndexOfItemNode(variable:'{self.variable}')"
 
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the value
-        self.value.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
-
 
 class ListContainsNode(BooleanNode):
     """Class to represent the ListContainsItem block."""
 
+    __slots__ = ("variable", "value")
+
     def __init__(self, variable: str, value: Node) -> None:
         super().__init__()
         self.variable = variable
@@ -232,9 +180,3 @@ class ListContainsNode(BooleanNode):
 
     def __str__(self) -> str:
         return f"ListContainsNode(variable:'{self.variable}')"
-
-    def custom_representation(self, nodes, connections, node_id, uid_generator):
-        # Generate the representation of the value
-        self.value.generate_tree_representation(
-            nodes, connections, node_id, uid_generator
-        )
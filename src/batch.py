@@ -0,0 +1,191 @@
+"""
+This file contains the logic to compile an entire directory tree of *.lms files in one go.
+The files are spread over a pool of worker processes so the interpreter only has to start once per worker.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.cache import CompilationCache
+from src.cli import add_compile_options, add_flag, add_jobs_option, create_parser
+from src.compiler import compile_lms
+
+
+class CompileResult:
+    """The outcome of compiling a single file."""
+
+    def __init__(self, input_filename: str, duration: float, error: str = None) -> None:
+        self.input_filename = input_filename
+        self.duration = duration  # Wall time in seconds
+        self.error = error  # None if the compilation succeeded
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def find_inputs(directory: str) -> list:
+    """Finds all the .lms files in the directory tree rooted at directory.
+
+    :param directory: The root of the directory tree.
+    :return: Sorted list of the paths of all the .lms files.
+    """
+    inputs = []
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith(".lms"):
+                inputs.append(os.path.join(root, filename))
+    return sorted(inputs)
+
+
+def write_output(filename: str, content: str, overwrite: bool):
+    with open(filename, "w" if overwrite else "x") as file:
+        file.write(content)
+
+
+def compile_file(
+    input_filename: str,
+    ast: bool = False,
+    safe: bool = False,
+    best_effort: bool = True,
+    overwrite: bool = False,
+    cache: CompilationCache = None,
+    optimize: bool = False,
+) -> CompileResult:
+    """Compiles a single file and writes the code (and optionally the AST) next to it.
+    Any error is caught and reported in the result, so that one broken file does not stop the batch.
+
+    :param input_filename: The path to the file that should be converted.
+    :param ast: Indicates if the AST representation should also be written (as a .gv file).
+    :param safe: Indicates if safer code should be outputted.
+    :param best_effort: Indicates if untranslatable blocks should be skipped.
+    :param overwrite: Indicates if existing output files can be overwritten.
+    :param cache: The cache to use, defaults to None (no cache).
+    :param optimize: Indicates if the code should be optimized.
+    :return: The result of the compilation.
+    """
+    start = time.perf_counter()
+    try:
+        compilation = compile_lms(
+            input_filename, safe, best_effort, ast, cache, optimize=optimize
+        )
+
+        base_filename = os.path.splitext(input_filename)[0]
+        if ast:
+            write_output(
+                base_filename + ".gv", compilation.ast_representation, overwrite
+            )
+        write_output(base_filename + ".py", compilation.code, overwrite)
+    except Exception as error:
+        return CompileResult(
+            input_filename,
+            time.perf_counter() - start,
+            f"{type(error).__name__}: {error}",
+        )
+    return CompileResult(input_filename, time.perf_counter() - start)
+
+
+def compile_all(
+    input_filenames: list,
+    jobs: int = None,
+    ast: bool = False,
+    safe: bool = False,
+    best_effort: bool = True,
+    overwrite: bool = False,
+    cache: CompilationCache = None,
+    optimize: bool = False,
+):
+    """Compiles all the files, yielding the results in the order the compilations finish.
+
+    :param input_filenames: The paths of the files that should be converted.
+    :param jobs: The number of worker processes, defaults to the number of CPUs. With 1 no pool is used.
+    :return: Generator of CompileResult.
+    """
+    if jobs == 1:
+        for input_filename in input_filenames:
+            yield compile_file(
+                input_filename, ast, safe, best_effort, overwrite, cache, optimize
+            )
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                compile_file,
+                input_filename,
+                ast,
+                safe,
+                best_effort,
+                overwrite,
+                cache,
+                optimize,
+            )
+            for input_filename in input_filenames
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def batch_parser():
+    parser = create_parser(
+        "python -m src batch",
+        "Compiles all the .lms files in a directory tree, the code is written next to every file (as .py).",
+    )
+    parser.add_argument(
+        "directory", help="The directory that is searched (recursively) for .lms files."
+    )
+    add_jobs_option(parser)
+    add_flag(
+        parser,
+        "ast",
+        False,
+        "Indicates if the AST representation should also be written next to each file (as .gv).",
+    )
+    add_compile_options(
+        parser,
+        "The directory in which compiled projects are cached, unchanged projects are then not compiled again. If none is provided nothing is cached.",
+    )
+    add_flag(
+        parser,
+        "overwrite",
+        False,
+        "Indicates if existing .py and .gv files may be overwritten.",
+    )
+    return parser
+
+
+def batch(
+    directory: str,
+    jobs: int = None,
+    ast: bool = False,
+    safe: bool = False,
+    best_effort: bool = True,
+    overwrite: bool = False,
+    cache_dir: str = "",
+    optimize: bool = False,
+) -> int:
+    """Compiles all the files in the directory tree and prints a summary.
+
+    :return: The exit code, 1 if any of the files failed.
+    """
+    input_filenames = find_inputs(directory)
+    cache = CompilationCache(cache_dir) if cache_dir else None
+    start = time.perf_counter()
+
+    failures = []
+    for result in compile_all(
+        input_filenames, jobs, ast, safe, best_effort, overwrite, cache, optimize
+    ):
+        status = "OK  " if result.succeeded else "FAIL"
+        print(f"{status} {result.duration:8.3f}s {result.input_filename}")
+        if not result.succeeded:
+            failures.append(result)
+
+    print(f"{'-'*10} Summary {'-'*10}")
+    print(
+        f"Compiled {len(input_filenames) - len(failures)} of {len(input_filenames)} files in {time.perf_counter() - start:.3f}s, {len(failures)} failed."
+    )
+    for result in failures:
+        print(f"{result.input_filename}: {result.error}")
+
+    return 1 if failures else 0
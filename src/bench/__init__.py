@@ -0,0 +1,35 @@
+"""
+This package contains the benchmarks of the compiler, they are run on the test corpus (./tests/inputs) by default.
+Every benchmark is a module that can be run on its own, e.g. python -m src.bench.memory
+"""
+import os
+
+from src.abstract_syntax_tree import Node
+from src.batch import find_inputs
+
+CORPUS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "tests",
+    "inputs",
+)
+
+
+def corpus_files(directory: str = CORPUS_DIRECTORY) -> list:
+    """Finds all the .lms files of the corpus.
+
+    :param directory: The root of the corpus, defaults to the test inputs.
+    :return: Sorted list of the paths of all the .lms files.
+    """
+    return find_inputs(directory)
+
+
+def node_fields(node: Node) -> list:
+    """Lists the names of the attributes of a node, as declared by the __slots__ of its classes.
+
+    :param node: The node.
+    :return: The names of the attributes, the ones of the base classes first.
+    """
+    fields = []
+    for cls in reversed(type(node).__mro__):
+        fields.extend(cls.__dict__.get("__slots__", ()))
+    return fields
@@ -0,0 +1,249 @@
+"""
+This file contains the benchmark of the stages of the compiler, every stage of the pipeline is timed separately
+for every file of the corpus and its peak memory is traced (in a separate run, since tracing slows everything down).
+The results can be saved as json and compared with the results of an earlier run, e.g. of another commit:
+
+    python -m src.bench --save before.json
+    python -m src.bench --compare before.json
+"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from src.bench import CORPUS_DIRECTORY, corpus_files
+from src.cli import create_parser
+from src.code_generator import CodeGenerator
+from src.json_parser import extract_json, filter_json
+from src.visitor import Visitor
+
+STAGES = [
+    "extract_json",
+    "filter_json",
+    "visit",
+    "generate",
+    "tree_representation",
+]
+
+
+def run_stages(input_filename: str, measure):
+    """Runs the pipeline on a file, every stage is run through measure.
+
+    :param input_filename: The path of the .lms file.
+    :param measure: Function (stage, function, *args) that calls function(*args) and returns its result.
+    """
+    project = measure("extract_json", extract_json, input_filename)
+    concrete_syntax_tree = measure("filter_json", filter_json, project)
+    abstract_syntax_tree = measure("visit", Visitor(True).visit, concrete_syntax_tree)
+    measure("generate", CodeGenerator().generate, abstract_syntax_tree)
+    measure("tree_representation", abstract_syntax_tree.tree_representation)
+
+
+def time_stages(input_filename: str) -> dict:
+    """
+    :return: Dictionary of the wall time (in seconds) of every stage.
+    """
+    durations = {}
+
+    def measure(stage, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        durations[stage] = time.perf_counter() - start
+        return result
+
+    run_stages(input_filename, measure)
+    return durations
+
+
+def trace_stages(input_filename: str) -> dict:
+    """
+    :return: Dictionary of the peak memory (in bytes) that was allocated during every stage.
+    """
+    peaks = {}
+
+    def measure(stage, function, *args):
+        tracemalloc.start()
+        try:
+            result = function(*args)
+            peaks[stage] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result
+
+    run_stages(input_filename, measure)
+    return peaks
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Computes a percentile with linear interpolation between the closest ranks.
+
+    :param values: The values, they don't need to be sorted.
+    :param fraction: The percentile as a fraction, e.g. 0.95.
+    :return: The percentile of the values.
+    """
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(values: list) -> dict:
+    return {
+        "total": sum(values),
+        "median": statistics.median(values),
+        "p95": percentile(values, 0.95),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=CORPUS_DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(input_filenames: list, repeat: int = 5) -> dict:
+    """Benchmarks all the stages on all the files.
+
+    :param input_filenames: The paths of the .lms files.
+    :param repeat: The number of times every file is timed, the median of the runs is used for the file.
+    :return: The results, for every stage a summary of the times and of the peak memory over the files (no stages if
+    there are no files). Files that can't be compiled (e.g. because they use blocks that have no Python equivalent)
+    are skipped.
+    """
+    # Run everything once up front so the dispatch tables (and the caches of Python) are warm
+    compilable_filenames = []
+    skipped = {}
+    for input_filename in input_filenames:
+        try:
+            time_stages(input_filename)
+        except Exception as error:
+            skipped[input_filename] = f"{type(error).__name__}: {error}"
+            continue
+        compilable_filenames.append(input_filename)
+    input_filenames = compilable_filenames
+
+    durations = {stage: [] for stage in STAGES}
+    peaks = {stage: [] for stage in STAGES}
+    for input_filename in input_filenames:
+        runs = [time_stages(input_filename) for _ in range(repeat)]
+        for stage in STAGES:
+            durations[stage].append(statistics.median(run[stage] for run in runs))
+        for stage, peak in trace_stages(input_filename).items():
+            peaks[stage].append(peak)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "files": len(input_filenames),
+        "skipped": skipped,
+        "repeat": repeat,
+        "stages": {
+            stage: {
+                "time": summarize(durations[stage]),
+                "peak": summarize(peaks[stage]),
+            }
+            for stage in STAGES
+            if input_filenames
+        },
+    }
+
+
+def change(value: float, baseline: float) -> str:
+    if not baseline:
+        return ""
+    return f"{100 * (value - baseline) / baseline:+6.1f}%"
+
+
+def report(results: dict, baseline: dict = None) -> str:
+    """Formats the results as a table, if a baseline is given the relative changes are added.
+
+    :param results: The results of benchmark.
+    :param baseline: The results of an earlier run, defaults to None.
+    :return: The table.
+    """
+    lines = [
+        f"Files: {results['files']} ({len(results['skipped'])} skipped), runs per file: {results['repeat']}, commit: {results['commit']}, Python {results['python']}",
+        f"{'Stage':<20}{'total ms':>10}{'median us':>12}{'p95 us':>10}{'peak KiB':>10}{'p95 KiB':>10}",
+    ]
+    for stage in STAGES:
+        timing = results["stages"][stage]["time"]
+        peak = results["stages"][stage]["peak"]
+        lines.append(
+            f"{stage:<20}{timing['total'] * 1e3:10.2f}{timing['median'] * 1e6:12.1f}{timing['p95'] * 1e6:10.1f}"
+            f"{peak['median'] / 1024:10.1f}{peak['p95'] / 1024:10.1f}"
+        )
+        if baseline and stage in baseline["stages"]:
+            old_timing = baseline["stages"][stage]["time"]
+            old_peak = baseline["stages"][stage]["peak"]
+            lines.append(
+                f"{'':<20}{change(timing['total'], old_timing['total']):>10}"
+                f"{change(timing['median'], old_timing['median']):>12}{change(timing['p95'], old_timing['p95']):>10}"
+                f"{change(peak['median'], old_peak['median']):>10}{change(peak['p95'], old_peak['p95']):>10}"
+            )
+    if baseline:
+        lines.append(f"Changes are relative to commit {baseline['commit']}.")
+    for input_filename, error in results["skipped"].items():
+        lines.append(f"Skipped {input_filename}: {error}")
+    return "\n".join(lines)
+
+
+def main(
+    directory: str = CORPUS_DIRECTORY,
+    repeat: int = 5,
+    save: str = "",
+    compare: str = "",
+) -> int:
+    results = benchmark(corpus_files(directory), repeat)
+    if not results["files"]:
+        # There is nothing to summarize
+        print(f"No files to benchmark in {directory}.")
+        for input_filename, error in results["skipped"].items():
+            print(f"Skipped {input_filename}: {error}")
+        return 1
+
+    baseline = None
+    if compare:
+        with open(compare) as file:
+            baseline = json.load(file)
+    print(report(results, baseline))
+
+    if save:
+        with open(save, "w") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = create_parser(
+        "python -m src.bench",
+        "Times every stage of the compiler on a corpus of .lms files.",
+    )
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default=CORPUS_DIRECTORY,
+        help="The directory that is searched (recursively) for .lms files.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="The number of runs per file."
+    )
+    parser.add_argument(
+        "--save", default="", help="The json file to write the results to."
+    )
+    parser.add_argument(
+        "--compare",
+        default="",
+        help="A json file with the results of an earlier run to compare with.",
+    )
+    sys.exit(main(**vars(parser.parse_args())))
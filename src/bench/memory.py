@@ -0,0 +1,111 @@
+"""
+This file contains the memory benchmark of the AST, it reports how many bytes the nodes of the corpus take.
+To show what the __slots__ of the node classes save, every node is also measured as if its attributes were
+stored in a per-instance __dict__ (the layout the node classes had before).
+Run it with: python -m src.bench.memory [DIRECTORY]
+"""
+import sys
+import tracemalloc
+
+from src.abstract_syntax_tree import Node
+from src.bench import CORPUS_DIRECTORY, corpus_files, node_fields
+from src.cli import create_parser
+from src.json_parser import extract_json, filter_json
+from src.visitor import Visitor
+
+# For every node class a plain class without __slots__, used to measure the __dict__ layout.
+_dict_classes = {}
+
+
+def node_size(node: Node) -> int:
+    """The size of the node itself, the objects it refers to are not included.
+
+    :param node: The node.
+    :return: The size in bytes.
+    """
+    size = sys.getsizeof(node)
+    if hasattr(node, "__dict__"):
+        size += sys.getsizeof(node.__dict__)
+    return size
+
+
+def dict_node_size(node: Node) -> int:
+    """The size the node would have if its attributes were stored in a __dict__.
+
+    :param node: The node.
+    :return: The size in bytes.
+    """
+    cls = type(node)
+    if cls not in _dict_classes:
+        _dict_classes[cls] = type(cls.__name__, (), {})
+    copy = _dict_classes[cls]()
+    for field in node_fields(node):
+        setattr(copy, field, getattr(node, field))
+    return sys.getsizeof(copy) + sys.getsizeof(copy.__dict__)
+
+
+class MemoryReport:
+    """The memory usage of the ASTs of a set of files."""
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.nodes = 0
+        self.slots_bytes = 0  # Size of all the nodes as they are
+        self.dict_bytes = 0  # Size of all the nodes with a __dict__
+        self.retained_bytes = 0  # Memory (according to tracemalloc) still held by the ASTs after they are built
+
+    def __str__(self) -> str:
+        nodes = max(self.nodes, 1)
+        saved = 100 * (1 - self.slots_bytes / max(self.dict_bytes, 1))
+        return "\n".join(
+            [
+                f"Files:                            {self.files}",
+                f"Nodes:                            {self.nodes}",
+                f"Bytes per node (__slots__):       {self.slots_bytes / nodes:.1f}",
+                f"Bytes per node (__dict__):        {self.dict_bytes / nodes:.1f}",
+                f"Saved by __slots__:               {saved:.1f}%",
+                f"Retained per node (tracemalloc):  {self.retained_bytes / nodes:.1f}",
+            ]
+        )
+
+
+def measure(input_filenames: list) -> MemoryReport:
+    """Builds the AST of every file and measures the memory used by its nodes.
+
+    :param input_filenames: The paths of the .lms files.
+    :return: The report for all the files together.
+    """
+    report = MemoryReport()
+    Visitor.dispatch_table()  # Built up front, so it is not counted as memory of the first AST
+    for input_filename in input_filenames:
+        concrete_syntax_tree = filter_json(extract_json(input_filename))
+
+        tracemalloc.start()
+        abstract_syntax_tree = Visitor(True).visit(concrete_syntax_tree)
+        report.retained_bytes += tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        report.files += 1
+        for node in abstract_syntax_tree.nodes():
+            report.nodes += 1
+            report.slots_bytes += node_size(node)
+            report.dict_bytes += dict_node_size(node)
+    return report
+
+
+def memory(directory: str = CORPUS_DIRECTORY):
+    print(measure(corpus_files(directory)))
+
+
+if __name__ == "__main__":
+    parser = create_parser(
+        "python -m src.bench.memory",
+        "Reports how many bytes the nodes of the ASTs of a corpus take.",
+    )
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default=CORPUS_DIRECTORY,
+        help="The directory that is searched (recursively) for .lms files.",
+    )
+    memory(**vars(parser.parse_args()))
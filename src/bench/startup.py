@@ -0,0 +1,106 @@
+"""
+This file contains the start-up benchmark of the command line, it measures what starting the compiler costs
+before any file is read: the imports (with python -X importtime) and the wall time of complete runs, each in a
+fresh interpreter.
+Run it with: python -m src.bench.startup
+"""
+import os
+import subprocess
+import sys
+import time
+
+from src.bench import CORPUS_DIRECTORY
+from src.cli import create_parser
+
+# Budget (in seconds) for importing the command line, which is all that is needed to parse the arguments.
+IMPORT_BUDGET = 0.05
+
+# Modules that the command line should not import before it knows what to compile.
+DEFERRED_MODULES = [
+    "src.visitor",
+    "src.code_generator",
+    "src.abstract_syntax_tree",
+    "src.batch",
+    "src.server",
+    "typer",
+    "click",
+]
+
+_ROOT_DIRECTORY = os.path.dirname(os.path.dirname(CORPUS_DIRECTORY))
+
+
+def import_times(modules: list) -> dict:
+    """Imports the modules in a fresh interpreter and reports the time every module took to import.
+
+    :param modules: The names of the modules to import.
+    :return: Dictionary of the cumulative import time (in seconds) of every module that was imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=_ROOT_DIRECTORY,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+def run_time(arguments: list, repeat: int = 5) -> float:
+    """Runs python with the arguments in a fresh interpreter.
+
+    :param arguments: The arguments for python.
+    :param repeat: The number of runs.
+    :return: The fastest wall time (in seconds) of the runs.
+    """
+    fastest = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + arguments,
+            cwd=_ROOT_DIRECTORY,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        duration = time.perf_counter() - start
+        fastest = duration if fastest is None else min(fastest, duration)
+    return fastest
+
+
+def startup(repeat: int = 5):
+    times = import_times(["src.__main__"])
+    print(f"Import of the command line: {times['src.__main__'] * 1000:7.1f} ms")
+    print(f"Budget:                     {IMPORT_BUDGET * 1000:7.1f} ms")
+    deferred = [module for module in DEFERRED_MODULES if module in times]
+    print(f"Deferred modules imported:  {', '.join(deferred) or 'none'}")
+
+    compiler_modules = ["src.compiler", "src.visitor", "src.code_generator"]
+    times = import_times(compiler_modules)
+    compiler_time = sum(times[module] for module in compiler_modules)
+    print(f"Import of the compiler:     {compiler_time * 1000:7.1f} ms")
+
+    input_filename = os.path.join(CORPUS_DIRECTORY, "empty", "empty.lms")
+    print(f"{'-'*10} Wall time (fastest of {repeat} runs) {'-'*10}")
+    for name, arguments in [
+        ("python -c pass", ["-c", "pass"]),
+        ("python -m src --help", ["-m", "src", "--help"]),
+        ("python -m src empty.lms", ["-m", "src", input_filename]),
+    ]:
+        print(f"{name:<25}{run_time(arguments, repeat) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = create_parser(
+        "python -m src.bench.startup",
+        "Reports what starting the command line costs.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="The number of runs per command."
+    )
+    startup(**vars(parser.parse_args()))
@@ -0,0 +1,318 @@
+"""
+This file contains a generator of synthetic projects, valid .lms files of any size to stress the compiler with.
+The number of blocks, the nesting depth of the control blocks, the mix of opcodes and the number of variables
+can be chosen, the same seed always results in the same project.
+Run it with: python -m src.bench.synthetic DIRECTORY --blocks 10000 100000
+The files that are written can then be benchmarked with: python -m src.bench DIRECTORY
+"""
+import io
+import json
+import os
+import random
+import zipfile
+
+from src.cli import create_parser
+
+# Relative weights of the opcodes of the stack blocks, only opcodes that the visitor supports are used.
+DEFAULT_MIX = {
+    "data_setvariableto": 4,
+    "data_changevariableby": 3,
+    "control_wait": 1,
+    "flipperdisplay_ledText": 1,
+    "flippermove_stopMove": 1,
+    "control_if": 2,
+    "control_if_else": 1,
+    "control_repeat": 1,
+}
+
+# The opcodes of the control blocks, the other stack blocks have no body.
+CONTAINERS = ["control_if", "control_if_else", "control_repeat"]
+
+ARITHMETIC_OPERATORS = [
+    "operator_add",
+    "operator_subtract",
+    "operator_multiply",
+    "operator_divide",
+]
+COMPARISON_OPERATORS = ["operator_lt", "operator_equals", "operator_gt"]
+
+# Probability that a body is closed after each of its blocks, bodies are 1 / BODY_END_PROBABILITY blocks long on average.
+BODY_END_PROBABILITY = 0.25
+
+
+class Body:
+    """A stack of blocks that is being generated, the chain of the hat block or the body of a control block."""
+
+    def __init__(self, parent: str, input_name: str, depth: int, has_else: bool):
+        self.parent = parent  # The id of the block the stack belongs to
+        # SUBSTACK or SUBSTACK2, None for the chain of the hat block
+        self.input_name = input_name
+        self.depth = depth  # The number of control blocks the stack is nested in
+        self.has_else = has_else  # Indicates if an else body has to follow this body
+        self.last = None  # The id of the last block of the stack
+        self.size = 0
+
+
+class ProjectGenerator:
+    """Generates the project.json of a synthetic project."""
+
+    def __init__(
+        self,
+        blocks: int = 1000,
+        depth: int = 3,
+        variables: int = 5,
+        mix: dict = None,
+        seed: int = 0,
+    ) -> None:
+        """
+        :param blocks: The exact number of blocks of the project, the hat block included.
+        :param depth: The maximal nesting depth of the control blocks.
+        :param variables: The number of variables, at least 1.
+        :param mix: The relative weights of the opcodes of the stack blocks, defaults to DEFAULT_MIX.
+        :param seed: The seed of the random generator.
+        """
+        self.block_count = blocks
+        self.depth = depth
+        self.variables = [
+            (f"variable_{index}", f"variable-id-{index}")
+            for index in range(max(variables, 1))
+        ]
+        self.mix = DEFAULT_MIX if mix is None else mix
+        self.random = random.Random(seed)
+        self.blocks = {}
+
+    def new_block(self, opcode: str, parent: str, inputs=None, fields=None) -> str:
+        block_id = f"block-{len(self.blocks)}"
+        self.blocks[block_id] = {
+            "opcode": opcode,
+            "next": None,
+            "parent": parent,
+            "inputs": inputs or {},
+            "fields": fields or {},
+            "shadow": False,
+            "topLevel": parent is None,
+        }
+        return block_id
+
+    def remaining(self) -> int:
+        return self.block_count - len(self.blocks)
+
+    def number(self) -> list:
+        return [1, [4, str(self.random.randint(0, 100))]]
+
+    def variable(self) -> tuple:
+        return self.random.choice(self.variables)
+
+    def operand(self, parent: str, budget: int) -> tuple:
+        """Generates a numerical input: a number, a variable or (if the budget allows it) an arithmetic block.
+
+        :param parent: The id of the block the input belongs to.
+        :param budget: The number of blocks the input may take.
+        :return: The input and the number of blocks it took.
+        """
+        kind = self.random.random()
+        if budget >= 1 and kind < 0.3:
+            block_id = self.new_block(self.random.choice(ARITHMETIC_OPERATORS), parent)
+            left, left_cost = self.operand(block_id, (budget - 1) // 2)
+            right, right_cost = self.operand(block_id, budget - 1 - left_cost)
+            self.blocks[block_id]["inputs"] = {"NUM1": left, "NUM2": right}
+            return [3, block_id, [4, "0"]], 1 + left_cost + right_cost
+        if kind < 0.6:
+            name, variable_id = self.variable()
+            return [3, [12, name, variable_id], [4, "0"]], 0
+        return self.number(), 0
+
+    def condition(self, parent: str, budget: int) -> tuple:
+        """Generates a comparison block, it takes at least 1 block so the budget should be at least 1.
+
+        :return: The input and the number of blocks it took.
+        """
+        block_id = self.new_block(self.random.choice(COMPARISON_OPERATORS), parent)
+        left, left_cost = self.operand(block_id, (budget - 1) // 2)
+        right, right_cost = self.operand(block_id, budget - 1 - left_cost)
+        self.blocks[block_id]["inputs"] = {"OPERAND1": left, "OPERAND2": right}
+        return [2, block_id], 1 + left_cost + right_cost
+
+    def add_statement(self, opcode: str, body: Body, budget: int) -> str:
+        """Adds a stack block to the end of the body.
+
+        :param opcode: The opcode of the block.
+        :param body: The body the block is added to.
+        :param budget: The number of blocks the inputs of the block may take.
+        :return: The id of the block.
+        """
+        parent = body.last or body.parent
+        block_id = self.new_block(opcode, parent)
+        if body.last:
+            self.blocks[body.last]["next"] = block_id
+        elif body.input_name:
+            self.blocks[body.parent]["inputs"][body.input_name] = [2, block_id]
+        else:
+            self.blocks[body.parent]["next"] = block_id
+        body.last = block_id
+        body.size += 1
+
+        block = self.blocks[block_id]
+        if opcode in ("data_setvariableto", "data_changevariableby"):
+            name, variable_id = self.variable()
+            block["fields"] = {"VARIABLE": [name, variable_id]}
+            block["inputs"] = {"VALUE": self.operand(block_id, budget)[0]}
+        elif opcode == "control_wait":
+            block["inputs"] = {"DURATION": [1, [5, "0.1"]]}
+        elif opcode == "flipperdisplay_ledText":
+            block["inputs"] = {"TEXT": [1, [10, "Hi"]]}
+        elif opcode == "control_repeat":
+            block["inputs"] = {"TIMES": [1, [6, str(self.random.randint(1, 10))]]}
+        elif opcode in ("control_if", "control_if_else"):
+            block["inputs"] = {"CONDITION": self.condition(block_id, budget)[0]}
+        return block_id
+
+    def pending(self, bodies: list) -> int:
+        """The number of blocks that are still needed to give every open body at least one block."""
+        return sum((body.size == 0) + body.has_else for body in bodies)
+
+    def close(self, bodies: list):
+        """Closes the innermost body, if it is the body of an if else block its else body is opened."""
+        body = bodies.pop()
+        if body.has_else:
+            bodies.append(Body(body.parent, "SUBSTACK2", body.depth, False))
+
+    def generate(self) -> dict:
+        """Generates the project.
+
+        :return: The json of the project (as the contents of project.json).
+        """
+        self.blocks = {}
+        hat = self.new_block("flipperevents_whenProgramStarts", None)
+        self.blocks[hat].update({"x": 0, "y": 0})
+        bodies = [Body(hat, None, 0, False)]
+        opcodes = list(self.mix)
+        weights = list(self.mix.values())
+
+        while self.remaining() > 0:
+            body = bodies[-1]
+            spare = self.remaining() - self.pending(bodies)
+            if body.size == 0:
+                spare += 1  # The block that is added now fills this body
+
+            if spare <= 0:
+                # Only just enough blocks are left to fill the open bodies
+                if body.size > 0 and len(bodies) > 1:
+                    self.close(bodies)
+                    continue
+                self.add_statement("flippermove_stopMove", body, 0)
+                continue
+
+            opcode = self.random.choices(opcodes, weights)[0]
+            # The container, its condition and the first block of every body
+            minimum = 2 + (opcode != "control_repeat") + (opcode == "control_if_else")
+            if opcode in CONTAINERS and (body.depth >= self.depth or spare < minimum):
+                opcode = "flippermove_stopMove"
+            if opcode in CONTAINERS:
+                block_id = self.add_statement(opcode, body, 1 + (spare - minimum) // 2)
+                bodies.append(
+                    Body(
+                        block_id,
+                        "SUBSTACK",
+                        body.depth + 1,
+                        opcode == "control_if_else",
+                    )
+                )
+                continue
+
+            self.add_statement(opcode, body, (spare - 1) // 2)
+            if len(bodies) > 1 and self.random.random() < BODY_END_PROBABILITY:
+                self.close(bodies)
+
+        return {
+            "targets": [
+                {
+                    "isStage": True,
+                    "name": "Stage",
+                    "variables": {},
+                    "lists": {},
+                    "broadcasts": {},
+                    "blocks": {},
+                },
+                {
+                    "isStage": False,
+                    "name": "synthetic",
+                    "variables": {
+                        variable_id: [name, 0] for name, variable_id in self.variables
+                    },
+                    "lists": {},
+                    "broadcasts": {},
+                    "blocks": self.blocks,
+                },
+            ],
+            "extensions": ["flipperevents", "flipperdisplay", "flippermove"],
+            "meta": {"semver": "3.0.0"},
+        }
+
+
+def write_lms(filename: str, project: dict):
+    """Writes a project as a .lms file, the project.json is nested in the scratch.sb3 like in the real files.
+
+    :param filename: The path of the file.
+    :param project: The json of the project.
+    """
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w", zipfile.ZIP_DEFLATED) as inner_zip:
+        inner_zip.writestr("project.json", json.dumps(project))
+    with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as outer_zip:
+        outer_zip.writestr(
+            "manifest.json",
+            json.dumps({"type": "word-blocks", "name": os.path.basename(filename)}),
+        )
+        outer_zip.writestr("scratch.sb3", inner.getvalue())
+
+
+def generate_lms(
+    filename: str,
+    blocks: int = 1000,
+    depth: int = 3,
+    variables: int = 5,
+    mix: dict = None,
+    seed: int = 0,
+) -> str:
+    """Generates a synthetic project and writes it as a .lms file, see ProjectGenerator for the parameters.
+
+    :return: The path of the file.
+    """
+    write_lms(
+        filename, ProjectGenerator(blocks, depth, variables, mix, seed).generate()
+    )
+    return filename
+
+
+def main(
+    directory: str, blocks: list, depth: int = 3, variables: int = 5, seed: int = 0
+):
+    os.makedirs(directory, exist_ok=True)
+    for count in blocks:
+        filename = os.path.join(directory, f"synthetic_{count}.lms")
+        generate_lms(filename, count, depth, variables, seed=seed)
+        print(f"Wrote {filename}")
+
+
+if __name__ == "__main__":
+    parser = create_parser(
+        "python -m src.bench.synthetic",
+        "Writes synthetic .lms files of the given sizes, to be benchmarked with python -m src.bench DIRECTORY.",
+    )
+    parser.add_argument("directory", help="The directory the files are written to.")
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="The number of blocks of every file.",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=3, help="The maximal nesting depth."
+    )
+    parser.add_argument(
+        "--variables", type=int, default=5, help="The number of variables."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="The seed.")
+    main(**vars(parser.parse_args()))
@@ -0,0 +1,130 @@
+"""
+This file contains the index of the blocks of a project, it is built in a single pass over the blocks of the
+(filtered) json and answers the questions the visitor (and other tools) have about the blocks without scanning
+the blocks again: which stacks are there, what is the parent of a block and which blocks have a certain opcode.
+In the same pass every block is turned into a compact Block record, so the visitor does not have to dig through
+the nested lists and dicts of the json.
+"""
+import sys
+
+# Prefixes of the opcodes of hat blocks, the blocks that start a stack that is run when an event occurs.
+# Other top-level blocks start loose stacks that are never run.
+HAT_OPCODE_PREFIXES = ("flipperevents_when", "event_when", "procedures_definition")
+
+# Prefix of the names of the fields of menu blocks, the field is named after the opcode (i.e, field_<opcode>).
+MENU_FIELD_PREFIX = "field_"
+
+
+class Block:
+    """Compact record of a block, with its inputs and fields already unpacked."""
+
+    __slots__ = (
+        "opcode",
+        "next",
+        "parent",
+        "inputs",
+        "fields",
+        "menu",
+        "shadow",
+        "top_level",
+        "x",
+        "y",
+    )
+
+    def __init__(self, block: dict) -> None:
+        """
+        :param block: The json of the block.
+        """
+        # Interned, so looking it up in the dispatch tables only compares pointers
+        self.opcode = sys.intern(block["opcode"])
+        self.next = block["next"]  # The id of the next block of the stack, or None
+        self.parent = block["parent"]  # The id of the parent block, or None
+        # Maps the name of every input to its value: the id of a block or a [type, value(, id)] list
+        inputs = block["inputs"]
+        self.inputs = (
+            {name: value[1] for name, value in inputs.items()} if inputs else {}
+        )
+        # Maps the name of every field to its value, the field of a menu block is stored in menu instead
+        self.fields = {}
+        self.menu = None  # The selected value of a menu block, e.g. the ports of a port selector
+        for name, value in block["fields"].items():
+            if name.startswith(MENU_FIELD_PREFIX):
+                self.menu = value[0]
+            else:
+                self.fields[name] = value[0]
+        self.shadow = block["shadow"]
+        self.top_level = block["topLevel"]
+        # Only top-level blocks have a position
+        if self.top_level:
+            self.x = block.get("x")
+            self.y = block.get("y")
+        else:
+            self.x = self.y = None
+
+    def is_hat(self) -> bool:
+        """Checks if the block is a hat block that starts a stack, shadow blocks never are.
+
+        :return: True if the block is a hat block at the top of a stack.
+        """
+        return (
+            self.top_level
+            and not self.shadow
+            and self.opcode.startswith(HAT_OPCODE_PREFIXES)
+        )
+
+
+class BlockIndex:
+    """Index of the blocks of a project, built in one pass over the blocks."""
+
+    def __init__(self, blocks: dict) -> None:
+        """
+        :param blocks: The blocks of the project, as in the filtered json (cst["blocks"]).
+        """
+        self.blocks = {}  # Maps the id of every block to its Block record
+        self.hats = []  # The ids of the hat blocks, in the order of the json
+        # Maps the id of every block to the id of its parent (None for top-level blocks)
+        self.parents = {}
+        # Maps every opcode to the ids of the blocks with that opcode, in the order of the json
+        self.opcodes = {}
+
+        for block_id, block in blocks.items():
+            # Loose variable reporters are stored as lists rather than blocks
+            if not isinstance(block, dict):
+                continue
+            record = Block(block)
+            self.blocks[block_id] = record
+            self.parents[block_id] = record.parent
+            self.opcodes.setdefault(record.opcode, []).append(block_id)
+            if record.is_hat():
+                self.hats.append(block_id)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __contains__(self, block_id: str) -> bool:
+        return block_id in self.blocks
+
+    def __getitem__(self, block_id: str) -> Block:
+        return self.blocks[block_id]
+
+    def parent(self, block_id: str) -> str:
+        """
+        :return: The id of the parent of the block, None if it is a top-level block.
+        """
+        return self.parents[block_id]
+
+    def with_opcode(self, opcode: str) -> list:
+        """
+        :return: The ids of all the blocks with the opcode, in the order of the json.
+        """
+        return self.opcodes.get(opcode, [])
+
+    def root(self, block_id: str) -> str:
+        """Follows the parent links up to the block at the top of the stack (or input) the block belongs to.
+
+        :return: The id of the top-level block.
+        """
+        parent = self.parents[block_id]
+        while parent is not None:
+            block_id, parent = parent, self.parents[parent]
+        return block_id
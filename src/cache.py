@@ -0,0 +1,162 @@
+"""
+This file contains the on-disk cache of compiled projects.
+Entries are content addressed: the key is a hash of the (filtered) json of the project, the flags that influence the
+output and the version of the compiler, so an unchanged project is never visited or generated twice.
+The cache has a size cap, when it is exceeded the least recently used entries are evicted.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+# Default size cap of the cache in bytes.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# Directory of the compiler sources, any change to them results in a different compiler version.
+_SOURCE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+_compiler_version = None
+
+
+def compiler_version() -> str:
+    """Digest of the sources of the compiler, so entries made by a different version are never used.
+    It is only computed once per process.
+
+    :return: Hex digest of all the .py files of the compiler.
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        for root, directories, filenames in os.walk(_SOURCE_DIRECTORY):
+            directories.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    path = os.path.join(root, filename)
+                    digest.update(os.path.relpath(path, _SOURCE_DIRECTORY).encode())
+                    with open(path, "rb") as file:
+                        digest.update(file.read())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+
+class CompilationCache:
+    """Directory of cached compilation artifacts (the code and the AST representation) that is LRU evicted."""
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        :param directory: The directory the entries are stored in, it is created if it does not exist.
+        :param max_size: The size (in bytes) the entries are allowed to take together.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+        concrete_syntax_tree: dict,
+        safe: bool,
+        best_effort: bool,
+        optimize: bool = False,
+    ) -> str:
+        """Computes the key of a compilation.
+
+        :param concrete_syntax_tree: The filtered json of the project.
+        :param safe: Indicates if safer code is generated.
+        :param best_effort: Indicates if untranslatable blocks are skipped.
+        :param optimize: Indicates if the AST is optimized.
+        :return: Hex digest that identifies the compilation.
+        """
+        digest = hashlib.sha256()
+        digest.update(compiler_version().encode())
+        digest.update(
+            f"safe={safe},best_effort={best_effort},optimize={optimize}".encode()
+        )
+        digest.update(
+            json.dumps(
+                concrete_syntax_tree, sort_keys=True, separators=(",", ":")
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def path(self, key: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def load(self, key: str, kind: str) -> str:
+        """Loads an artifact and marks it as recently used.
+
+        :param key: The key of the compilation.
+        :param kind: The kind of artifact, "py" for the code or "gv" for the AST representation.
+        :return: The artifact, or None if it is not in the cache.
+        """
+        path = self.path(key, kind)
+        try:
+            with open(path) as file:
+                content = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Not cached, or evicted by another process in the meantime
+            return None
+        return content
+
+    def store(self, key: str, kind: str, content: str):
+        """Stores an artifact and evicts the least recently used ones if the cache got too big, the artifacts of the
+        key itself are kept (even if they are bigger than the cache). The artifact is written to a temporary file
+        first, so other processes never see a partial entry.
+
+        :param key: The key of the compilation.
+        :param kind: The kind of artifact, "py" for the code or "gv" for the AST representation.
+        :param content: The artifact.
+        """
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as file:
+            file.write(content)
+        os.replace(temporary_path, self.path(key, kind))
+        self.evict(key)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def entries(self) -> list:
+        """Lists all the entries of the cache.
+
+        :return: List of (path, size, last use) tuples.
+        """
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self, keep: str = None):
+        """Removes the least recently used entries until the cache is no bigger than max_size.
+
+        :param keep: The key whose artifacts are never removed (e.g. the one that was just stored), defaults to None.
+        """
+        entries = self.entries()
+        size = sum(size for _, size, _ in entries)
+        if size <= self.max_size:
+            return
+
+        for path, entry_size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if os.path.basename(path).split(".")[0] == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            if size <= self.max_size:
+                break
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,72 @@
+"""
+This file contains the helpers to build the command line interfaces of the compiler.
+Only argparse (of the standard library) is used, so the command line starts without loading any dependencies.
+"""
+import argparse
+
+
+class HelpFormatter(argparse.HelpFormatter):
+    """Shows the default of every option that has one (options that default to nothing are left alone)."""
+
+    def _get_help_string(self, action):
+        if action.default in (None, "", argparse.SUPPRESS) or not action.option_strings:
+            return action.help
+        return f"{action.help} [default: %(default)s]"
+
+
+def create_parser(prog: str, description: str) -> argparse.ArgumentParser:
+    return argparse.ArgumentParser(
+        prog=prog, description=description, formatter_class=HelpFormatter
+    )
+
+
+def add_flag(parser: argparse.ArgumentParser, name: str, default: bool, help: str):
+    """Adds a boolean option that can be turned on with --name and off with --no-name.
+
+    :param parser: The parser to add the option to.
+    :param name: The name of the option, without the dashes.
+    :param default: The value if the option is not given.
+    :param help: The explanation of the option.
+    """
+    parser.add_argument(
+        f"--{name}",
+        action=argparse.BooleanOptionalAction,
+        default=default,
+        help=help,
+    )
+
+
+def add_compile_options(parser: argparse.ArgumentParser, cache_help: str):
+    """Adds the options that influence the compilation itself (--safe, --best-effort, --optimize and --cache-dir).
+
+    :param parser: The parser to add the options to.
+    :param cache_help: The explanation of --cache-dir.
+    """
+    add_flag(
+        parser,
+        "safe",
+        False,
+        "Indicates if safer code should be outputted, the code might be more verbose.",
+    )
+    add_flag(
+        parser,
+        "best-effort",
+        True,
+        "Indicates if the code should be generated even if it contains blocks that are not translatable (will be skipped).",
+    )
+    add_flag(
+        parser,
+        "optimize",
+        False,
+        "Indicates if the code should be optimized (e.g. expressions of constants are computed at compile time), the code is then less literal.",
+    )
+    parser.add_argument("--cache-dir", default="", help=cache_help)
+
+
+def add_jobs_option(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="The number of files that are compiled in parallel. If none is provided the number of CPUs is used.",
+    )
@@ -1,4 +1,12 @@
-from src.abstract_syntax_tree import AST, CommentNode, LiteralNode, Node, NumericalNode
+from src.abstract_syntax_tree import (
+    AST,
+    BooleanLiteralNode,
+    CommentNode,
+    LiteralNode,
+    Node,
+    NumericalNode,
+    StackNode,
+)
 from src.abstract_syntax_tree.control import (
     ForeverLoopNode,
     IfElseNode,
@@ -97,12 +105,71 @@ from src.abstract_syntax_tree.variables import (
     SetVariableToNode,
     VariableNode,
 )
+from src.optimizer.sensor_reads import (
+    else_if_chain,
+    repeated_reads,
+    sensor_read,
+    shared_expressions,
+)
+from src.optimizer.type_inference import Type, TypeInference
+
+
+class CodeBuffer:
+    """Collects the lines of a section of the generated code, they are only joined once when the code is complete."""
+
+    def __init__(self) -> None:
+        self.lines = []
+        self.depth = 0  # The number of tabs every added line is indented with
+        self.prefix = ""
+
+    def add(self, *lines: str):
+        """Adds the lines at the current indentation depth.
+
+        :param lines: The lines to add, without the indentation and the newline.
+        """
+        for line in lines:
+            self.lines.append(self.prefix)
+            self.lines.append(line)
+            self.lines.append("\n")
+
+    def indent(self):
+        self.depth += 1
+        self.prefix = "\t" * self.depth
+
+    def dedent(self):
+        self.depth -= 1
+        self.prefix = "\t" * self.depth
+
+    def __len__(self) -> int:
+        # Every line is stored as its prefix, its content and a newline
+        return len(self.lines) // 3
+
+    def __str__(self) -> str:
+        return "".join(self.lines)
+
+
+def generates(node_class: type):
+    """Decorator that registers a CodeGenerator method as the handler for the nodes of node_class (and its subclasses).
+
+    :param node_class: The AST node class the method generates the code for.
+    """
+
+    def decorator(method):
+        method.node_classes = getattr(method, "node_classes", []) + [node_class]
+        return method
+
+    return decorator
+
+
+# The constructors of the objects of the devices that are connected to a port.
+DEVICES = ("Motor", "ColorSensor", "DistanceSensor")
 
 
 class CodeGenerator:
-    def __init__(self, safe=False):
+    def __init__(self, safe=False, optimize=False):
         """The goal for the code generation is to translate the code as literal as possible.
         Furthermore the goal is to generate code as close as the boilerplate that is provided by LEGO.
+        Unless optimize is used, then conversions that are not needed (according to the type inference) are left out.
         """
 
         # All the includes that LEGO deems necessary
@@ -113,22 +180,53 @@ import math
 """
         # Collection of all the objects that are added to self.objects_code
         self.objects = set()
+        # Maps the code of every constant structure that is added to self.objects_code to the name of its constant
+        self.constants = {}
+        # Maps the constructor and port of every device object that is added to self.objects_code to its variable
+        self.devices = {}
         self.functions = set()
 
-        self.objects_code = ""
-        self.functions_code = ""
-        self.program_code = ""
-
-        self.indentation = ""
+        self.objects_code = CodeBuffer()
+        self.functions_code = CodeBuffer()
+        self.program_code = CodeBuffer()
 
         # Indicates wether safe code should be generated which might be a bit more verbose
         self.safe_flag = safe
+        # Indicates wether optimized code should be generated, which is less literal
+        self.optimize_flag = optimize
+        # The types of the expressions of the AST that is generated, only inferred for optimized code
+        self.types = None
+        # The number of values that integer converted so far, to tell whether a line needs a note about the conversion
+        self.conversions = 0
+        # Maps the sensor reads (see sensor_read) that are shared by the block that is generated to their variable
+        self.sensor_reads = {}
+        # The blocks of an else if chain, they use the sensor reads of the first block of the chain
+        self.else_ifs = set()
 
     def generate(self, ast: AST) -> str:
-        # TODO: This will need to be changed later to support multiple block-states
-
-        if len(ast.hat_nodes):  # Check if not empty
-            self.visit(ast.hat_nodes[0])
+        if self.optimize_flag:
+            self.types = TypeInference(ast)
+
+        # Every stack is generated after the previous one, in the order of the json
+        endless = False
+        for hat_node in ast.hat_nodes:
+            if endless:
+                self.program_code.add(
+                    "# Note: This stack never runs, since the stacks run after each other and the stack before it never ends."
+                )
+            self.visit_stack(hat_node)
+            node = hat_node
+            while node.next:
+                node = node.next
+            endless = endless or isinstance(node, ForeverLoopNode)
+
+        if "_device" in self.functions:
+            # After all the stacks, so the objects of all the fixed ports are known
+            devices = ", ".join(
+                f"({constructor}, {port}): {variable}"
+                for (constructor, port), variable in self.devices.items()
+            )
+            self.objects_code.add(f"_devices = {{{devices}}}")
 
         # Return the complete code
         if len(self.functions_code):
@@ -148,9 +246,46 @@ import math
 {self.program_code}
 """
 
-    # flake8: noqa: C901
+    @classmethod
+    def handlers(cls) -> dict:
+        """Returns the table that maps every node class to the method that generates its code, built once per class.
+        Methods of subclasses take precedence and overridden methods are looked up on the class itself.
+
+        :return: The handler table of this class.
+        :rtype: dict
+        """
+        table = cls.__dict__.get("_handlers")
+        if table is None:
+            table = {}
+            for klass in reversed(cls.__mro__):
+                for name, attribute in vars(klass).items():
+                    for node_class in getattr(attribute, "node_classes", []):
+                        table[node_class] = getattr(cls, name)
+            cls._handlers = table
+            cls._handler_cache = {}
+        return table
+
+    @classmethod
+    def handler_for(cls, node_class: type):
+        """Returns the method that generates the code for nodes of node_class.
+        The result is memoized per node class, so its MRO is only walked the first time it is seen.
+
+        :param node_class: The type of the node.
+        :return: The handler, or None if no code can be generated for the node class.
+        """
+        try:
+            return cls.__dict__["_handler_cache"][node_class]
+        except KeyError:
+            handlers = cls.handlers()
+            handler = next(
+                (handlers[base] for base in node_class.__mro__ if base in handlers),
+                None,
+            )
+            cls._handler_cache[node_class] = handler
+            return handler
+
     def visit(self, node: Node) -> str:
-        """Visit the node in the AST, decide which type it is and call the appropriate method.
+        """Visit the node in the AST, look up the handler for its type and call it.
 
         :param node: The AST node that is being visited.
         :return: The code for the subtree rotted at node, if any (some sub-trees return trees, others don't)
@@ -158,172 +293,110 @@ import math
 
         if not node:
             return ""
-        elif isinstance(node, WhenProgramStartsNode):
-            return self.visit_when_program_starts_node(node)
-        elif isinstance(node, RunMotorForDurationNode):
-            return self.visit_run_motor_tor_duration_node(node)
-        elif isinstance(node, NumericalNode):
-            return self.visit_numerical_node(node)
-        elif isinstance(node, ArithmeticalNode):
-            return self.visit_arithmetical_node(node)
-        elif isinstance(node, SetVariableToNode):
-            return self.visit_set_variable_to_node(node)
-        elif isinstance(node, VariableNode):
-            return self.visit_variable_node(node)
-        elif isinstance(node, MotorGoToPositionNode):
-            return self.visit_motor_got_to_position_node(node)
-        elif isinstance(node, StartMotorNode):
-            return self.visit_start_motor_node(node)
-        elif isinstance(node, StopMotorNode):
-            return self.visit_stop_motor_node(node)
-        elif isinstance(node, SetMotorSpeedNode):
-            return self.visit_set_motor_speed_node(node)
-        elif isinstance(node, MotorSpeedNode):
-            return self.visit_motor_speed_node(node)
-        elif isinstance(node, MotorPositionNode):
-            return self.visit_motor_position_node(node)
-        elif isinstance(node, ChangeVariableByNode):
-            return self.visit_change_variable_by_node(node)
-        elif isinstance(node, LiteralNode):
-            return self.visit_literal_node(node)
-        elif isinstance(node, AddItemToListNode):
-            return self.visit_add_item_to_list_node(node)
-        elif isinstance(node, SetMovementMotorsNode):
-            return self.visit_set_movement_motors_node(node)
-        elif isinstance(node, MoveForDurationNode):
-            return self.visit_move_for_duration_node(node)
-        elif isinstance(node, MoveWithSteeringNode):
-            return self.visit_move_with_steering_node(node)
-        elif isinstance(node, StartMovingWithSteering):
-            return self.visit_start_moving_with_steering_node(node)
-        elif isinstance(node, StopMovingNode):
-            return self.visit_stop_moving_node(node)
-        elif isinstance(node, SetMovementSpeedNode):
-            return self.visit_set_movement_speed_node(node)
-        elif isinstance(node, SetMotorRotationNode):
-            return self.visit_set_motor_rotation_node(node)
-        elif isinstance(node, CommentNode):
-            return self.visit_comment_node(node)
-        elif isinstance(node, TurnOnForDurationNode):
-            self.visit_turn_on_for_duration_node(node)
-        elif isinstance(node, TurnOnNode):
-            return self.visit_turn_on_node(node)
-        elif isinstance(node, WriteNode):
-            return self.visit_write_node(node)
-        elif isinstance(node, TurnOffPixelsNode):
-            return self.visit_turn_off_pixels_node(node)
-        elif isinstance(node, SetPixelBrightnessNode):
-            return self.visit_set_pixel_brightness_node(node)
-        elif isinstance(node, SetPixelNode):
-            return self.visit_set_pixel_node(node)
-        elif isinstance(node, SetCenterButtonNode):
-            return self.visit_set_center_button_node(node)
-        elif isinstance(node, LightUpDistanceSensorNode):
-            return self.visit_light_up_distance_sensor_node(node)
-        elif isinstance(node, DeleteItemInListNode):
-            return self.visit_delete_item_in_list_node(node)
-        elif isinstance(node, DeleteAllItemsInListNode):
-            return self.visit_delete_all_items_in_list_node(node)
-        elif isinstance(node, LengthOfListNode):
-            return self.visit_length_of_list_node(node)
-        elif isinstance(node, InsertItemAtIndexNode):
-            return self.visit_insert_item_at_index_node(node)
-        elif isinstance(node, ItemAtIndexNode):
-            return self.visit_item_at_index_node(node)
-        elif isinstance(node, ReplaceItemAtIndexNode):
-            return self.visit_replace_item_at_index_node(node)
-        elif isinstance(node, IndexOfItemNode):
-            return self.visit_index_of_item_node(node)
-        elif isinstance(node, IfThenNode):
-            return self.visit_if_then_node(node)
-        elif isinstance(node, ListContainsNode):
-            return self.visit_list_contains_node(node)
-        elif isinstance(node, PickRandomNumberNode):
-            return self.visit_pick_random_number_node(node)
-        elif isinstance(node, ComparisonNode):
-            return self.visit_comparison_node(node)
-        elif isinstance(node, NotNode):
-            return self.visit_not_node(node)
-        elif isinstance(node, IsBetweenNode):
-            return self.visit_is_between_node(node)
-        elif isinstance(node, JoinStringsNode):
-            return self.visit_join_strings_node(node)
-        elif isinstance(node, LetterOfStringNode):
-            return self.visit_letter_of_string_node(node)
-        elif isinstance(node, LengthOfStringNode):
-            return self.visit_length_of_string_node(node)
-        elif isinstance(node, StringContainsNode):
-            return self.visit_string_contains_node(node)
-        elif isinstance(node, ModNode):
-            return self.visit_mod_node(node)
-        elif isinstance(node, RoundNode):
-            return self.visit_round_node(node)
-        elif isinstance(node, UnaryMathFunctionNode):
-            return self.visit_unary_math_function_node(node)
-        elif isinstance(node, BinaryMathFunctionNode):
-            return self.visit_binary_math_function_node(node)
-        elif isinstance(node, WaitForSecondsNode):
-            return self.visit_wait_for_seconds_node(node)
-        elif isinstance(node, WaitUntilNode):
-            return self.visit_wait_until_node(node)
-        elif isinstance(node, HubInteractionNode):
-            return self.visit_hub_interaction_node(node)
-        elif isinstance(node, RepeatLoopNode):
-            return self.visit_repeat_loop_node(node)
-        elif isinstance(node, ForeverLoopNode):
-            return self.visit_forever_loop_node(node)
-        elif isinstance(node, RepeatUntilNode):
-            return self.visit_repeat_until_node(node)
-        elif isinstance(node, IfElseNode):
-            return self.visit_if_else_node(node)
-        elif isinstance(node, IsColorNode):
-            return self.visit_is_color_node(node)
-        elif isinstance(node, ColorNode):
-            return self.visit_color_node(node)
-        elif isinstance(node, IsReflectionNode):
-            return self.visit_is_reflection_node(node)
-        elif isinstance(node, ReflectedLightNode):
-            return self.visit_reflected_light_node(node)
-        elif isinstance(node, IsDistanceNode):
-            return self.visit_is_distance_node(node)
-        elif isinstance(node, DistanceNode):
-            return self.visit_distance_node(node)
-        elif isinstance(node, GestureNode):
-            return self.visit_gesture_node(node)
-        elif isinstance(node, IsOrientationNode):
-            return self.visit_is_orientation_node(node)
-        elif isinstance(node, OrientationNode):
-            return self.visit_orientation_node(node)
-        elif isinstance(node, SetYawAngleNode):
-            return self.visit_set_yaw_angle_node(node)
-        elif isinstance(node, IsButtonPressedNode):
-            return self.visit_is_button_pressed_node(node)
-        elif isinstance(node, HubAngleNode):
-            return self.visit_hub_angle_node(node)
-        elif isinstance(node, TimerNode):
-            return self.visit_timer_node(node)
-        elif isinstance(node, ResetTimerNode):
-            return self.visit_reset_timer_node(node)
-        elif isinstance(node, IsKeyPressedNode):
-            return self.visit_is_key_pressed_node(node)
-        elif isinstance(node, PlaySoundUntilDoneNode):
-            return self.visit_play_sound_until_done_node(node)
-        elif isinstance(node, StartSoundNode):
-            return self.visit_start_sound_node(node)
-        elif isinstance(node, PlayBeepNode):
-            return self.visit_play_beep_node(node)
-        elif isinstance(node, StartBeepNode):
-            return self.visit_start_beep_node(node)
-        elif isinstance(node, StopBeepNode):
-            return self.visit_stop_beep_node(node)
-        elif isinstance(node, ChangeVolumeNode):
-            return self.visit_change_volume_node(node)
-        elif isinstance(node, SetVolumeNode):
-            return self.visit_set_volume_node(node)
-        elif isinstance(node, VolumeNode):
-            return self.visit_volume_node(node)
-        else:
+        handler = self.handler_for(type(node))
+        if handler is None:
             raise NotImplementedError(f"Currently no code can be generated for {node}")
+        return handler(self, node)
+
+    def visit_stack(self, node: StackNode):
+        """Generates the code for the stack of nodes that starts at node.
+        The next pointers are followed in a loop, so the recursion depth only depends on how deeply bodies are nested,
+        not on the length of the program.
+
+        :param node: The first node of the stack, or None.
+        """
+        while node:
+            if self.optimize_flag:
+                sensor_reads = self.sensor_reads
+                self.sensor_reads = self.share_sensor_reads(node)
+                self.visit(node)
+                self.sensor_reads = sensor_reads
+            else:
+                self.visit(node)
+            node = node.next
+
+    def share_sensor_reads(self, node: StackNode) -> dict:
+        """Generates the code that reads the sensors that are read more than once by the expressions of the block
+        (see sensor_reads.py for which reads are shared) into variables.
+
+        :param node: The block that is generated next.
+        :return: Maps every shared read to its variable.
+        """
+        if node in self.else_ifs:
+            return self.sensor_reads
+        reads = repeated_reads(shared_expressions(node))
+        if reads:
+            self.else_ifs.update(else_if_chain(node))
+
+        sensor_reads = {}
+        for sensor, method in reads:
+            variable = f"_{sensor}_{method[len('get_'):]}"
+            self.program_code.add(f"{variable} = {sensor}.{method}()")
+            sensor_reads[(sensor, method)] = variable
+        return sensor_reads
+
+    def read_sensor(self, node: Node) -> str:
+        """Generates the code for the read of a sensor.
+
+        :param node: The node that reads the sensor.
+        :return: The code of the value, the variable of the read if it is shared.
+        """
+        read = sensor_read(node)
+        variable = self.sensor_reads.get(read)
+        if variable is None:
+            sensor, method = read
+            return f"{sensor}.{method}()"
+        return variable
+
+    def integer(self, node: Node, code: str = None) -> str:
+        """Generates the code for a value that should be an integer, it is converted unless it is known to be one.
+
+        :param node: The node of the value.
+        :param code: The code of the value, defaults to the code of the node.
+        :return: The code of the integer.
+        """
+        if code is None:
+            code = self.visit(node)
+        if self.types and self.types.type_of(node) is Type.INT:
+            return code
+        self.conversions += 1
+        return f"int({code})"
+
+    def conversion_note(self, code: str, conversions: int, index: bool = False) -> str:
+        """Adds the note about the conversion of the values to a line, if integer converted one of them.
+
+        :param code: The code of the line.
+        :param conversions: The number of conversions (self.conversions) from before the code was generated.
+        :param index: Whether the method also counts from 0 rather than 1, which is noted even without a conversion.
+        :return: The code of the line with the note.
+        """
+        if self.conversions > conversions:
+            if index:
+                return f"{code}  # Note: This method expects integers so wee need to convert the value. Also starts with 0 not 1."
+            return f"{code}  # Note: This method expects an integer so wee need to convert the value."
+        if index:
+            return f"{code}  # Note: This method starts with 0 not 1."
+        return code
+
+    def generate_constant(self, name: str, value: str) -> str:
+        """Generates a constant for a literal structure (e.g. a lookup table) once, so the hub builds it once rather
+        than every time the code that uses it runs. Only for optimized code, otherwise the structure is used as it is.
+
+        :param name: The name for the constant, a number is added if it is already taken.
+        :param value: The code of the structure.
+        :return: The code to use the structure with.
+        """
+        if not self.optimize_flag:
+            return value
+        constant = self.constants.get(value)
+        if constant is None:
+            constant = name
+            if constant in self.objects:
+                constant = f"{name}_{len(self.constants)}"
+            self.constants[value] = constant
+            self.objects.add(constant)
+            self.objects_code.add(f"{constant} = {value}")
+        return constant
 
     def generate_object(self, variable: str, object: str, ports: Node):
         """Generates the code for the object generation.
@@ -335,18 +408,49 @@ import math
 
         if variable not in self.objects:
             self.objects.add(variable)
-            self.objects_code += f"{variable} = {object}({ports})\n"
+            self.objects_code.add(f"{variable} = {object}({ports})")
+            if object in DEVICES:
+                self.devices[(object, ports)] = variable
+
+    def generate_device(self, constructor: str, port: str) -> str:
+        """Generates the code for the object of the device on a port that is only known when the code runs.
+        When optimizing, the object is created once by _device and shared with the object of the fixed port, rather
+        than created every time the code runs.
+
+        :param constructor: The name of the constructor for the object.
+        :param port: The code of the port identifier.
+        :return: The code of the object.
+        """
+        if not self.optimize_flag:
+            return f"{constructor}({port})"
+        if "_device" not in self.functions:
+            self.functions.add("_device")
+            self.functions_code.add(
+                "# This is a helper function that creates the object of the device on a port once and reuses it after.",
+                "def _device(constructor, port):",
+                "\tdevice = _devices.get((constructor, port))",
+                "\tif device is None:",
+                "\t\tdevice = _devices[(constructor, port)] = constructor(port)",
+                "\treturn device",
+            )
+        return f"_device({constructor}, {port})"
 
+    @generates(WhenProgramStartsNode)
     def visit_when_program_starts_node(self, node: WhenProgramStartsNode) -> str:
-        self.visit(node.next)
+        # The hat block itself has no code, the rest of the stack is generated by visit_stack
+        pass
 
     def visit_run_motor_tor_duration_node_fixed_ports(
         self, node: RunMotorForDurationNode
     ):
         # Print a note if there are multiple ports that should run.
         if len(node.ports.value) > 1:
-            self.program_code += f"{self.indentation}# Note: This will turn the motors after each other rather than at the same time.\n"
-            self.program_code += f"{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.\n"
+            self.program_code.add(
+                "# Note: This will turn the motors after each other rather than at the same time."
+            )
+            self.program_code.add(
+                "#   This is because there is no way to turn multiple Motors at the same time in Python."
+            )
 
         for port in node.ports.value:
             # Generate the object to call the method on
@@ -360,21 +464,28 @@ import math
 
             # Add the code and keep exploring
             if node.unit.code() == "degrees":
-                self.program_code += f"{self.indentation}{variable}.run_for_degrees(int({value_code}))  # Note: This method expects an integer so wee need to convert the value.\n"
+                conversions = self.conversions
+                self.program_code.add(
+                    self.conversion_note(
+                        f"{variable}.run_for_degrees({self.integer(node.value, value_code)})",
+                        conversions,
+                    )
+                )
             else:
-                self.program_code += f"{self.indentation}{variable}.run_for_{node.unit.code()}({value_code})\n"
-
-        self.visit(node.next)
+                self.program_code.add(
+                    f"{variable}.run_for_{node.unit.code()}({value_code})"
+                )
 
     def visit_run_motor_tor_duration_node_variable_ports(
         self, node: RunMotorForDurationNode
     ):
         # Print a note as to why this code is needed and what it is doing
-        self.program_code += f"""{self.indentation}# Note: Since the content of the variable can't always be inferred at the time of the conversion
-{self.indentation}#   this code is needed. This will turn the motors after each other rather than at the same time.
-{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.
-"""
-        self.program_code += f"{self.indentation}for port in {node.ports.name}:\n"
+        self.program_code.add(
+            "# Note: Since the content of the variable can't always be inferred at the time of the conversion",
+            "#   this code is needed. This will turn the motors after each other rather than at the same time.",
+            "#   This is because there is no way to turn multiple Motors at the same time in Python.",
+        )
+        self.program_code.add(f"for port in {node.ports.name}:")
 
         # If the direction is counter wise negate the value
         value_code = self.visit(node.value)
@@ -382,11 +493,19 @@ import math
             value_code = f"-{value_code}"
 
         if node.unit.code() == "degrees":
-            self.program_code += f"{self.indentation}\tMotor(port).run_for_degrees(int({value_code}))  # Note: This method expects an integer so wee need to convert the value.\n"
+            conversions = self.conversions
+            self.program_code.add(
+                self.conversion_note(
+                    f"\t{self.generate_device('Motor', 'port')}.run_for_degrees({self.integer(node.value, value_code)})",
+                    conversions,
+                )
+            )
         else:
-            self.program_code += f"{self.indentation}\tMotor(port).run_for_{node.unit.code()}({value_code})\n"
-        self.visit(node.next)
+            self.program_code.add(
+                f"\t{self.generate_device('Motor', 'port')}.run_for_{node.unit.code()}({value_code})"
+            )
 
+    @generates(RunMotorForDurationNode)
     def visit_run_motor_tor_duration_node(self, node: RunMotorForDurationNode):
         if isinstance(node.ports, ListLiteralNode):
             self.visit_run_motor_tor_duration_node_fixed_ports(node)
@@ -397,18 +516,19 @@ import math
                 f"The following node is not currently supported in the port field: {node.ports}"
             )
 
+    @generates(NumericalNode)
     def visit_numerical_node(self, node: NumericalNode):
         return node.value
 
+    @generates(ArithmeticalNode)
     def visit_arithmetical_node(self, node: ArithmeticalNode):
         return f"({self.visit(node.left_hand)} {node.op.code()} {self.visit(node.right_hand)})"
 
+    @generates(SetVariableToNode)
     def visit_set_variable_to_node(self, node: SetVariableToNode):
-        self.program_code += (
-            f"{self.indentation}{node.variable} = {self.visit(node.value)}\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"{node.variable} = {self.visit(node.value)}")
 
+    @generates(VariableNode)
     def visit_variable_node(self, node: VariableNode):
         # TODO: Need to check how multiple variables are handled in a program. If that causes issue use the id here rather than the name (since the id is unique)
         # TODO: Might want to make the object here as well
@@ -417,8 +537,12 @@ import math
     def visit_motor_got_to_position_node_fixed_ports(self, node: MotorGoToPositionNode):
         # Print a note if there are multiple ports that should run.
         if len(node.ports.value) > 1:
-            self.program_code += f"{self.indentation}# Note: This will turn the motors after each other rather than at the same time.\n"
-            self.program_code += f"{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.\n"
+            self.program_code.add(
+                "# Note: This will turn the motors after each other rather than at the same time."
+            )
+            self.program_code.add(
+                "#   This is because there is no way to turn multiple Motors at the same time in Python."
+            )
 
         for port in node.ports.value:
             # Generate the object to call the method on
@@ -431,18 +555,24 @@ import math
                 value_code = f"-{value_code}"
 
             # Add the code and keep exploring
-            self.program_code += f"{self.indentation}{variable}.run_to_position(int({value_code}), '{node.direction.code()}')  # Note: This method expects an integer so wee need to convert the value.\n"
-        self.visit(node.next)
+            conversions = self.conversions
+            self.program_code.add(
+                self.conversion_note(
+                    f"{variable}.run_to_position({self.integer(node.value, value_code)}, '{node.direction.code()}')",
+                    conversions,
+                )
+            )
 
     def visit_motor_got_to_position_node_variable_ports(
         self, node: MotorGoToPositionNode
     ):
         # Print a note as to why this code is needed and what it is doing
-        self.program_code += f"""{self.indentation}# Note: Since the content of the variable can't always be inferred at the time of the conversion
-{self.indentation}#   this code is needed. This will turn the motors after each other rather than at the same time.
-{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.
-"""
-        self.program_code += f"{self.indentation}for port in {node.ports.name}:\n"
+        self.program_code.add(
+            "# Note: Since the content of the variable can't always be inferred at the time of the conversion",
+            "#   this code is needed. This will turn the motors after each other rather than at the same time.",
+            "#   This is because there is no way to turn multiple Motors at the same time in Python.",
+        )
+        self.program_code.add(f"for port in {node.ports.name}:")
 
         # If the direction is counter wise negate the value
         value_code = self.visit(node.value)
@@ -450,9 +580,15 @@ import math
             value_code = f"-{value_code}"
 
         # Add the code and keep exploring
-        self.program_code += f"{self.indentation}\tMotor(port).run_to_position(int({value_code}), '{node.direction.code()}')  # Note: This method expects an integer so wee need to convert the value.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"\t{self.generate_device('Motor', 'port')}.run_to_position({self.integer(node.value, value_code)}, '{node.direction.code()}')",
+                conversions,
+            )
+        )
 
+    @generates(MotorGoToPositionNode)
     def visit_motor_got_to_position_node(self, node: MotorGoToPositionNode):
         if isinstance(node.ports, ListLiteralNode):
             self.visit_motor_got_to_position_node_fixed_ports(node)
@@ -466,8 +602,12 @@ import math
     def visit_start_motor_node_fixed_ports(self, node: StartMotorNode):
         # Print a note if there are multiple ports that should run.
         if len(node.ports.value) > 1:
-            self.program_code += f"{self.indentation}# Note: This will turn the motors after each other rather than at the same time.\n"
-            self.program_code += f"{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.\n"
+            self.program_code.add(
+                "# Note: This will turn the motors after each other rather than at the same time."
+            )
+            self.program_code.add(
+                "#   This is because there is no way to turn multiple Motors at the same time in Python."
+            )
 
         for port in node.ports.value:
             # Generate the object to call the method on
@@ -475,25 +615,25 @@ import math
             self.generate_object(variable, "Motor", f"'{port}'")
 
             if node.direction == TurnDirection.COUNTERCLOCKWISE:
-                self.program_code += f"{self.indentation}{variable}.start(-{variable}.get_default_speed())\n"
+                self.program_code.add(
+                    f"{variable}.start(-{variable}.get_default_speed())"
+                )
             else:
-                self.program_code += f"{self.indentation}{variable}.start()\n"
-            self.visit(node.next)
-
-        self.visit(node.next)
+                self.program_code.add(f"{variable}.start()")
 
     def visit_start_motor_node_variable_ports(self, node: StartMotorNode):
         # Print a note as to why this code is needed and what it is doing
-        self.program_code += f"""{self.indentation}# Note: Since the content of the variable can't always be inferred at the time of the conversion
-{self.indentation}#   this code is needed. This will turn the motors after each other rather than at the same time.
-{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.
-"""
-        self.program_code += f"{self.indentation}for port in {node.ports.name}:\n"
+        self.program_code.add(
+            "# Note: Since the content of the variable can't always be inferred at the time of the conversion",
+            "#   this code is needed. This will turn the motors after each other rather than at the same time.",
+            "#   This is because there is no way to turn multiple Motors at the same time in Python.",
+        )
+        self.program_code.add(f"for port in {node.ports.name}:")
 
         # Add the code and keep exploring
-        self.program_code += f"{self.indentation}\tMotor(port).start()\n"
-        self.visit(node.next)
+        self.program_code.add(f"\t{self.generate_device('Motor', 'port')}.start()")
 
+    @generates(StartMotorNode)
     def visit_start_motor_node(self, node: StartMotorNode):
         if isinstance(node.ports, ListLiteralNode):
             self.visit_start_motor_node_fixed_ports(node)
@@ -507,31 +647,33 @@ import math
     def visit_stop_motor_node_fixed_ports(self, node: StopMotorNode):
         # Print a note if there are multiple ports that should run.
         if len(node.ports.value) > 1:
-            self.program_code += f"{self.indentation}# Note: This will turn the motors after each other rather than at the same time.\n"
-            self.program_code += f"{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.\n"
+            self.program_code.add(
+                "# Note: This will turn the motors after each other rather than at the same time."
+            )
+            self.program_code.add(
+                "#   This is because there is no way to turn multiple Motors at the same time in Python."
+            )
 
         for port in node.ports.value:
             # Generate the object to call the method on
             variable = f"motor_{port.lower()}"
             self.generate_object(variable, "Motor", f"'{port}'")
 
-            self.program_code += f"{self.indentation}{variable}.stop()\n"
-            self.visit(node.next)
-
-        self.visit(node.next)
+            self.program_code.add(f"{variable}.stop()")
 
     def visit_stop_motor_node_variable_ports(self, node: StopMotorNode):
         # Print a note as to why this code is needed and what it is doing
-        self.program_code += f"""{self.indentation}# Note: Since the content of the variable can't always be inferred at the time of the conversion
-{self.indentation}#   this code is needed. This will turn the motors after each other rather than at the same time.
-{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.
-"""
-        self.program_code += f"{self.indentation}for port in {node.ports.name}:\n"
+        self.program_code.add(
+            "# Note: Since the content of the variable can't always be inferred at the time of the conversion",
+            "#   this code is needed. This will turn the motors after each other rather than at the same time.",
+            "#   This is because there is no way to turn multiple Motors at the same time in Python.",
+        )
+        self.program_code.add(f"for port in {node.ports.name}:")
 
         # Add the code and keep exploring
-        self.program_code += f"{self.indentation}\tMotor(port).stop()\n"
-        self.visit(node.next)
+        self.program_code.add(f"\t{self.generate_device('Motor', 'port')}.stop()")
 
+    @generates(StopMotorNode)
     def visit_stop_motor_node(self, node: StopMotorNode):
         if isinstance(node.ports, ListLiteralNode):
             self.visit_stop_motor_node_fixed_ports(node)
@@ -545,31 +687,45 @@ import math
     def visit_motor_speed_node_fixed_ports(self, node: SetMotorSpeedNode):
         # Print a note if there are multiple ports that should run.
         if len(node.ports.value) > 1:
-            self.program_code += f"{self.indentation}# Note: This will turn the motors after each other rather than at the same time.\n"
-            self.program_code += f"{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.\n"
+            self.program_code.add(
+                "# Note: This will turn the motors after each other rather than at the same time."
+            )
+            self.program_code.add(
+                "#   This is because there is no way to turn multiple Motors at the same time in Python."
+            )
 
         for port in node.ports.value:
             # Generate the object to call the method on
             variable = f"motor_{port.lower()}"
             self.generate_object(variable, "Motor", f"'{port}'")
 
-            self.program_code += f"{self.indentation}{variable}.set_default_speed(int({self.visit(node.value)}))  # Note: This method expects an integer so wee need to convert the value.\n"
-            self.visit(node.next)
-
-        self.visit(node.next)
+            conversions = self.conversions
+            self.program_code.add(
+                self.conversion_note(
+                    f"{variable}.set_default_speed({self.integer(node.value)})",
+                    conversions,
+                )
+            )
 
     def visit_motor_speed_node_variable_ports(self, node: SetMotorSpeedNode):
         # Print a note as to why this code is needed and what it is doing
-        self.program_code += f"""{self.indentation}# Note: Since the content of the variable can't always be inferred at the time of the conversion
-{self.indentation}#   this code is needed. This will turn the motors after each other rather than at the same time.
-{self.indentation}#   This is because there is no way to turn multiple Motors at the same time in Python.
-"""
-        self.program_code += f"{self.indentation}for port in {node.ports.name}:\n"
+        self.program_code.add(
+            "# Note: Since the content of the variable can't always be inferred at the time of the conversion",
+            "#   this code is needed. This will turn the motors after each other rather than at the same time.",
+            "#   This is because there is no way to turn multiple Motors at the same time in Python.",
+        )
+        self.program_code.add(f"for port in {node.ports.name}:")
 
         # Add the code and keep exploring
-        self.program_code += f"{self.indentation}\tMotor(port).set_default_speed(int({self.visit(node.value)}))  # Note: This method expects an integer so wee need to convert the value.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"\t{self.generate_device('Motor', 'port')}.set_default_speed({self.integer(node.value)})",
+                conversions,
+            )
+        )
 
+    @generates(SetMotorSpeedNode)
     def visit_set_motor_speed_node(self, node: SetMotorSpeedNode):
         if isinstance(node.ports, ListLiteralNode):
             self.visit_motor_speed_node_fixed_ports(node)
@@ -580,6 +736,7 @@ import math
                 f"The following node is not currently supported in the port field: {node.ports}"
             )
 
+    @generates(MotorSpeedNode)
     def visit_motor_speed_node(self, node: MotorSpeedNode):
         if isinstance(node.port, ListLiteralNode):
             # Generate the object to call the method on
@@ -588,14 +745,15 @@ import math
             return f"{variable}.get_speed()"
         elif isinstance(node.port, VariableNode):
             if self.safe_flag:
-                return f"(Motor({node.port.name}[0].upper()).get_speed() if (len({node.port.name}) > 0 and {node.port.name}[0].lower() in 'abcdef') else  0)"
+                return f"({self.generate_device('Motor', f'{node.port.name}[0].upper()')}.get_speed() if (len({node.port.name}) > 0 and {node.port.name}[0].lower() in 'abcdef') else  0)"
             else:
-                return f"Motor({node.port.name}[0]).get_speed()"
+                return f"{self.generate_device('Motor', f'{node.port.name}[0]')}.get_speed()"
         else:
             raise NotImplementedError(
                 f"The following node is not currently supported in the port field: {node.port}"
             )
 
+    @generates(MotorPositionNode)
     def visit_motor_position_node(self, node: MotorPositionNode):
         if isinstance(node.port, ListLiteralNode):
             # Generate the object to call the method on
@@ -604,94 +762,117 @@ import math
             return f"{variable}.get_position()"
         elif isinstance(node.port, VariableNode):
             if self.safe_flag:
-                return f"(Motor({node.port.name}[0].upper()).get_position() if (len({node.port.name}) > 0 and {node.port.name}[0].lower() in 'abcdef') else  0)"
+                return f"({self.generate_device('Motor', f'{node.port.name}[0].upper()')}.get_position() if (len({node.port.name}) > 0 and {node.port.name}[0].lower() in 'abcdef') else  0)"
             else:
-                return f"Motor({node.port.name}[0]).get_position()"
+                return f"{self.generate_device('Motor', f'{node.port.name}[0]')}.get_position()"
         else:
             raise NotImplementedError(
                 f"The following node is not currently supported in the port field: {node.port}"
             )
 
+    @generates(ChangeVariableByNode)
     def visit_change_variable_by_node(self, node: ChangeVariableByNode):
-        self.program_code += (
-            f"{self.indentation}{node.variable} += {self.visit(node.value)}\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"{node.variable} += {self.visit(node.value)}")
 
+    @generates(LiteralNode)
     def visit_literal_node(self, node: LiteralNode):
         return f"'{node.value}'"
 
+    @generates(BooleanLiteralNode)
+    def visit_boolean_literal_node(self, node: BooleanLiteralNode):
+        return f"{node.value}"
+
+    @generates(AddItemToListNode)
     def visit_add_item_to_list_node(self, node: AddItemToListNode):
         variable = node.variable
         if variable not in self.objects:
             self.objects.add(variable)
-            self.objects_code += f"{variable} = []\n"
+            self.objects_code.add(f"{variable} = []")
 
-        self.program_code += (
-            f"{self.indentation}{variable}.append({self.visit(node.value)})\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"{variable}.append({self.visit(node.value)})")
 
+    @generates(SetMovementMotorsNode)
     def visit_set_movement_motors_node(self, node: SetMovementMotorsNode):
         if isinstance(node.ports, ListLiteralNode):
-            self.program_code += f"{self.indentation}motor_pair = MotorPair('{node.ports.value[0]}', '{node.ports.value[1]}')\n"
+            self.program_code.add(
+                f"motor_pair = MotorPair('{node.ports.value[0]}', '{node.ports.value[1]}')"
+            )
         else:
             ports = self.visit(node.ports)
-            self.program_code += f"{self.indentation}# Note: This will fail if the first two items in {ports} are not valid ports.\n"
-            self.program_code += (
-                f"{self.indentation}motor_pair = MotorPair({ports}[0], {ports}[1])\n"
+            self.program_code.add(
+                f"# Note: This will fail if the first two items in {ports} are not valid ports."
             )
+            self.program_code.add(f"motor_pair = MotorPair({ports}[0], {ports}[1])")
 
-        self.program_code += f"{self.indentation}motor_pair.set_default_speed(50)  # Note: Needed since the default speed is 100, which is too fast.\n"
-        self.visit(node.next)
+        self.program_code.add(
+            "motor_pair.set_default_speed(50)  # Note: Needed since the default speed is 100, which is too fast."
+        )
 
+    @generates(MoveForDurationNode)
     def visit_move_for_duration_node(self, node: MoveForDurationNode):
         value = self.visit(node.value)
         if node.direction == MovementDirection.CLOCKWISE:
-            self.program_code += f"{self.indentation}motor_pair.move({value}, '{node.unit.code()}', 100)\n"
+            self.program_code.add(
+                f"motor_pair.move({value}, '{node.unit.code()}', 100)"
+            )
         elif node.direction == MovementDirection.COUNTERCLOCKWISE:
-            self.program_code += f"{self.indentation}motor_pair.move({value}, '{node.unit.code()}', -100)\n"
+            self.program_code.add(
+                f"motor_pair.move({value}, '{node.unit.code()}', -100)"
+            )
         else:
             if node.direction == MovementDirection.BACK:
                 value = f"-{value}"
-            self.program_code += (
-                f"{self.indentation}motor_pair.move({value}, '{node.unit.code()}')\n"
-            )
-
-        self.visit(node.next)
+            self.program_code.add(f"motor_pair.move({value}, '{node.unit.code()}')")
 
+    @generates(MoveWithSteeringNode)
     def visit_move_with_steering_node(self, node: MoveWithSteeringNode):
-        self.program_code += f"{self.indentation}motor_pair.move({self.visit(node.value)}, '{node.unit.code()}', int({self.visit(node.steering)}))  # Note: This method expects an integer so wee need to convert the value.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"motor_pair.move({self.visit(node.value)}, '{node.unit.code()}', {self.integer(node.steering)})",
+                conversions,
+            )
+        )
 
+    @generates(StartMovingWithSteering)
     def visit_start_moving_with_steering_node(self, node: SetMotorSpeedNode):
-        self.program_code += f"{self.indentation}motor_pair.start(int({self.visit(node.steering)}))  # Note: This method expects an integer so wee need to convert the value.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"motor_pair.start({self.integer(node.steering)})", conversions
+            )
+        )
 
+    @generates(StopMovingNode)
     def visit_stop_moving_node(self, node: StopMovingNode):
-        self.program_code += f"{self.indentation}motor_pair.stop()\n"
-        self.visit(node.next)
+        self.program_code.add("motor_pair.stop()")
 
+    @generates(SetMovementSpeedNode)
     def visit_set_movement_speed_node(self, node: SetMovementSpeedNode):
-        self.program_code += f"{self.indentation}motor_pair.set_default_speed(int({self.visit(node.value)}))  # Note: This method expects an integer so wee need to convert the value.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"motor_pair.set_default_speed({self.integer(node.value)})", conversions
+            )
+        )
 
+    @generates(SetMotorRotationNode)
     def visit_set_motor_rotation_node(self, node: SetMotorRotationNode):
-        self.program_code += f"{self.indentation}motor_pair.set_motor_rotation({self.visit(node.value)}, '{node.unit.code()}')\n"
-        self.visit(node.next)
+        self.program_code.add(
+            f"motor_pair.set_motor_rotation({self.visit(node.value)}, '{node.unit.code()}')"
+        )
 
+    @generates(CommentNode)
     def visit_comment_node(self, node: CommentNode):
-        self.program_code += f"{self.indentation}{node.value}\n"
-        self.visit(node.next)
+        self.program_code.add(f"{node.value}")
 
+    @generates(SetCenterButtonNode)
     def visit_set_center_button_node(self, node: SetCenterButtonNode):
         self.generate_object("hub", "MSHub", "")
 
-        self.program_code += (
-            f"{self.indentation}hub.status_light.on('{node.color.code()}')\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"hub.status_light.on('{node.color.code()}')")
 
+    @generates(LightUpDistanceSensorNode)
     def visit_light_up_distance_sensor_node(self, node: LightUpDistanceSensorNode):
         pattern = ", ".join(node.pattern.split(" "))
 
@@ -699,326 +880,400 @@ import math
             # Generate the object to call the method on
             variable = f"distance_sensor_{node.port.value[0].lower()}"
             self.generate_object(variable, "DistanceSensor", f"'{node.port.value[0]}'")
-            self.program_code += f"{self.indentation}{variable}.light_up({pattern})\n"
+            self.program_code.add(f"{variable}.light_up({pattern})")
 
         elif isinstance(node.port, VariableNode):
             port = self.visit(node.port)
-            self.program_code += f"{self.indentation}# Note: This will fail if the first item in {port} is not valid port.\n"
-            self.program_code += f"{self.indentation}DistanceSensor({node.port.name}[0].upper()).light_up({pattern})\n"
+            self.program_code.add(
+                f"# Note: This will fail if the first item in {port} is not valid port."
+            )
+            self.program_code.add(
+                f"{self.generate_device('DistanceSensor', f'{node.port.name}[0].upper()')}.light_up({pattern})"
+            )
 
         else:
             raise NotImplementedError(
                 f"The following node is not currently supported in the port field: {node.port}"
             )
-        self.visit(node.next)
 
+    @generates(WriteNode)
     def visit_write_node(self, node: WriteNode):
         self.generate_object("hub", "MSHub", "")
 
-        self.program_code += (
-            f"{self.indentation}hub.light_matrix.write({self.visit(node.text)})\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"hub.light_matrix.write({self.visit(node.text)})")
 
+    @generates(TurnOffPixelsNode)
     def visit_turn_off_pixels_node(self, node: TurnOffPixelsNode):
         self.generate_object("hub", "MSHub", "")
 
-        self.program_code += f"{self.indentation}hub.light_matrix.off()\n"
-        self.visit(node.next)
+        self.program_code.add("hub.light_matrix.off()")
 
+    @generates(SetPixelNode)
     def visit_set_pixel_node(self, node: SetPixelNode):
         self.generate_object("hub", "MSHub", "")
 
-        self.program_code += f"{self.indentation}hub.light_matrix.set_pixel(int({self.visit(node.x)})-1, int({self.visit(node.y)})-1, int({self.visit(node.brightness)}))  # Note: This method expects integers so wee need to convert the value. Also starts with 0 not 1.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"hub.light_matrix.set_pixel({self.integer(node.x)}-1, {self.integer(node.y)}-1, {self.integer(node.brightness)})",
+                conversions,
+                index=True,
+            )
+        )
 
+    @generates(SetPixelBrightnessNode)
     def visit_set_pixel_brightness_node(self, node: SetPixelBrightnessNode):
         self.objects.add("_brightness")
-        self.program_code += (
-            f"{self.indentation}_brightness = {self.visit(node.brightness)}\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"_brightness = {self.visit(node.brightness)}")
 
-    def visit_turn_on_node(self, node: TurnOnNode):
+    def generate_turn_on(self, image: str):
+        """Generates the code that turns on an image on the light matrix.
+        When optimizing, the image is decoded here into a constant with the brightness of every pixel, so the hub
+        only has to set the pixels rather than parse the image every time the block runs.
+
+        :param image: The image, the brightness (0 to 9) of the 25 pixels row by row.
+        """
         self.generate_object("hub", "MSHub", "")
 
+        if self.optimize_flag and len(image) == 25 and image.isdigit():
+            if "_brightness" in self.objects:
+                # The brightness is only known when the code runs, so the pixels keep their level
+                pixels = tuple((i % 5, i // 5, int(image[i])) for i in range(25))
+                function, arguments = "_turn_on_levels", ", _brightness"
+                code = [
+                    "def _turn_on_levels(pixels, brightness):",
+                    "\tfor x, y, level in pixels:",
+                    "\t\thub.light_matrix.set_pixel(x, y, int(brightness * level/9.0))",
+                ]
+            else:
+                # The same brightness _turn_on_pattern would compute
+                pixels = tuple(
+                    (i % 5, i // 5, int(100 * int(image[i]) / 9.0)) for i in range(25)
+                )
+                function, arguments = "_turn_on_pixels", ""
+                code = [
+                    "def _turn_on_pixels(pixels):",
+                    "\tfor x, y, brightness in pixels:",
+                    "\t\thub.light_matrix.set_pixel(x, y, brightness)",
+                ]
+            if function not in self.functions:
+                self.functions.add(function)
+                self.functions_code.add(
+                    "# This is a helper function that is necessary to turn on patterns on the light matrix.",
+                    *code,
+                )
+            constant = self.generate_constant("_IMAGE", str(pixels))
+            self.program_code.add(f"{function}({constant}{arguments})")
+            return
+
         # If the function is not yet added add it
         if "_turn_on_pattern" not in self.functions:
             self.functions.add("_turn_on_pattern")
-            self.functions_code += """# This is a helper function that is necessary to turn on patterns on the light matrix.
-def _turn_on_pattern(pattern, brightness=100):
-\tfor i in range(len(pattern)):
-\t\thub.light_matrix.set_pixel(i%5, int(i/5), int(brightness * int(pattern[i])/9.0))
-"""
+            self.functions_code.add(
+                "# This is a helper function that is necessary to turn on patterns on the light matrix.",
+                "def _turn_on_pattern(pattern, brightness=100):",
+                "\tfor i in range(len(pattern)):",
+                "\t\thub.light_matrix.set_pixel(i%5, int(i/5), int(brightness * int(pattern[i])/9.0))",
+            )
 
         if "_brightness" in self.objects:
-            self.program_code += (
-                f"{self.indentation}_turn_on_pattern('{node.image}', _brightness)\n"
-            )
+            self.program_code.add(f"_turn_on_pattern('{image}', _brightness)")
         else:
-            self.program_code += f"{self.indentation}_turn_on_pattern('{node.image}')\n"
+            self.program_code.add(f"_turn_on_pattern('{image}')")
 
-        self.visit(node.next)
+    @generates(TurnOnNode)
+    def visit_turn_on_node(self, node: TurnOnNode):
+        self.generate_turn_on(node.image)
 
+    @generates(TurnOnForDurationNode)
     def visit_turn_on_for_duration_node(self, node: TurnOnForDurationNode):
-        self.generate_object("hub", "MSHub", "")
+        self.generate_turn_on(node.image)
 
-        # If the function is not yet added add it
-        if "_turn_on_pattern" not in self.functions:
-            self.functions.add("_turn_on_pattern")
-            self.functions_code += """# This is a helper function that is necessary to turn on patterns on the light matrix.
-def _turn_on_pattern(pattern, brightness=100):
-\tfor i in range(len(pattern)):
-\t\thub.light_matrix.set_pixel(i%5, int(i/5), int(brightness * int(pattern[i])/9.0))
-"""
+        self.program_code.add(f"wait_for_seconds({self.integer(node.duration)})")
+        self.program_code.add("hub.light_matrix.off()")
 
-        if "_brightness" in self.objects:
-            self.program_code += (
-                f"{self.indentation}_turn_on_pattern('{node.image}', _brightness)\n"
+    @generates(DeleteItemInListNode)
+    def visit_delete_item_in_list_node(self, node: DeleteItemInListNode):
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"del {node.list}[{self.integer(node.index)} - 1]",
+                conversions,
+                index=True,
             )
-        else:
-            self.program_code += f"{self.indentation}_turn_on_pattern('{node.image}')\n"
-
-        self.program_code += (
-            f"{self.indentation}wait_for_seconds(int({self.visit(node.duration)}))\n"
         )
-        self.program_code += f"{self.indentation}hub.light_matrix.off()\n"
-        self.visit(node.next)
-
-    def visit_delete_item_in_list_node(self, node: DeleteItemInListNode):
-        self.program_code += f"{self.indentation}del {node.list}[int({self.visit(node.index)}) - 1]  # Note: This method expects integers so wee need to convert the value. Also starts with 0 not 1.\n"
-        self.visit(node.next)
 
+    @generates(DeleteAllItemsInListNode)
     def visit_delete_all_items_in_list_node(self, node: DeleteAllItemsInListNode):
-        self.program_code += f"{self.indentation}{node.list}.clear()\n"
-        self.visit(node.next)
+        self.program_code.add(f"{node.list}.clear()")
 
+    @generates(LengthOfListNode)
     def visit_length_of_list_node(self, node: LengthOfListNode):
         return f"len({node.variable})"
 
+    @generates(InsertItemAtIndexNode)
     def visit_insert_item_at_index_node(self, node: InsertItemAtIndexNode):
-        self.program_code += f"{self.indentation}{node.variable}.insert(int({self.visit(node.index)}) - 1, {self.visit(node.value)})  # Note: This method expects integers so wee need to convert the value. Also starts with 0 not 1.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"{node.variable}.insert({self.integer(node.index)} - 1, {self.visit(node.value)})",
+                conversions,
+                index=True,
+            )
+        )
 
+    @generates(ItemAtIndexNode)
     def visit_item_at_index_node(self, node: ItemAtIndexNode):
-        return f"{node.variable}[int({self.visit(node.index)}) - 1]"
+        return f"{node.variable}[{self.integer(node.index)} - 1]"
 
+    @generates(ReplaceItemAtIndexNode)
     def visit_replace_item_at_index_node(self, node: ReplaceItemAtIndexNode):
-        self.program_code += f"{self.indentation}{node.variable}[int({self.visit(node.index)}) - 1] = {self.visit(node.value)}  # Note: This method expects integers so wee need to convert the value. Also starts with 0 not 1.\n"
-        self.visit(node.next)
+        conversions = self.conversions
+        self.program_code.add(
+            self.conversion_note(
+                f"{node.variable}[{self.integer(node.index)} - 1] = {self.visit(node.value)}",
+                conversions,
+                index=True,
+            )
+        )
 
+    @generates(IndexOfItemNode)
     def visit_index_of_item_node(self, node: IndexOfItemNode):
         return f"{node.variable}.index({self.visit(node.value)}) + 1"
 
+    @generates(IfThenNode)
     def visit_if_then_node(self, node: IfThenNode):
-        self.program_code += f"{self.indentation}if {self.visit(node.condition)}:\n"
-        self.indentation += "\t"
-        self.visit(node.body)
-        self.indentation = self.indentation[:-1]
-        self.visit(node.next)
+        self.program_code.add(f"if {self.visit(node.condition)}:")
+        self.program_code.indent()
+        self.visit_stack(node.body)
+        self.program_code.dedent()
 
+    @generates(ListContainsNode)
     def visit_list_contains_node(self, node: ListContainsNode):
         return f"{self.visit(node.value)} in {node.variable}"
 
+    @generates(PickRandomNumberNode)
     def visit_pick_random_number_node(self, node: PickRandomNumberNode):
         if not "from random import randint" in self.includes:
             self.includes += "from random import randint\n"
-        return f"randint(int({self.visit(node.left_hand)}), int({self.visit(node.right_hand)}))"
+        return (
+            f"randint({self.integer(node.left_hand)}, {self.integer(node.right_hand)})"
+        )
 
+    @generates(ComparisonNode)
     def visit_comparison_node(self, node: ComparisonNode):
         return f"({self.visit(node.left_hand)} {node.op.code()} {self.visit(node.right_hand)})"
 
+    @generates(NotNode)
     def visit_not_node(self, node: NotNode):
         return f"not {self.visit(node.left_hand)}"
 
+    @generates(IsBetweenNode)
     def visit_is_between_node(self, node: IsBetweenNode):
         return f"{self.visit(node.left_hand)} <= {self.visit(node.value)} <= {self.visit(node.right_hand)}"
 
+    @generates(JoinStringsNode)
     def visit_join_strings_node(self, node: JoinStringsNode):
         return f"{self.visit(node.left_hand)} + {self.visit(node.right_hand)}"
 
+    @generates(LetterOfStringNode)
     def visit_letter_of_string_node(self, node: LetterOfStringNode):
-        return f"{self.visit(node.right_hand)}[int({self.visit(node.left_hand)}) - 1]"
+        return f"{self.visit(node.right_hand)}[{self.integer(node.left_hand)} - 1]"
 
+    @generates(LengthOfStringNode)
     def visit_length_of_string_node(self, node: LengthOfStringNode):
         return f"len({self.visit(node.left_hand)})"
 
+    @generates(StringContainsNode)
     def visit_string_contains_node(self, node: StringContainsNode):
         return f"{self.visit(node.right_hand)} in {self.visit(node.left_hand)}"
 
+    @generates(ModNode)
     def visit_mod_node(self, node: ModNode):
         return f"{self.visit(node.left_hand)} % {self.visit(node.right_hand)}"
 
+    @generates(RoundNode)
     def visit_round_node(self, node: RoundNode):
         return f"int({self.visit(node.left_hand)} + 0.5)"
 
+    @generates(UnaryMathFunctionNode)
     def visit_unary_math_function_node(self, node: UnaryMathFunctionNode):
         return f"{node.function.code()}{self.visit(node.left_hand)})"
 
+    @generates(BinaryMathFunctionNode)
     def visit_binary_math_function_node(self, node: BinaryMathFunctionNode):
         return f"{node.function.code()}({self.visit(node.left_hand)}, {self.visit(node.right_hand)})"
 
+    @generates(WaitForSecondsNode)
     def visit_wait_for_seconds_node(self, node: WaitForSecondsNode):
-        self.program_code += (
-            f"{self.indentation}wait_for_seconds({self.visit(node.seconds)})\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"wait_for_seconds({self.visit(node.seconds)})")
 
+    @generates(WaitUntilNode)
     def visit_wait_until_node(self, node: WaitUntilNode):
-        self.program_code += (
-            f"{self.indentation}wait_until(lambda: {self.visit(node.condition)})\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"wait_until(lambda: {self.visit(node.condition)})")
 
+    @generates(HubInteractionNode)
     def visit_hub_interaction_node(self, node: HubInteractionNode):
         self.generate_object("hub", "MSHub", "")
         return f"hub.motion_sensor.get_gesture() == '{node.interaction.code()}'"
 
+    @generates(RepeatLoopNode)
     def visit_repeat_loop_node(self, node: RepeatLoopNode):
-        self.program_code += (
-            f"{self.indentation}for _ in range({self.visit(node.times)}):\n"
-        )
-        self.indentation += "\t"
-        self.visit(node.body)
-        self.indentation = self.indentation[:-1]
-        self.visit(node.next)
+        self.program_code.add(f"for _ in range({self.integer(node.times)}):")
+        self.program_code.indent()
+        self.visit_stack(node.body)
+        self.program_code.dedent()
 
+    @generates(ForeverLoopNode)
     def visit_forever_loop_node(self, node: ForeverLoopNode):
-        self.program_code += f"{self.indentation}while True:\n"
-        self.indentation += "\t"
-        self.visit(node.body)
-        self.indentation = self.indentation[:-1]
-        self.visit(node.next)
+        self.program_code.add("while True:")
+        self.program_code.indent()
+        self.visit_stack(node.body)
+        self.program_code.dedent()
 
+    @generates(RepeatUntilNode)
     def visit_repeat_until_node(self, node: RepeatUntilNode):
-        self.program_code += (
-            f"{self.indentation}while not ({self.visit(node.condition)}):\n"
-        )
-        self.indentation += "\t"
-        self.visit(node.body)
-        self.indentation = self.indentation[:-1]
-        self.visit(node.next)
+        self.program_code.add(f"while not ({self.visit(node.condition)}):")
+        self.program_code.indent()
+        self.visit_stack(node.body)
+        self.program_code.dedent()
 
+    @generates(IfElseNode)
     def visit_if_else_node(self, node: IfElseNode):
-        self.program_code += f"{self.indentation}if {self.visit(node.condition)}:\n"
-        self.indentation += "\t"
-        self.visit(node.body)
-        self.indentation = self.indentation[:-1]
-        self.program_code += f"{self.indentation}else:\n"
-        self.indentation += "\t"
-        self.visit(node.else_body)
-        self.indentation = self.indentation[:-1]
-        self.visit(node.next)
-
+        self.program_code.add(f"if {self.visit(node.condition)}:")
+        self.program_code.indent()
+        self.visit_stack(node.body)
+        self.program_code.dedent()
+        self.program_code.add("else:")
+        self.program_code.indent()
+        self.visit_stack(node.else_body)
+        self.program_code.dedent()
+
+    @generates(IsColorNode)
     def visit_is_color_node(self, node: IsColorNode):
         variable = f"color_sensor_{node.port.value[0].lower()}"
         self.generate_object(variable, "ColorSensor", f"'{node.port.value[0]}'")
-        return f"{variable}.get_color() == {node.color.code()}"
+        return f"{self.read_sensor(node)} == {node.color.code()}"
 
+    @generates(ColorNode)
     def visit_color_node(self, node: ColorNode):
         variable = f"color_sensor_{node.port.value[0].lower()}"
         self.generate_object(variable, "ColorSensor", f"'{node.port.value[0]}'")
         mapping = "{None:-1, 'black':0, 'violet':1, 'blue':3, 'cyan':4, 'green':5, 'yellow': 7, 'red':9, 'white':10}"
-        return f"{mapping}[{variable}.get_color()]"
+        return f"{self.generate_constant('_COLOR_CODES', mapping)}[{self.read_sensor(node)}]"
 
+    @generates(IsReflectionNode)
     def visit_is_reflection_node(self, node: IsReflectionNode):
         variable = f"color_sensor_{node.port.value[0].lower()}"
         self.generate_object(variable, "ColorSensor", f"'{node.port.value[0]}'")
-        return f"{variable}.get_reflected_light() {node.comparator.value} {self.visit(node.reflection)}"
+        return f"{self.read_sensor(node)} {node.comparator.value} {self.visit(node.reflection)}"
 
+    @generates(ReflectedLightNode)
     def visit_reflected_light_node(self, node: ReflectedLightNode):
         variable = f"color_sensor_{node.port.value[0].lower()}"
         self.generate_object(variable, "ColorSensor", f"'{node.port.value[0]}'")
-        return f"{variable}.get_reflected_light()"
+        return self.read_sensor(node)
 
+    @generates(IsDistanceNode)
     def visit_is_distance_node(self, node: IsDistanceNode):
         variable = f"distance_sensor_{node.port.value[0].lower()}"
         self.generate_object(variable, "DistanceSensor", f"'{node.port.value[0]}'")
-        return f"{variable}.get_distance_{node.unit.code()}() {node.comparator.value} {self.visit(node.distance)}"
+        return f"{self.read_sensor(node)} {node.comparator.value} {self.visit(node.distance)}"
 
+    @generates(DistanceNode)
     def visit_distance_node(self, node: DistanceNode):
         variable = f"distance_sensor_{node.port.value[0].lower()}"
         self.generate_object(variable, "DistanceSensor", f"'{node.port.value[0]}'")
-        return f"{variable}.get_distance_{node.unit.code()}()"
+        return self.read_sensor(node)
 
+    @generates(GestureNode)
     def visit_gesture_node(self, node: GestureNode):
         self.generate_object("hub", "MSHub", "")
-        return "{None:-1, 'shaken':0, 'tapped':1, 'falling':3}[hub.motion_sensor.get_gesture()]"
+        mapping = "{None:-1, 'shaken':0, 'tapped':1, 'falling':3}"
+        return f"{self.generate_constant('_GESTURE_CODES', mapping)}[hub.motion_sensor.get_gesture()]"
 
+    @generates(IsOrientationNode)
     def visit_is_orientation_node(self, node: IsOrientationNode):
         self.generate_object("hub", "MSHub", "")
         return f"hub.motion_sensor.get_orientation() == '{node.orientation.value}'"
 
+    @generates(OrientationNode)
     def visit_orientation_node(self, node: OrientationNode):
         self.generate_object("hub", "MSHub", "")
-        return "{'front':0, 'back':1, 'up':2, 'down':3, 'leftside':4, 'rightside':5}[hub.motion_sensor.get_orientation()]"
+        mapping = "{'front':0, 'back':1, 'up':2, 'down':3, 'leftside':4, 'rightside':5}"
+        return f"{self.generate_constant('_ORIENTATION_CODES', mapping)}[hub.motion_sensor.get_orientation()]"
 
+    @generates(SetYawAngleNode)
     def visit_set_yaw_angle_node(self, node: SetYawAngleNode):
         self.generate_object("hub", "MSHub", "")
-        self.program_code += f"{self.indentation}hub.motion_sensor.reset_yaw_angle()\n"
-        self.visit(node.next)
+        self.program_code.add("hub.motion_sensor.reset_yaw_angle()")
 
+    @generates(IsButtonPressedNode)
     def visit_is_button_pressed_node(self, node: IsButtonPressedNode):
         self.generate_object("hub", "MSHub", "")
         return f"hub.{node.button.value}_button.is_{node.action.value}()"
 
+    @generates(HubAngleNode)
     def visit_hub_angle_node(self, node: HubAngleNode):
         self.generate_object("hub", "MSHub", "")
         return f"hub.motion_sensor.get_{node.unit.value}_angle()"
 
+    @generates(TimerNode)
     def visit_timer_node(self, node: TimerNode):
         self.generate_object("timer", "Timer", "")
         return "timer.now()"
 
+    @generates(ResetTimerNode)
     def visit_reset_timer_node(self, node: ResetTimerNode):
         self.generate_object("timer", "Timer", "")
-        self.program_code += f"{self.indentation}timer.reset()\n"
-        self.visit(node.next)
+        self.program_code.add("timer.reset()")
 
+    @generates(IsKeyPressedNode)
     def visit_is_key_pressed_node(self, node: IsKeyPressedNode):
         raise DeprecationWarning(
             "Note that key pressed is not currently supported by MINDSTORMS itself."
         )
 
+    @generates(PlaySoundUntilDoneNode)
     def visit_play_sound_until_done_node(self, node: PlaySoundUntilDoneNode):
         self.generate_object("app", "App", "")
-        self.program_code += f"{self.indentation}app.play_sound('{node.sound}')\n"
-        self.visit(node.next)
+        self.program_code.add(f"app.play_sound('{node.sound}')")
 
+    @generates(StartSoundNode)
     def visit_start_sound_node(self, node: StartSoundNode):
         self.generate_object("app", "App", "")
-        self.program_code += f"{self.indentation}app.start_sound('{node.sound}')\n"
-        self.visit(node.next)
+        self.program_code.add(f"app.start_sound('{node.sound}')")
 
+    @generates(PlayBeepNode)
     def visit_play_beep_node(self, node: PlayBeepNode):
         self.generate_object("hub", "MSHub", "")
-        self.program_code += f"{self.indentation}hub.speaker.beep({self.visit(node.pitch)}, {self.visit(node.duration)})\n"
-        self.visit(node.next)
+        self.program_code.add(
+            f"hub.speaker.beep({self.visit(node.pitch)}, {self.visit(node.duration)})"
+        )
 
+    @generates(StartBeepNode)
     def visit_start_beep_node(self, node: StartBeepNode):
         self.generate_object("hub", "MSHub", "")
-        self.program_code += (
-            f"{self.indentation}hub.speaker.start_beep({self.visit(node.pitch)})\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"hub.speaker.start_beep({self.visit(node.pitch)})")
 
+    @generates(StopBeepNode)
     def visit_stop_beep_node(self, node: StopBeepNode):
         self.generate_object("hub", "MSHub", "")
-        self.program_code += f"{self.indentation}hub.speaker.stop()\n"
-        self.visit(node.next)
+        self.program_code.add("hub.speaker.stop()")
 
+    @generates(ChangeVolumeNode)
     def visit_change_volume_node(self, node: ChangeVolumeNode):
         self.generate_object("hub", "MSHub", "")
-        self.program_code += f"{self.indentation}hub.speaker.set_volume(hub.speaker.get_volume() - {self.visit(node.volume)})\n"
-        self.visit(node.next)
+        self.program_code.add(
+            f"hub.speaker.set_volume(hub.speaker.get_volume() - {self.visit(node.volume)})"
+        )
 
+    @generates(SetVolumeNode)
     def visit_set_volume_node(self, node: SetVolumeNode):
         self.generate_object("hub", "MSHub", "")
-        self.program_code += (
-            f"{self.indentation}hub.speaker.set_volume({self.visit(node.volume)})\n"
-        )
-        self.visit(node.next)
+        self.program_code.add(f"hub.speaker.set_volume({self.visit(node.volume)})")
 
+    @generates(VolumeNode)
     def visit_volume_node(self, node: VolumeNode):
         self.generate_object("hub", "MSHub", "")
         return "hub.speaker.get_volume()"
@@ -0,0 +1,160 @@
+"""
+This file contains the complete compilation pipeline, from a *.lms file to the Python code (and the AST representation).
+It is shared by the command line, the batch mode and anything else that wants to compile projects.
+The visitor and the code generator (and with them all the AST modules) are only imported on the first compilation
+that needs them, a project that is found in the cache never loads them.
+"""
+from typing import TYPE_CHECKING, TextIO
+
+from src.json_parser import extract_json, filter_json
+
+if TYPE_CHECKING:
+    from src.abstract_syntax_tree import AST
+    from src.cache import CompilationCache
+
+
+def load_compiler():
+    """Imports the visitor and the code generator and builds their dispatch tables up front,
+    for long-running processes that would rather pay for this at start-up than on the first compilation.
+    """
+    from src.code_generator import CodeGenerator
+    from src.visitor import Visitor
+
+    Visitor.dispatch_table()
+    CodeGenerator.handlers()
+
+
+class Compilation:
+    """The outcome of compiling a project."""
+
+    def __init__(
+        self,
+        code: str,
+        ast_representation: str = None,
+        cached: bool = False,
+        report: list = None,
+        abstract_syntax_tree: "AST" = None,
+    ) -> None:
+        self.code = code
+        self._ast_representation = ast_representation
+        self.cached = cached  # Indicates if the outcome was taken from the cache
+        # What the optimizer changed (e.g. removed blocks), empty if it did not run (or the outcome was cached)
+        self.report = report or []
+        # The AST itself if its representation is only built when it is needed, see write_ast_representation
+        self.abstract_syntax_tree = abstract_syntax_tree
+
+    @property
+    def ast_representation(self) -> str:
+        """
+        :return: The AST representation, None if it was not asked for (or it was written to a file).
+        """
+        if self._ast_representation is None and self.abstract_syntax_tree is not None:
+            return self.abstract_syntax_tree.tree_representation()
+        return self._ast_representation
+
+    def write_ast_representation(self, file: TextIO):
+        """Writes the AST representation to a file (or stream), it is streamed unless it was already built.
+
+        :param file: The text file (or stream) to write the representation to.
+        """
+        if self._ast_representation is None and self.abstract_syntax_tree is not None:
+            self.abstract_syntax_tree.write_tree_representation(file)
+        else:
+            file.write(self._ast_representation)
+
+
+def compile_json(
+    concrete_syntax_tree: dict,
+    safe: bool = False,
+    best_effort: bool = True,
+    ast: bool = False,
+    cache: "CompilationCache" = None,
+    ast_filename: str = None,
+    optimize: bool = False,
+) -> Compilation:
+    """Compiles the filtered json of a project.
+    If a cache is given and it holds the outcome, the AST is neither built nor generated.
+
+    :param concrete_syntax_tree: The filtered json of the project.
+    :param safe: Indicates if safer code should be outputted.
+    :param best_effort: Indicates if untranslatable blocks should be skipped.
+    :param ast: Indicates if the AST representation should also be generated.
+    Without a cache (and ast_filename) it is only built when it is asked for, or it is streamed with
+    Compilation.write_ast_representation.
+    :param cache: The cache to use, defaults to None (no cache).
+    :param ast_filename: The (new) file to write the AST representation to if ast is used, defaults to None.
+    Without a cache the representation is streamed to the file and never held in memory as a whole,
+    either way it is then not part of the outcome.
+    :param optimize: Indicates if the AST should be optimized before the code is generated.
+    :return: The outcome of the compilation.
+    """
+    if cache:
+        key = cache.key(concrete_syntax_tree, safe, best_effort, optimize)
+        code = cache.load(key, "py")
+        ast_representation = cache.load(key, "gv") if ast else None
+        if code is not None and (not ast or ast_representation is not None):
+            if ast_filename:
+                write_ast_representation(ast_filename, ast_representation)
+                ast_representation = None
+            return Compilation(code, ast_representation, cached=True)
+
+    from src.code_generator import CodeGenerator
+    from src.visitor import Visitor
+
+    abstract_syntax_tree = Visitor(best_effort).visit(concrete_syntax_tree)
+    report = []
+    if optimize:
+        from src.optimizer import Optimizer
+
+        optimizer = Optimizer()
+        abstract_syntax_tree = optimizer.optimize(abstract_syntax_tree)
+        report = optimizer.report
+    code = CodeGenerator(safe, optimize).generate(abstract_syntax_tree)
+
+    ast_representation = None
+    streamed_tree = None
+    if ast and ast_filename and not cache:
+        with open(ast_filename, "x") as file:
+            abstract_syntax_tree.write_tree_representation(file)
+    elif ast and cache:
+        # The cache stores the representation as a whole
+        ast_representation = abstract_syntax_tree.tree_representation()
+    elif ast:
+        # The caller streams the representation (or has it built) when it needs it
+        streamed_tree = abstract_syntax_tree
+
+    if cache:
+        cache.store(key, "py", code)
+        if ast:
+            cache.store(key, "gv", ast_representation)
+    if ast_representation is not None and ast_filename:
+        write_ast_representation(ast_filename, ast_representation)
+        ast_representation = None
+    return Compilation(
+        code, ast_representation, report=report, abstract_syntax_tree=streamed_tree
+    )
+
+
+def write_ast_representation(ast_filename: str, ast_representation: str):
+    with open(ast_filename, "x") as file:
+        file.write(ast_representation)
+
+
+def compile_lms(
+    input_filename: str,
+    safe: bool = False,
+    best_effort: bool = True,
+    ast: bool = False,
+    cache: "CompilationCache" = None,
+    ast_filename: str = None,
+    optimize: bool = False,
+) -> Compilation:
+    """Compiles a *.lms file, see compile_json.
+
+    :param input_filename: The path to the file that should be converted.
+    :return: The outcome of the compilation.
+    """
+    concrete_syntax_tree = filter_json(extract_json(input_filename))
+    return compile_json(
+        concrete_syntax_tree, safe, best_effort, ast, cache, ast_filename, optimize
+    )
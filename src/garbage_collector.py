@@ -0,0 +1,22 @@
+"""
+This file contains the helper to pause the cyclic garbage collector of Python while large acyclic structures
+(the decoded json, the Block records and the AST) are built. Every allocation counts towards the next collection
+and a full collection walks every object that is alive, so building a large project would otherwise walk the
+objects that were already built over and over again.
+"""
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def gc_paused():
+    """Pauses the cyclic garbage collector while many objects that never form cycles are created at once.
+    A collector that was already paused is left paused.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
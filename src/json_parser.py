@@ -4,23 +4,145 @@ The json will than server as the Concrete Syntax tree that is visited to generat
 """
 import io
 import json
+import shutil
+import struct
+import tempfile
 import zipfile
 
+from src.garbage_collector import gc_paused
 
-def extract_json(filename: str) -> dict:
-    """Extracts the json out of a Mindstorms .lms file
-    TODO: This puts the entire inner zip file into memory which might not be ideal, so decide if unzipping it somewhere on disk is better
-    See reference: https://stackoverflow.com/q/11930515/8076979
-    :param filename: The path to the lms file
-    :type filename: str
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compressed inner archives up to this size (in bytes) are inflated in memory, bigger ones are spooled to disk.
+SPOOL_THRESHOLD = 4 * 1024 * 1024
+
+# Size of the fixed part of a zip local file header, followed by the file name and the extra field.
+_LOCAL_HEADER_SIZE = 30
+
+
+class _StoredMember(io.RawIOBase):
+    """Read-only, seekable view on a member that is stored (not compressed) in a zip archive.
+    Seeking is done directly in the underlying file, so nothing is read that is not asked for.
+    """
+
+    def __init__(self, file, offset: int, size: int) -> None:
+        super().__init__()
+        self.file = file
+        self.offset = offset
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self.position = max(0, min(self.position, self.size))
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self.size - self.position)
+        if length <= 0:
+            return 0
+        self.file.seek(self.offset + self.position)
+        data = self.file.read(length)
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def _stored_member(outer_zip: zipfile.ZipFile, info: zipfile.ZipInfo) -> _StoredMember:
+    """Creates a view on the data of a stored member by parsing its local file header.
+
+    :param outer_zip: The archive that contains the member.
+    :param info: The info of the member, needs to use ZIP_STORED.
+    :return: Seekable view on the (uncompressed) data of the member.
+    """
+    outer_zip.fp.seek(info.header_offset)
+    header = outer_zip.fp.read(_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    offset = info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+    return _StoredMember(outer_zip.fp, offset, info.file_size)
+
+
+def _read_project_json(sb3_file) -> bytes:
+    """Reads the project.json out of a (seekable) scratch.sb3 file, none of the other members are read.
+
+    :param sb3_file: File object of the scratch.sb3 archive.
+    :return: The (undecoded) content of project.json.
+    :rtype: bytes
+    """
+    with zipfile.ZipFile(sb3_file) as nested_zip:
+        return nested_zip.read("project.json")
+
+
+def read_project_json(filename, spool_threshold: int = SPOOL_THRESHOLD) -> bytes:
+    """Reads the project.json out of a Mindstorms .lms file without decoding it.
+    Only project.json is inflated, the sounds and images bundled in the file are never loaded.
+    If the inner scratch.sb3 is stored it is read in place through the outer file, if it is compressed
+    it is inflated into a temporary file that only moves to disk if it is bigger than spool_threshold.
+    :param filename: The path to the lms file, or a (seekable) file object with its content
+    :type filename: str or file object
+    :param spool_threshold: The size (in bytes) up to which a compressed scratch.sb3 is kept in memory.
+    :type spool_threshold: int
+    :return: The content of project.json.
+    :rtype: bytes
+    """
+    with zipfile.ZipFile(filename, "r") as outer_zip:
+        info = outer_zip.getinfo("scratch.sb3")
+        if info.compress_type == zipfile.ZIP_STORED:
+            return _read_project_json(_stored_member(outer_zip, info))
+
+        with outer_zip.open(info) as inner_zip:
+            with tempfile.SpooledTemporaryFile(max_size=spool_threshold) as file_data:
+                shutil.copyfileobj(inner_zip, file_data)
+                file_data.seek(0)
+                return _read_project_json(file_data)
+
+
+def extract_json(filename, spool_threshold: int = SPOOL_THRESHOLD) -> dict:
+    """Extracts the json out of a Mindstorms .lms file, see read_project_json.
+    :param filename: The path to the lms file, or a (seekable) file object with its content
+    :type filename: str or file object
+    :param spool_threshold: The size (in bytes) up to which a compressed scratch.sb3 is kept in memory.
+    :type spool_threshold: int
     :return: Returns a dictionary representation of the json
     :rtype: dict
     """
-    with zipfile.ZipFile(filename, "r") as outer_zip:
-        with outer_zip.open("scratch.sb3") as inner_zip:
-            file_data = io.BytesIO(inner_zip.read())
-            with zipfile.ZipFile(file_data) as nested_zip:
-                return json.load(nested_zip.open("project.json"))
+    return loads(read_project_json(filename, spool_threshold))
+
+
+def loads(data: bytes):
+    """Decodes json with orjson if it is installed (it is about twice as fast), otherwise with the json module.
+    The garbage collector is paused meanwhile, a decoded project never contains cycles.
+    orjson is stricter than the json module (e.g, it rejects NaN), what it rejects is left to the json module.
+    :param data: The json.
+    :type data: bytes
+    :return: The decoded json.
+    """
+    with gc_paused():
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
 
 
 def filter_json(json: dict) -> dict:
@@ -0,0 +1,31 @@
+"""
+This package contains the optimizer, it rewrites the AST between the visitor and the code generator so the generated
+program does less work on the hub. Every pass lives in its own module and rewrites the AST in place.
+The optimizer is only run when it is asked for (--optimize), the code is otherwise generated as literal as possible.
+With --optimize the code generator also uses the type inference (of type_inference.py) to leave out conversions
+and shares the sensor reads of a block (as decided by sensor_reads.py).
+"""
+from src.abstract_syntax_tree import AST
+from src.optimizer.constant_folding import ConstantFolder
+from src.optimizer.dead_code import DeadCodeEliminator
+from src.optimizer.integer_literals import IntegerLiterals
+
+
+class Optimizer:
+    """Runs all the optimization passes on the AST, in order."""
+
+    def __init__(self) -> None:
+        # Description of every change the passes made that the user should know about (e.g. removed blocks)
+        self.report = []
+
+    def optimize(self, ast: AST) -> AST:
+        """
+        :param ast: The AST that is built by the visitor, it is rewritten in place.
+        :return: The optimized AST.
+        """
+        ConstantFolder().fold(ast)
+        # After the folding, so the conditions that turned out to be constant can be used
+        DeadCodeEliminator(self.report).eliminate(ast)
+        # Last, so the folding computes with the numbers the visitor built
+        IntegerLiterals().convert(ast)
+        return ast
@@ -0,0 +1,256 @@
+"""
+This file contains the constant folding pass, expressions whose operands are all constants (e.g. 3 + 4, sqrt(16),
+1 < 2 or the join of two strings) are replaced by their value, so they are computed once at compile time rather
+than every time the code runs on the hub (often in a loop).
+The value is computed with the same Python operation the code generator would emit for the expression, so the
+folded program computes exactly what the literal translation computes. Expressions that fail (e.g. a division by
+zero) or whose value can't be written as a constant (e.g. nan) are left for the hub to compute.
+"""
+import math
+import operator
+
+from src.abstract_syntax_tree import (
+    AST,
+    BooleanLiteralNode,
+    LiteralNode,
+    Node,
+    NumericalNode,
+    StackNode,
+)
+from src.abstract_syntax_tree.motors import (
+    MotorGoToPositionNode,
+    RunMotorForDurationNode,
+)
+from src.abstract_syntax_tree.movement import MoveForDurationNode
+from src.abstract_syntax_tree.operators import (
+    ArithmeticalNode,
+    BinaryFunction,
+    BinaryMathFunctionNode,
+    ComparisonNode,
+    ComparisonOperator,
+    JoinStringsNode,
+    LengthOfStringNode,
+    LetterOfStringNode,
+    ModNode,
+    NotNode,
+    Operation,
+    RoundNode,
+    UnaryFunction,
+    UnaryMathFunctionNode,
+)
+from src.abstract_syntax_tree.sound import ChangeVolumeNode
+
+# The value of an expression that can't be folded.
+NOT_CONSTANT = object()
+
+# The Python equivalent of the code that is generated for every operator and function.
+OPERATIONS = {
+    Operation.PLUS: operator.add,
+    Operation.MINUS: operator.sub,
+    Operation.DIVIDE: operator.truediv,
+    Operation.MULTIPLY: operator.mul,
+}
+COMPARISONS = {
+    ComparisonOperator.EQUAL: operator.eq,
+    ComparisonOperator.GREATER: operator.gt,
+    ComparisonOperator.LESS: operator.lt,
+    ComparisonOperator.AND: lambda left, right: left and right,
+    ComparisonOperator.OR: lambda left, right: left or right,
+    ComparisonOperator.IN: lambda left, right: left in right,
+}
+UNARY_FUNCTIONS = {
+    UnaryFunction.TEN: lambda value: pow(10, value),
+    UnaryFunction.ABS: abs,
+    UnaryFunction.ACOS: math.acos,
+    UnaryFunction.ASIN: math.asin,
+    UnaryFunction.ATAN: math.atan,
+    UnaryFunction.CEIL: math.ceil,
+    UnaryFunction.COS: math.cos,
+    UnaryFunction.E: lambda value: pow(math.e, value),
+    UnaryFunction.FLOOR: math.floor,
+    UnaryFunction.LN: math.log,
+    UnaryFunction.LOG: math.log2,
+    UnaryFunction.SIN: math.sin,
+    UnaryFunction.SQRT: math.sqrt,
+    UnaryFunction.TAN: math.tan,
+}
+BINARY_FUNCTIONS = {
+    BinaryFunction.ATAN2: math.atan2,
+    BinaryFunction.COPYSIGN: math.copysign,
+    BinaryFunction.HYPOT: math.hypot,
+    BinaryFunction.MAX: max,
+    BinaryFunction.MIN: min,
+    BinaryFunction.POW: pow,
+}
+
+# The code of a join is not parenthesized (i.e. 'a' + 'b'), so folding it would change what an operator that binds
+# tighter than + next to it applies to, e.g. 3 * 'a' + 'b'. Maps the nodes whose code puts such an operator (*, -, /,
+# %, a negation or a subscript) next to the code of an operand to the attribute that holds the operand (None for any).
+TIGHTER_OPERATORS = {
+    ArithmeticalNode: None,
+    ModNode: None,
+    LetterOfStringNode: "right_hand",
+    ChangeVolumeNode: "volume",
+    RunMotorForDurationNode: "value",
+    MotorGoToPositionNode: "value",
+    MoveForDurationNode: "value",
+}
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float))
+
+
+def is_representable(value: str) -> bool:
+    """Checks if a string can be generated as a literal, the code generator puts it between quotes as it is.
+
+    :return: True if the generated literal has the string as value.
+    """
+    return "'" not in value and "\\" not in value and value.isprintable()
+
+
+def constant_value(node: Node):
+    """
+    :return: The value of the node if it is a constant, NOT_CONSTANT otherwise.
+    """
+    if isinstance(node, BooleanLiteralNode):
+        return node.value
+    if isinstance(node, NumericalNode):
+        if isinstance(node.value, float) and not math.isfinite(node.value):
+            return NOT_CONSTANT
+        return node.value
+    if isinstance(node, LiteralNode) and is_representable(node.value):
+        return node.value
+    return NOT_CONSTANT
+
+
+def constant_node(value) -> Node:
+    """
+    :return: The node that generates the value, None if the value can't be written as a constant.
+    """
+    if isinstance(value, bool):
+        return BooleanLiteralNode(value)
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+        return NumericalNode(value)
+    if isinstance(value, str) and is_representable(value):
+        return LiteralNode(value)
+    return None
+
+
+class ConstantFolder:
+    """Replaces the expressions whose operands are all constants by a constant node."""
+
+    def fold(self, ast: AST):
+        """Folds all the expressions of the AST in place.
+
+        :param ast: The AST to fold.
+        """
+        for node in ast.nodes():
+            # Every expression is folded as part of the stack node it belongs to
+            if isinstance(node, StackNode):
+                self.fold_operands(node)
+
+    def fold_operands(self, node: Node):
+        """Folds the expressions the node refers to, the bodies and next nodes of stacks are left alone."""
+        for cls in type(node).__mro__:
+            for field in cls.__dict__.get("__slots__", ()):
+                value = getattr(node, field, None)
+                if isinstance(value, Node) and not isinstance(value, StackNode):
+                    setattr(node, field, self.fold_expression(value, node, field))
+
+    def fold_expression(self, node: Node, parent: Node, field: str) -> Node:
+        """Folds the expression bottom up.
+
+        :param node: The root of the expression.
+        :param parent: The node the expression belongs to.
+        :param field: The attribute of the parent that holds the expression.
+        :return: The folded expression, the node itself if it can't be folded.
+        """
+        self.fold_operands(node)
+        folder = self.folders.get(type(node))
+        if folder is None:
+            return node
+        if isinstance(node, JoinStringsNode) and type(parent) in TIGHTER_OPERATORS:
+            if TIGHTER_OPERATORS[type(parent)] in (None, field):
+                return node
+        try:
+            value = folder(self, node)
+        except (ArithmeticError, TypeError, ValueError, IndexError):
+            # The hub raises the same error when it runs the code
+            return node
+        if value is NOT_CONSTANT:
+            return node
+        return constant_node(value) or node
+
+    def fold_arithmetical(self, node: ArithmeticalNode):
+        left = constant_value(node.left_hand)
+        right = constant_value(node.right_hand)
+        # Strings are not folded, so a repetition can't blow up the code
+        if not is_number(left) or not is_number(right):
+            return NOT_CONSTANT
+        return OPERATIONS[node.op](left, right)
+
+    def fold_comparison(self, node: ComparisonNode):
+        left = constant_value(node.left_hand)
+        right = constant_value(node.right_hand)
+        if left is NOT_CONSTANT or right is NOT_CONSTANT:
+            return NOT_CONSTANT
+        return COMPARISONS[node.op](left, right)
+
+    def fold_not(self, node: NotNode):
+        value = constant_value(node.left_hand)
+        if not isinstance(value, bool):
+            return NOT_CONSTANT
+        return not value
+
+    def fold_join_strings(self, node: JoinStringsNode):
+        left = constant_value(node.left_hand)
+        right = constant_value(node.right_hand)
+        if not isinstance(left, str) or not isinstance(right, str):
+            return NOT_CONSTANT
+        return left + right
+
+    def fold_letter_of_string(self, node: LetterOfStringNode):
+        index = constant_value(node.left_hand)
+        string = constant_value(node.right_hand)
+        if not is_number(index) or not isinstance(string, str):
+            return NOT_CONSTANT
+        return string[int(index) - 1]
+
+    def fold_length_of_string(self, node: LengthOfStringNode):
+        string = constant_value(node.left_hand)
+        if not isinstance(string, str):
+            return NOT_CONSTANT
+        return len(string)
+
+    def fold_round(self, node: RoundNode):
+        value = constant_value(node.left_hand)
+        if not is_number(value):
+            return NOT_CONSTANT
+        return int(value + 0.5)
+
+    def fold_unary_math_function(self, node: UnaryMathFunctionNode):
+        value = constant_value(node.left_hand)
+        if not is_number(value):
+            return NOT_CONSTANT
+        return UNARY_FUNCTIONS[node.function](value)
+
+    def fold_binary_math_function(self, node: BinaryMathFunctionNode):
+        left = constant_value(node.left_hand)
+        right = constant_value(node.right_hand)
+        if not is_number(left) or not is_number(right):
+            return NOT_CONSTANT
+        return BINARY_FUNCTIONS[node.function](left, right)
+
+    # Maps every node class that can be folded to the method that computes its value
+    folders = {
+        ArithmeticalNode: fold_arithmetical,
+        ComparisonNode: fold_comparison,
+        NotNode: fold_not,
+        JoinStringsNode: fold_join_strings,
+        LetterOfStringNode: fold_letter_of_string,
+        LengthOfStringNode: fold_length_of_string,
+        RoundNode: fold_round,
+        UnaryMathFunctionNode: fold_unary_math_function,
+        BinaryMathFunctionNode: fold_binary_math_function,
+    }
@@ -0,0 +1,142 @@
+"""
+This file contains the dead code elimination pass, it removes the blocks that can never run and the control blocks
+that do nothing, so there is less code to upload to and to parse on the hub:
+- The blocks after a forever loop or a stop block, the stack never gets past those.
+- The bodies of if and if else blocks that can't run because their condition is a constant (e.g. after constant
+  folding), the block is replaced by the body that does run.
+- If blocks and repeat loops with an empty body. The condition and the number of times are only read, so nothing
+  is lost by not evaluating them.
+- The empty side of an if else block, what is left is an if block (with the condition negated if needed).
+- Repeat until loops with an empty body, they only wait until the condition holds so they become wait until blocks.
+Forever loops with an empty body are kept, they keep the stack waiting forever.
+Everything that is removed is added to the report.
+"""
+from src.abstract_syntax_tree import AST, Node, StackNode
+from src.abstract_syntax_tree.control import (
+    ForeverLoopNode,
+    IfElseNode,
+    IfThenNode,
+    RepeatLoopNode,
+    RepeatUntilNode,
+    StopNode,
+    WaitUntilNode,
+)
+from src.abstract_syntax_tree.operators import NotNode
+from src.optimizer.constant_folding import NOT_CONSTANT, constant_value
+
+
+def count_statements(node: Node) -> int:
+    """
+    :return: The number of stack nodes in the stack that starts at node, the nodes of the bodies included.
+    """
+    count = 0
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        count += isinstance(node, StackNode)
+        pending.extend(node.children())
+    return count
+
+
+class DeadCodeEliminator:
+    """Removes the unreachable blocks and the control blocks that do nothing."""
+
+    def __init__(self, report: list) -> None:
+        """
+        :param report: The list every removal is described in.
+        """
+        self.report = report
+
+    def eliminate(self, ast: AST):
+        """Removes the dead code of all the stacks in place.
+
+        :param ast: The AST to remove the dead code from.
+        """
+        for hat_node in ast.hat_nodes:
+            hat_node.next = self.eliminate_stack(hat_node.next)
+
+    def eliminate_stack(self, node: StackNode) -> StackNode:
+        """Removes the dead code of the stack that starts at node, the next pointers are followed in a loop.
+
+        :param node: The first node of the stack, or None.
+        :return: The first node of the stack that is left, or None if nothing is left.
+        """
+        first = last = None
+        while node:
+            next = node.next
+            node.next = None
+            # The node is replaced by a stack of zero or more nodes (e.g. the body of an if block)
+            node = self.eliminate_node(node)
+            if node:
+                if last is None:
+                    first = node
+                else:
+                    last.next = node
+                last = node
+                while last.next:
+                    last = last.next
+                if next and isinstance(last, (ForeverLoopNode, StopNode)):
+                    kind = (
+                        "forever loop"
+                        if isinstance(last, ForeverLoopNode)
+                        else "stop block"
+                    )
+                    self.report.append(
+                        f"Removed {count_statements(next)} unreachable block(s) after a {kind}."
+                    )
+                    next = None
+            node = next
+        return first
+
+    def eliminate_node(self, node: StackNode) -> StackNode:
+        """Removes the dead code of the bodies of the node and then the node itself if it does nothing.
+
+        :param node: The stack node, without a next node.
+        :return: The first node of the stack that replaces the node (the node itself if it is kept) or None.
+        """
+        if isinstance(node, IfElseNode):
+            node.body = self.eliminate_stack(node.body)
+            node.else_body = self.eliminate_stack(node.else_body)
+            condition = constant_value(node.condition)
+            if condition is not NOT_CONSTANT:
+                self.report.append(
+                    f"Removed the {'else body' if condition else 'body'} of an if else block, the condition is always {bool(condition)}."
+                )
+                return node.body if condition else node.else_body
+            if not node.body and not node.else_body:
+                self.report.append("Removed an if else block with empty bodies.")
+                return None
+            if not node.else_body:
+                self.report.append("Removed the empty else body of an if else block.")
+                return IfThenNode(node.condition, node.body, None)
+            if not node.body:
+                self.report.append("Removed the empty body of an if else block.")
+                return IfThenNode(NotNode(node.condition), node.else_body, None)
+        elif isinstance(node, IfThenNode):
+            node.body = self.eliminate_stack(node.body)
+            condition = constant_value(node.condition)
+            if condition is not NOT_CONSTANT:
+                self.report.append(
+                    "Replaced an if block by its body, the condition is always True."
+                    if condition
+                    else "Removed an if block, the condition is always False."
+                )
+                return node.body if condition else None
+            if not node.body:
+                self.report.append("Removed an if block with an empty body.")
+                return None
+        elif isinstance(node, RepeatLoopNode):
+            node.body = self.eliminate_stack(node.body)
+            if not node.body:
+                self.report.append("Removed a repeat block with an empty body.")
+                return None
+        elif isinstance(node, RepeatUntilNode):
+            node.body = self.eliminate_stack(node.body)
+            if not node.body:
+                self.report.append(
+                    "Replaced a repeat until block with an empty body by a wait until block."
+                )
+                return WaitUntilNode(node.condition, None)
+        elif isinstance(node, ForeverLoopNode):
+            node.body = self.eliminate_stack(node.body)
+        return node
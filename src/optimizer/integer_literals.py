@@ -0,0 +1,28 @@
+"""
+This file contains the pass that turns the whole numbers of the AST (e.g. 90.0) into ints, so they are generated as
+exact integer literals (90) rather than floats. Blocks only know numbers, so the visitor turns every number into a
+float, but ints are cheaper on the hub and can be used where an int is required (e.g. range(10) or set_pixel).
+Only numbers that fit in a small int of the hub are turned into ints, bigger ints would have to be allocated.
+"""
+from src.abstract_syntax_tree import AST, NumericalNode
+
+# The ints from -SMALL_INT_LIMIT up to (but not including) SMALL_INT_LIMIT are small ints on the hub.
+SMALL_INT_LIMIT = 2**30
+
+
+class IntegerLiterals:
+    """Turns the whole numbers into ints."""
+
+    def convert(self, ast: AST):
+        """Converts all the whole numbers of the AST in place.
+
+        :param ast: The AST to convert the numbers of.
+        """
+        for node in ast.nodes():
+            if (
+                isinstance(node, NumericalNode)
+                and isinstance(node.value, float)
+                and node.value.is_integer()
+                and -SMALL_INT_LIMIT <= node.value < SMALL_INT_LIMIT
+            ):
+                node.value = int(node.value)
@@ -0,0 +1,104 @@
+"""
+This file decides which sensor reads the code generator may share when it optimizes. A sensor that is read more than
+once by the expressions of a block (e.g. the distance in 'distance is between 10 and 20 or distance > 50') is then
+read once, into a variable before the block, and every expression uses that variable. A read of a sensor is slow on
+the hub, and reading it once also makes every part of the decision see the same value.
+Reads are only shared if they are the same read: the same sensor, port and value (e.g. the distance in cm of the
+distance sensor on port A). The distance, reflected light and color blocks are shared with the is distance, is
+reflection and is color conditions that read the same value.
+The reads that are shared:
+- The reads in the expressions of one block, these are all evaluated when the block starts.
+- The reads in the conditions of an else if chain, i.e. an if else block and the if (else) block that is the first
+  block of its else body, and so on. These conditions are evaluated right after each other.
+The reads that are not shared:
+- The reads in the conditions of repeat until and wait until blocks, these are evaluated again and again.
+- The reads of different blocks (e.g. the conditions of two if blocks after each other), motors can run or the
+  program can wait in between. In a loop, every block reads the sensor again in every iteration.
+- The reads of motors (speed and position) and of the hub itself (e.g. the gesture), these are cheap.
+"""
+from src.abstract_syntax_tree import Node, StackNode
+from src.abstract_syntax_tree.control import (
+    IfElseNode,
+    IfThenNode,
+    RepeatUntilNode,
+    WaitUntilNode,
+)
+from src.abstract_syntax_tree.sensors import (
+    ColorNode,
+    DistanceNode,
+    IsColorNode,
+    IsDistanceNode,
+    IsReflectionNode,
+    ReflectedLightNode,
+)
+
+# The nodes whose code reads a sensor.
+SENSOR_NODES = (
+    ColorNode,
+    IsColorNode,
+    ReflectedLightNode,
+    IsReflectionNode,
+    DistanceNode,
+    IsDistanceNode,
+)
+
+# The blocks whose condition is evaluated more than once.
+REPEATED_CONDITIONS = (RepeatUntilNode, WaitUntilNode)
+
+
+def else_if_chain(node: StackNode) -> list:
+    """
+    :return: The if (else) blocks that are evaluated right after the condition of node is, in order.
+    """
+    chain = []
+    while isinstance(node, IfElseNode) and isinstance(
+        node.else_body, (IfThenNode, IfElseNode)
+    ):
+        node = node.else_body
+        chain.append(node)
+    return chain
+
+
+def shared_expressions(node: StackNode) -> list:
+    """
+    :param node: The block, it is not part of the else if chain of another block.
+    :return: The expressions whose sensor reads can be shared, those of the else if chain of the block included.
+    """
+    if isinstance(node, REPEATED_CONDITIONS):
+        return []
+    expressions = [
+        child
+        for child in node.children()
+        if isinstance(child, Node) and not isinstance(child, StackNode)
+    ]
+    expressions.extend(block.condition for block in else_if_chain(node))
+    return expressions
+
+
+def sensor_read(node: Node) -> tuple:
+    """
+    :param node: A node that reads a sensor (see SENSOR_NODES), its port is fixed.
+    :return: The read, as the variable of the object of the sensor and the name of the method that reads the value.
+    """
+    port = node.port.value[0].lower()
+    if isinstance(node, (DistanceNode, IsDistanceNode)):
+        return f"distance_sensor_{port}", f"get_distance_{node.unit.code()}"
+    if isinstance(node, (ReflectedLightNode, IsReflectionNode)):
+        return f"color_sensor_{port}", "get_reflected_light"
+    return f"color_sensor_{port}", "get_color"
+
+
+def repeated_reads(expressions: list) -> list:
+    """
+    :return: The reads (see sensor_read) that are done more than once by the expressions, in the order they are first
+    done.
+    """
+    counts = {}
+    pending = list(reversed(expressions))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, SENSOR_NODES):
+            read = sensor_read(node)
+            counts[read] = counts.get(read, 0) + 1
+        pending.extend(reversed(node.children()))
+    return [read for read, count in counts.items() if count > 1]
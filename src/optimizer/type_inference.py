@@ -0,0 +1,255 @@
+"""
+This file contains the type inference, it works out the Python type of the value of every expression of the AST
+(an int, a float, a string, a bool or a list) so the code generator can leave out the conversions it does not need,
+e.g. the int(...) around a value that is an integer anyway.
+The type of a variable is the combination of the types of all the values that are assigned to it (with set or change)
+anywhere in the program, these are computed together until none of them changes anymore.
+The inference is conservative: an int is only inferred if every value the expression can have is an int, everything
+that can't be proven (e.g. the value of a sensor) is UNKNOWN.
+"""
+from enum import Enum
+
+from src.abstract_syntax_tree import (
+    AST,
+    BooleanLiteralNode,
+    LiteralNode,
+    Node,
+    NumericalNode,
+)
+from src.abstract_syntax_tree.operators import (
+    ArithmeticalNode,
+    BinaryFunction,
+    BinaryMathFunctionNode,
+    ComparisonNode,
+    ComparisonOperator,
+    IsBetweenNode,
+    JoinStringsNode,
+    LengthOfStringNode,
+    LetterOfStringNode,
+    ModNode,
+    NotNode,
+    Operation,
+    PickRandomNumberNode,
+    RoundNode,
+    StringContainsNode,
+    UnaryFunction,
+    UnaryMathFunctionNode,
+)
+from src.abstract_syntax_tree.variables import (
+    AddItemToListNode,
+    ChangeVariableByNode,
+    DeleteAllItemsInListNode,
+    DeleteItemInListNode,
+    IndexOfItemNode,
+    InsertItemAtIndexNode,
+    ItemAtIndexNode,
+    LengthOfListNode,
+    ListContainsNode,
+    ReplaceItemAtIndexNode,
+    SetVariableToNode,
+    VariableNode,
+)
+
+
+class Type(Enum):
+    INT = "int"
+    # A number that might not be an int, i.e. a float or a mix of ints and floats
+    FLOAT = "float"
+    STRING = "str"
+    BOOL = "bool"
+    LIST = "list"
+    UNKNOWN = "unknown"
+
+
+# The unary functions that always result in an int.
+INTEGER_FUNCTIONS = (UnaryFunction.CEIL, UnaryFunction.FLOOR)
+
+
+def combine(first: Type, second: Type) -> Type:
+    """Combines the types of two values an expression (or variable) can have.
+    None is used for an expression without any value yet (e.g. a variable that is never assigned).
+
+    :return: The type of both values.
+    """
+    if first is None:
+        return second
+    if second is None or first is second:
+        return first
+    if {first, second} == {Type.INT, Type.FLOAT}:
+        return Type.FLOAT
+    return Type.UNKNOWN
+
+
+def is_number(type: Type) -> bool:
+    return type is Type.INT or type is Type.FLOAT
+
+
+def arithmetic(operation: Operation, left: Type, right: Type) -> Type:
+    """
+    :return: The type of the result of the arithmetic operation on values of the types.
+    """
+    if left is None or right is None:
+        return None
+    if not is_number(left) or not is_number(right):
+        if operation is Operation.PLUS and left is right is Type.STRING:
+            return Type.STRING
+        return Type.UNKNOWN
+    if operation is Operation.DIVIDE:
+        return Type.FLOAT
+    return Type.INT if left is right is Type.INT else Type.FLOAT
+
+
+class TypeInference:
+    """Infers the types of the variables of a program, after which the type of any expression can be asked for."""
+
+    def __init__(self, ast: AST) -> None:
+        """
+        :param ast: The AST of the program.
+        """
+        # Maps the name of every variable (and list) to its type
+        self.variables = {}
+
+        assignments = []
+        for node in ast.nodes():
+            if isinstance(node, (SetVariableToNode, ChangeVariableByNode)):
+                assignments.append(node)
+            elif isinstance(node, self.list_nodes):
+                name = getattr(node, "variable", None) or node.list
+                self.variables[name] = combine(self.variables.get(name), Type.LIST)
+
+        # Every round the types can only get less specific, so this ends after a few rounds
+        changed = True
+        while changed:
+            changed = False
+            for node in assignments:
+                value = self.infer(node.value)
+                if isinstance(node, ChangeVariableByNode):
+                    value = arithmetic(
+                        Operation.PLUS, self.variables.get(node.variable), value
+                    )
+                current = self.variables.get(node.variable)
+                combined = combine(current, value)
+                if combined is not current:
+                    self.variables[node.variable] = combined
+                    changed = True
+
+    def type_of(self, node: Node) -> Type:
+        """
+        :param node: The root of the expression.
+        :return: The type of the value of the expression.
+        """
+        return self.infer(node) or Type.UNKNOWN
+
+    def infer(self, node: Node) -> Type:
+        """
+        :return: The type of the value of the expression, None if it has no value yet.
+        """
+        infer = self.rules.get(type(node))
+        return infer(self, node) if infer else Type.UNKNOWN
+
+    def infer_numerical(self, node: NumericalNode) -> Type:
+        return Type.INT if isinstance(node.value, int) else Type.FLOAT
+
+    def infer_literal(self, node: LiteralNode) -> Type:
+        return Type.STRING
+
+    def infer_boolean(self, node: Node) -> Type:
+        return Type.BOOL
+
+    def infer_integer(self, node: Node) -> Type:
+        return Type.INT
+
+    def infer_variable(self, node: VariableNode) -> Type:
+        return self.variables.get(node.name)
+
+    def infer_arithmetical(self, node: ArithmeticalNode) -> Type:
+        return arithmetic(
+            node.op, self.infer(node.left_hand), self.infer(node.right_hand)
+        )
+
+    def infer_join_strings(self, node: JoinStringsNode) -> Type:
+        # The code is a +, so two numbers are added rather than joined
+        return arithmetic(
+            Operation.PLUS, self.infer(node.left_hand), self.infer(node.right_hand)
+        )
+
+    def infer_mod(self, node: ModNode) -> Type:
+        left = self.infer(node.left_hand)
+        right = self.infer(node.right_hand)
+        if left is None or right is None:
+            return None
+        if not is_number(left) or not is_number(right):
+            return Type.UNKNOWN
+        return Type.INT if left is right is Type.INT else Type.FLOAT
+
+    def infer_comparison(self, node: ComparisonNode) -> Type:
+        if node.op in (ComparisonOperator.AND, ComparisonOperator.OR):
+            # The result is one of the operands
+            left = self.infer(node.left_hand)
+            right = self.infer(node.right_hand)
+            if left is None or right is None:
+                return None
+            return combine(left, right)
+        return Type.BOOL
+
+    def infer_letter_of_string(self, node: LetterOfStringNode) -> Type:
+        return Type.STRING
+
+    def infer_unary_math_function(self, node: UnaryMathFunctionNode) -> Type:
+        if node.function in INTEGER_FUNCTIONS:
+            return Type.INT
+        value = self.infer(node.left_hand)
+        if value is None:
+            return None
+        if node.function is UnaryFunction.ABS and is_number(value):
+            return value
+        return Type.FLOAT if is_number(value) else Type.UNKNOWN
+
+    def infer_binary_math_function(self, node: BinaryMathFunctionNode) -> Type:
+        left = self.infer(node.left_hand)
+        right = self.infer(node.right_hand)
+        if left is None or right is None:
+            return None
+        if not is_number(left) or not is_number(right):
+            return Type.UNKNOWN
+        if node.function in (BinaryFunction.MAX, BinaryFunction.MIN):
+            return combine(left, right)
+        # A power of ints is a float if the exponent is negative
+        return Type.FLOAT
+
+    # The nodes that use a variable as a list, the name of the list is held in their variable (or list) attribute
+    list_nodes = (
+        AddItemToListNode,
+        DeleteItemInListNode,
+        DeleteAllItemsInListNode,
+        LengthOfListNode,
+        InsertItemAtIndexNode,
+        ItemAtIndexNode,
+        ReplaceItemAtIndexNode,
+        IndexOfItemNode,
+        ListContainsNode,
+    )
+
+    # Maps every node class to the method that infers the type of its value, other nodes are UNKNOWN
+    rules = {
+        NumericalNode: infer_numerical,
+        LiteralNode: infer_literal,
+        BooleanLiteralNode: infer_boolean,
+        VariableNode: infer_variable,
+        ArithmeticalNode: infer_arithmetical,
+        JoinStringsNode: infer_join_strings,
+        ModNode: infer_mod,
+        ComparisonNode: infer_comparison,
+        NotNode: infer_boolean,
+        IsBetweenNode: infer_boolean,
+        StringContainsNode: infer_boolean,
+        ListContainsNode: infer_boolean,
+        LetterOfStringNode: infer_letter_of_string,
+        LengthOfStringNode: infer_integer,
+        LengthOfListNode: infer_integer,
+        IndexOfItemNode: infer_integer,
+        RoundNode: infer_integer,
+        PickRandomNumberNode: infer_integer,
+        UnaryMathFunctionNode: infer_unary_math_function,
+        BinaryMathFunctionNode: infer_binary_math_function,
+    }
@@ -0,0 +1,149 @@
+"""
+This file contains the profiler that is used by the --profile option, it breaks a compilation down into its stages
+(reading the zip archives, decoding the json, filtering it, building the AST, optimizing it, generating the code and
+the AST representation) and reports the wall time and the peak traced memory of every stage, how many nodes of every
+AST class were built and how often every opcode was seen.
+The stages are timed in a first run and traced in a second one, so tracing does not skew the wall times.
+"""
+import json
+import time
+import tracemalloc
+from collections import Counter
+
+from src.code_generator import CodeGenerator
+from src.compiler import Compilation
+from src.json_parser import filter_json, loads, read_project_json
+from src.optimizer import Optimizer
+from src.visitor import Visitor
+
+
+class Profile:
+    """The profile of a compilation."""
+
+    def __init__(self, input_filename: str) -> None:
+        self.input_filename = input_filename
+        # Wall time of every stage in seconds, in the order the stages ran
+        self.durations = {}
+        self.peaks = {}  # Peak traced memory of every stage in bytes
+        self.node_counts = Counter()  # Number of nodes per AST class
+        self.opcode_counts = Counter()  # Number of blocks per opcode
+
+    def to_dict(self) -> dict:
+        return {
+            "input_filename": self.input_filename,
+            "stages": {
+                stage: {"duration": duration, "peak": self.peaks.get(stage)}
+                for stage, duration in self.durations.items()
+            },
+            "total_duration": sum(self.durations.values()),
+            "nodes": dict(self.node_counts.most_common()),
+            "opcodes": dict(self.opcode_counts.most_common()),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def __str__(self) -> str:
+        lines = [
+            f"Profile of {self.input_filename}",
+            f"{'Stage':<22}{'wall ms':>10}{'peak KiB':>10}",
+        ]
+        for stage, duration in self.durations.items():
+            lines.append(
+                f"{stage:<22}{duration * 1e3:10.3f}{self.peaks.get(stage, 0) / 1024:10.1f}"
+            )
+        lines.append(f"{'total':<22}{sum(self.durations.values()) * 1e3:10.3f}")
+
+        lines.append(f"Nodes ({sum(self.node_counts.values())}):")
+        for name, count in self.node_counts.most_common():
+            lines.append(f"  {name:<36}{count:>6}")
+        lines.append(f"Opcodes ({sum(self.opcode_counts.values())}):")
+        for opcode, count in self.opcode_counts.most_common():
+            lines.append(f"  {opcode:<36}{count:>6}")
+        return "\n".join(lines)
+
+
+def run_stages(
+    input_filename: str,
+    safe: bool,
+    best_effort: bool,
+    ast: bool,
+    optimize: bool,
+    measure,
+) -> tuple:
+    """Runs the compilation, every stage is run through measure.
+
+    :param measure: Function (stage, function, *args) that calls function(*args) and returns its result.
+    :return: The filtered json, the AST and the compilation.
+    """
+    data = measure("read", read_project_json, input_filename)
+    project = measure("decode", loads, data)
+    concrete_syntax_tree = measure("filter", filter_json, project)
+    abstract_syntax_tree = measure(
+        "visit", Visitor(best_effort).visit, concrete_syntax_tree
+    )
+    optimizer = Optimizer()
+    if optimize:
+        abstract_syntax_tree = measure(
+            "optimize", optimizer.optimize, abstract_syntax_tree
+        )
+    code = measure(
+        "generate", CodeGenerator(safe, optimize).generate, abstract_syntax_tree
+    )
+    ast_representation = None
+    if ast:
+        ast_representation = measure(
+            "tree_representation", abstract_syntax_tree.tree_representation
+        )
+    return (
+        concrete_syntax_tree,
+        abstract_syntax_tree,
+        Compilation(code, ast_representation, report=optimizer.report),
+    )
+
+
+def profile_file(
+    input_filename: str,
+    safe: bool = False,
+    best_effort: bool = True,
+    ast: bool = False,
+    optimize: bool = False,
+) -> tuple:
+    """Compiles a file and profiles the compilation.
+
+    :param input_filename: The path to the file that should be converted.
+    :param safe: Indicates if safer code should be outputted.
+    :param best_effort: Indicates if untranslatable blocks should be skipped.
+    :param ast: Indicates if the AST representation should also be generated.
+    :param optimize: Indicates if the AST should be optimized.
+    :return: The compilation and its profile.
+    """
+    profile = Profile(input_filename)
+
+    def time_stage(stage, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        profile.durations[stage] = time.perf_counter() - start
+        return result
+
+    def trace_stage(stage, function, *args):
+        tracemalloc.start()
+        try:
+            result = function(*args)
+            profile.peaks[stage] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result
+
+    concrete_syntax_tree, abstract_syntax_tree, compilation = run_stages(
+        input_filename, safe, best_effort, ast, optimize, time_stage
+    )
+    run_stages(input_filename, safe, best_effort, ast, optimize, trace_stage)
+
+    for node in abstract_syntax_tree.nodes():
+        profile.node_counts[type(node).__name__] += 1
+    for block in concrete_syntax_tree["blocks"].values():
+        # Loose variable reporters are stored as lists rather than blocks
+        if isinstance(block, dict):
+            profile.opcode_counts[block["opcode"]] += 1
+    return compilation, profile
@@ -0,0 +1,256 @@
+"""
+This file contains the compile server, a long-running process that loads the compiler once and compiles the
+*.lms files it receives over HTTP, either on localhost or on a Unix socket.
+
+    POST /compile?safe=1&best_effort=0&ast=1&optimize=1   with the bytes of the .lms file as body
+    GET  /health
+
+The response is json, {"code": ..., "ast": ..., "cached": ...} on success or {"error": ...} with status 400 if the
+request or the file is invalid (411 without a Content-Length, 413 if the file is too big) and 500 if the compiler
+itself fails.
+Requests are handled concurrently, the compilations themselves are done by a pool of worker processes.
+"""
+import io
+import json
+import os
+import socketserver
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.cache import CompilationCache
+from src.cli import add_flag, add_jobs_option, create_parser
+from src.compiler import compile_json, load_compiler
+from src.json_parser import extract_json, filter_json
+
+# Bodies bigger than this (in bytes) are refused.
+MAX_REQUEST_SIZE = 64 * 1024 * 1024
+
+# The errors that are caused by the request rather than by the server: a file that is not a zip, a project that
+# can't be read (a ValueError, like an invalid flag) and blocks that are not supported.
+INPUT_ERRORS = (zipfile.BadZipFile, ValueError, NotImplementedError)
+
+# The errors of reading a project that lacks the project.json or of which the json lacks the expected fields.
+PROJECT_ERRORS = (KeyError, IndexError, TypeError)
+
+
+def compile_bytes(
+    data: bytes,
+    safe: bool = False,
+    best_effort: bool = True,
+    ast: bool = False,
+    cache: CompilationCache = None,
+    optimize: bool = False,
+) -> dict:
+    """Compiles the content of a .lms file, runs in a worker process.
+
+    :param data: The bytes of the .lms file.
+    :return: The json response.
+    """
+    try:
+        concrete_syntax_tree = filter_json(extract_json(io.BytesIO(data)))
+    except PROJECT_ERRORS as error:
+        # The same errors raised by the compiler itself are bugs, those are not reported as invalid input
+        raise ValueError(f"Invalid project: {type(error).__name__}: {error}") from error
+    compilation = compile_json(
+        concrete_syntax_tree, safe, best_effort, ast, cache, optimize=optimize
+    )
+    response = {"code": compilation.code, "cached": compilation.cached}
+    if ast:
+        response["ast"] = compilation.ast_representation
+    return response
+
+
+def parse_flag(query: dict, name: str, default: bool) -> bool:
+    """Reads a boolean flag from the query string, 1/true/yes and 0/false/no are accepted.
+
+    :param query: The parsed query string.
+    :param name: The name of the flag.
+    :param default: The value if the flag is not present.
+    :return: The value of the flag.
+    """
+    if name not in query:
+        return default
+    value = query[name][-1].lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Invalid value for {name}: {value}")
+
+
+class CompileRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a single connection, the server provides the pool and the cache."""
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/compile":
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.send_json(411, {"error": "The Content-Length header is missing"})
+            return
+        if not length.strip().isdigit():
+            self.send_json(400, {"error": f"Invalid Content-Length: {length}"})
+            return
+        length = int(length)
+        if length > MAX_REQUEST_SIZE:
+            self.send_json(413, {"error": "The file is too big"})
+            return
+        data = self.rfile.read(length)
+
+        try:
+            query = parse_qs(url.query)
+            future = self.server.pool.submit(
+                compile_bytes,
+                data,
+                parse_flag(query, "safe", False),
+                parse_flag(query, "best_effort", True),
+                parse_flag(query, "ast", False),
+                self.server.cache,
+                parse_flag(query, "optimize", False),
+            )
+            response = future.result()
+        except INPUT_ERRORS as error:
+            self.send_json(400, {"error": f"{type(error).__name__}: {error}"})
+            return
+        except Exception as error:
+            # E.g. a worker process that died (BrokenProcessPool) or a bug in the compiler
+            self.send_json(500, {"error": f"{type(error).__name__}: {error}"})
+            return
+        self.send_json(200, response)
+
+    def send_json(self, status: int, content: dict):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # The address of a Unix socket client is empty
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class CompileServer(ThreadingHTTPServer):
+    """HTTP server on localhost that compiles with a pool of worker processes."""
+
+    def __init__(
+        self,
+        address: tuple,
+        jobs: int = None,
+        cache: CompilationCache = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        :param address: The (host, port) to listen on, port 0 picks a free one.
+        :param jobs: The number of worker processes, defaults to the number of CPUs.
+        :param cache: The cache to use, defaults to None (no cache).
+        :param verbose: Indicates if every request should be logged.
+        """
+        super().__init__(address, CompileRequestHandler)
+        # The workers are forked from this process, so they start with the compiler already loaded
+        load_compiler()
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        self.cache = cache
+        self.verbose = verbose
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+
+class UnixCompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Same as CompileServer, but listens on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str,
+        jobs: int = None,
+        cache: CompilationCache = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        :param path: The path of the socket, an existing socket at the path is replaced.
+        """
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, CompileRequestHandler)
+        load_compiler()
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        self.cache = cache
+        self.verbose = verbose
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def serve_parser():
+    parser = create_parser(
+        "python -m src serve",
+        "Starts a server that compiles the .lms files that are posted to /compile.",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="The address the server listens on if no socket is used.",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="The port the server listens on."
+    )
+    parser.add_argument(
+        "--socket",
+        default="",
+        help="The path of a Unix socket to listen on instead of host and port.",
+    )
+    add_jobs_option(parser)
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="The directory in which compiled projects are cached, unchanged projects are then not compiled again. If none is provided nothing is cached.",
+    )
+    add_flag(parser, "verbose", False, "Indicates if every request is logged.")
+    return parser
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket: str = "",
+    jobs: int = None,
+    cache_dir: str = "",
+    verbose: bool = False,
+):
+    cache = CompilationCache(cache_dir) if cache_dir else None
+    if socket:
+        server = UnixCompileServer(socket, jobs, cache, verbose)
+        print(f"Listening on {socket}")
+    else:
+        server = CompileServer((host, port), jobs, cache, verbose)
+        print(f"Listening on http://{host}:{server.server_address[1]}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,12 +1,20 @@
 from json import loads
 
-from src.abstract_syntax_tree import AST, CommentNode, LiteralNode, Node, NumericalNode
+from src.abstract_syntax_tree import (
+    AST,
+    CommentNode,
+    LiteralNode,
+    Node,
+    NumericalNode,
+    StackNode,
+)
 from src.abstract_syntax_tree.control import (
     ForeverLoopNode,
     IfElseNode,
     IfThenNode,
     RepeatLoopNode,
     RepeatUntilNode,
+    StopNode,
     WaitForSecondsNode,
     WaitUntilNode,
 )
@@ -117,6 +125,23 @@ from src.abstract_syntax_tree.variables import (
     SetVariableToNode,
     VariableNode,
 )
+from src.block_index import Block, BlockIndex
+from src.garbage_collector import gc_paused
+
+
+def visits(opcode: str, *args):
+    """Decorator that registers a Visitor method as the handler of the blocks with the given opcode.
+    Can be applied multiple times to the same method, the extra arguments are passed to the method after the node.
+
+    :param opcode: The opcode of the blocks the method handles.
+    :param args: Extra arguments the method is called with for this opcode.
+    """
+
+    def decorator(method):
+        method.opcodes = getattr(method, "opcodes", []) + [(opcode, args)]
+        return method
+
+    return decorator
 
 
 class Visitor:
@@ -128,254 +153,150 @@ class Visitor:
     best_effort: bool  # If true then the visitor will try to continue even if it encounters a block it can't translate.
     # A comment will be added to the AST to indicate that this has happened.
 
+    index: BlockIndex  # Index of the blocks of the CST that is being visited, built once per visit.
+    blocks: dict  # Maps the id of every block to its Block record, the handlers work on these rather than the json.
+
+    handlers: dict  # Maps every supported opcode to a (handler, args) pair, see dispatch_table.
+
+    # Handlers added with Visitor.register, on top of the methods decorated with @visits.
+    registered_handlers: dict = {}
+
     def __init__(self, best_effort) -> None:
         self.best_effort = best_effort
 
+    @classmethod
+    def register(cls, opcode: str, handler, *args):
+        """Registers a handler for an opcode, so new blocks can be supported without changing this class.
+        The registration applies to this class and all its subclasses.
+
+        :param opcode: The opcode of the blocks the handler handles.
+        :param handler: Callable that is called as handler(visitor, block, *args) with the Block record of the block
+            and returns the AST representation, the next pointer of stack nodes is linked by the visitor.
+        :param args: Extra arguments the handler is called with.
+        """
+        if "registered_handlers" not in cls.__dict__:
+            cls.registered_handlers = {}
+        cls.registered_handlers[opcode] = (handler, args)
+        cls.clear_dispatch_table()
+
+    @classmethod
+    def clear_dispatch_table(cls):
+        """Forces the dispatch table of this class and all its subclasses to be rebuilt on the next use."""
+        cls._dispatch_table = None
+        for subclass in cls.__subclasses__():
+            subclass.clear_dispatch_table()
+
+    @classmethod
+    def dispatch_table(cls) -> dict:
+        """Returns the table that maps every opcode to a (handler, args) pair, it is only built once per class.
+        Handlers of subclasses take precedence and overridden methods are looked up on the class itself.
+
+        :return: The dispatch table of this class.
+        :rtype: dict
+        """
+        table = cls.__dict__.get("_dispatch_table")
+        if table is None:
+            table = {}
+            for klass in reversed(cls.__mro__):
+                for name, attribute in vars(klass).items():
+                    for opcode, args in getattr(attribute, "opcodes", []):
+                        table[opcode] = (getattr(cls, name), args)
+                table.update(vars(klass).get("registered_handlers", {}))
+            cls._dispatch_table = table
+        return table
+
     def visit(self, cst: dict) -> AST:
         # TODO: Need to do something with the variables, list, broadcast and extensions
         self.ast = AST()
         self.cst = cst["blocks"]
+        self.handlers = self.dispatch_table()
 
-        # Parse all the subtrees that are present in the CST
-        for node in self.find_root_nodes():
-            self.ast.hat_nodes.append(self.visit_node(node))
+        with gc_paused():
+            self.index = BlockIndex(self.cst)
+            self.blocks = self.index.blocks
+
+            # Parse all the subtrees that are present in the CST
+            for node in self.find_root_nodes():
+                self.ast.hat_nodes.append(self.visit_root_node(node))
 
         return self.ast
 
     def find_root_nodes(self) -> list:
-        """Find all the root notes of the subtrees present in the CST. These are the first blocks of block stacks.
+        """Find all the root notes of the subtrees present in the CST. These are the hat blocks of the block stacks,
+        loose stacks (that are never run) and shadow blocks are left out.
         :return: List of all the root nodes.
         :rtype: list
         """
-        # TODO: This will need to be more sophisticated but this works for now
-        if self.cst:
-            return [next(iter(self.cst))]
-        else:
-            return []
+        return self.index.hats
 
-    # flake8: noqa: C901
-    def visit_node(self, node: dict) -> Node:
-        """Checks the type of the node and calls the appropriate visit function.
-        :param node: The identifier of the current node (the key for the CST dict) or None
-        :type node: dict
+    def visit_root_node(self, node: str) -> Node:
+        """Visits the stack of blocks that starts at the hat block node.
+        Only the stacks that start when the program starts are supported, any other stack (e.g. of another event or of
+        a My Block) is replaced by a placeholder if best_effort is used.
+        :param node: The id of the hat block.
+        :raises NotImplementedError: If the hat block is not supported and best_effort is not used.
+        :return: The AST representation of the stack.
+        :rtype: Node
+        """
+        opcode = self.blocks[node].opcode
+        if opcode not in self.handlers:
+            if not self.best_effort:
+                raise NotImplementedError(
+                    f"The {opcode} block is not supported yet, use the best_effort flag to generate code without its stack."
+                )
+            return CommentNode(
+                f"# Placeholder for the stack of the {opcode} block. Note: that only the stacks that start when the program starts are supported at the moment.",
+                None,
+            )
+        return self.visit_node(node)
+
+    def visit_node(self, node: str) -> Node:
+        """Visits the stack of blocks that starts at node and links the AST representations through their next pointer.
+        The next pointers are followed in a loop rather than recursively, so a stack of any length is visited at a
+        constant Python stack depth. Only the inputs and nested bodies (i.e, SUBSTACK) of a block recurse.
+        :param node: The identifier of the first node of the stack (the key for the CST dict) or None
+        :type node: str
+        :raises NotImplementedError: If a node is not yet supported raise an error
+        :return: The AST representation of the first node, or None if there is no node
+        :rtype: Node
+        """
+        first = last = None
+        while node:
+            block = self.blocks[node]
+            ast_node = self.visit_block(block)
+            if last is None:
+                first = ast_node
+            else:
+                last.next = ast_node
+            last = ast_node
+            # Only stack blocks can have a successor
+            node = block.next if isinstance(ast_node, StackNode) else None
+        return first
+
+    def visit_block(self, node: Block) -> Node:
+        """Looks up the handler for the opcode of the node in the dispatch table and calls it.
+        The handlers only construct the node itself, its next pointer is linked by visit_node.
+        :param node: The Node representation.
+        :type node: Block
         :raises NotImplementedError: If the node is not yet supported raise an error
         :return: The AST representation of the node
         :rtype: Node
         """
-        if not node:  # There is no node return None
-            return None
-        node = self.cst[node]
-
-        opcode = node["opcode"]
-        if opcode == "flipperevents_whenProgramStarts":
-            return self.visit_when_program_starts(node)
-        elif opcode == "flippermotor_motorTurnForDirection":
-            return self.visit_run_motor_for_duration(node)
-        elif opcode == "flippermotor_motorGoDirectionToPosition":
-            return self.visit_motor_go_to_position(node)
-        elif opcode == "flippermotor_custom-angle":
-            return self.visit_motor_custom_angle(node)
-        elif opcode == "flippermotor_motorStartDirection":
-            return self.visit_start_motor(node)
-        elif opcode == "flippermotor_motorStop":
-            return self.visit_stop_motor(node)
-        elif opcode == "flippermotor_motorSetSpeed":
-            return self.visit_set_motor_speed(node)
-        elif opcode == "flippermotor_absolutePosition":
-            return self.visit_motor_position(node)
-        elif opcode == "flippermotor_speed":
-            return self.visit_motor_speed(node)
-        elif opcode == "flippermove_setMovementPair":
-            return self.visit_set_movement_motors(node)
-        elif opcode == "flippermove_move":
-            return self.visit_move_for_duration(node)
-        elif opcode == "flippermove_steer":
-            return self.visit_move_with_steering(node)
-        elif opcode == "flippermove_rotation-wheel":
-            return self.visit_move_rotation_wheel(node)
-        elif opcode == "flippermove_startSteer":
-            return self.visit_start_moving_with_steering(node)
-        elif opcode == "flippermove_stopMove":
-            return self.visit_stop_moving(node)
-        elif opcode == "flippermove_movementSpeed":
-            return self.visit_set_movement_speed(node)
-        elif opcode == "flippermove_setDistance":
-            return self.visit_set_motor_rotation(node)
-        elif opcode == "flipperdisplay_ledAnimation":
-            return self.visit_start_animation(node)
-        elif opcode == "flipperdisplay_ledAnimationUntilDone":
-            return self.visit_play_animation_until_done(node)
-        elif opcode == "flipperdisplay_ledImageFor":
-            return self.visit_turn_on_for_duration(node)
-        elif opcode == "flipperdisplay_ledImage":
-            return self.visit_turn_on(node)
-        elif opcode == "flipperdisplay_ledText":
-            return self.visit_write(node)
-        elif opcode == "flipperdisplay_displayOff":
-            return self.visit_turn_off_pixels(node)
-        elif opcode == "flipperdisplay_ledSetBrightness":
-            return self.visit_set_pixel_brightness(node)
-        elif opcode == "flipperdisplay_ledOn":
-            return self.visit_set_pixel(node)
-        elif opcode == "flipperdisplay_menu_ledMatrixIndex":
-            return self.visit_set_pixel_matrix_index(node)
-        elif opcode == "flipperdisplay_ledRotateDirection":
-            return self.visit_rotate_orientation(node)
-        elif opcode == "flipperdisplay_ledRotateOrientation":
-            return self.visit_set_orientation(node)
-        elif opcode == "flipperdisplay_centerButtonLight":
-            return self.visit_set_center_button(node)
-        elif opcode == "flipperdisplay_ultrasonicLightUp":
-            return self.visit_light_up_distance_sensor(node)
-        elif opcode == "data_setvariableto":
-            return self.visit_set_variable_to(node)
-        elif opcode == "data_changevariableby":
-            return self.visits_change_variable_by(node)
-        elif opcode == "data_addtolist":
-            return self.visit_add_to_list(node)
-        elif opcode == "data_deleteoflist":
-            return self.visit_delete_item_in_list(node)
-        elif opcode == "data_deletealloflist":
-            return self.visit_delete_all_items_in_list(node)
-        elif opcode == "data_lengthoflist":
-            return self.visit_length_of_list(node)
-        elif opcode == "data_insertatlist":
-            return self.visit_insert_at_index(node)
-        elif opcode == "data_itemoflist":
-            return self.visit_item_at_index(node)
-        elif opcode == "data_replaceitemoflist":
-            return self.visit_replace_item_at_index(node)
-        elif opcode == "data_itemnumoflist":
-            return self.visit_index_of_item(node)
-        elif opcode == "data_listcontainsitem":
-            return self.visit_list_contains_item(node)
-        elif opcode == "control_if":
-            return self.visit_if_then(node)
-        elif opcode == "control_wait":
-            return self.visit_for_seconds(node)
-        elif opcode == "control_wait_until":
-            return self.visit_wait_until(node)
-        elif opcode == "control_repeat":
-            return self.visit_repeat_loop(node)
-        elif opcode == "control_forever":
-            return self.visit_forever_loop(node)
-        elif opcode == "control_if_else":
-            return self.visit_if_else(node)
-        elif opcode == "control_repeat_until":
-            return self.visit_repeat_until(node)
-        elif opcode == "flippercontrol_fork":
-            return self.visit_do_this_and_this(node)
-        elif opcode == "flippercontrol_stopOtherStacks":
-            return self.visit_stop_other_stacks(node)
-        elif opcode == "flippercontrol_stop":
-            return self.visit_stop(node)
-        elif opcode == "flippersensors_color":
-            return self.visit_color(node)
-        elif opcode == "flippersensors_isColor":
-            return self.visit_is_color(node)
-        elif opcode == "flippersensors_isReflectivity":
-            return self.visit_is_reflectivity(node)
-        elif opcode == "flippersensors_reflectivity":
-            return self.visit_reflectivity(node)
-        elif opcode == "flippersensors_isDistance":
-            return self.visit_is_distance(node)
-        elif opcode == "flippersensors_distance":
-            return self.visit_distance(node)
-        elif opcode == "flippersensors_motion":
-            return self.visit_gesture(node)
-        elif opcode == "flippersensors_isorientation":
-            return self.visit_is_orientation(node)
-        elif opcode == "flippersensors_orientation":
-            return self.visit_orientation(node)
-        elif opcode == "flippersensors_resetYaw":
-            return self.visit_reset_yaw(node)
-        elif opcode == "flippersensors_buttonIsPressed":
-            return self.visit_is_button_pressed(node)
-        elif opcode == "flippersensors_orientationAxis":
-            return self.visit_hub_angle(node)
-        elif opcode == "flippersensors_timer":
-            return self.visit_hub_timer(node)
-        elif opcode == "flippersensors_resetTimer":
-            return self.visit_hub_reset_timer(node)
-        elif opcode == "sensing_keypressed":
-            return self.visit_key_pressed(node)
-        elif opcode == "flippersensors_ismotion":
-            return self.visit_hub_is_shaken(node)
-        elif opcode == "operator_add":
-            return self.visit_operator(Operation.PLUS, node)
-        elif opcode == "operator_subtract":
-            return self.visit_operator(Operation.MINUS, node)
-        elif opcode == "operator_divide":
-            return self.visit_operator(Operation.DIVIDE, node)
-        elif opcode == "operator_multiply":
-            return self.visit_operator(Operation.MULTIPLY, node)
-        elif opcode == "operator_random":
-            return self.visit_pick_random(node)
-        elif opcode == "operator_lt":
-            return self.visit_comparison(node, ComparisonOperator.LESS)
-        elif opcode == "operator_equals":
-            return self.visit_comparison(node, ComparisonOperator.EQUAL)
-        elif opcode == "operator_gt":
-            return self.visit_comparison(node, ComparisonOperator.GREATER)
-        elif opcode == "operator_and":
-            return self.visit_comparison(node, ComparisonOperator.AND)
-        elif opcode == "operator_or":
-            return self.visit_comparison(node, ComparisonOperator.OR)
-        elif opcode == "operator_contains":
-            return self.visit_string_contains(node)
-        elif opcode == "operator_not":
-            return self.visit_not_node(node)
-        elif opcode == "flipperoperator_isInBetween":
-            return self.visit_is_between(node)
-        elif opcode == "operator_join":
-            return self.visit_join_strings(node)
-        elif opcode == "operator_letter_of":
-            return self.visit_letter_of_string(node)
-        elif opcode == "operator_length":
-            return self.visit_length_of_string(node)
-        elif opcode == "operator_mod":
-            return self.visit_mod(node)
-        elif opcode == "operator_round":
-            return self.visit_round(node)
-        elif opcode == "operator_mathop":
-            return self.visit_unary_math_function(node)
-        elif opcode == "flipperoperator_mathFunc2Params":
-            return self.visit_binary_math_function(node)
-        elif opcode == "flippersound_playSoundUntilDone":
-            return self.visit_play_sound(node)
-        elif opcode == "flippersound_playSound":
-            return self.visit_start_sound(node)
-        elif opcode == "flippersound_beepForTime":
-            return self.visit_play_beep(node)
-        elif opcode == "flippersound_custom-piano":
-            return self.visit_piano_node(node)
-        elif opcode == "flippersound_beep":
-            return self.visit_start_beep(node)
-        elif opcode == "flippersound_stopSound":
-            return self.visit_stop_sound(node)
-        elif opcode == "sound_setvolumeto":
-            return self.visit_set_volume(node)
-        elif opcode == "sound_changevolumeby":
-            return self.visit_change_volume(node)
-        elif opcode == "sound_volume":
-            return self.visit_volume(node)
-        elif opcode == "sound_changeeffectby":
-            return self.visit_change_effect(node)
-        elif opcode == "sound_seteffectto":
-            return self.visit_set_effect(node)
-        elif opcode == "sound_cleareffects":
-            return self.visit_clear_effects(node)
-        else:
-            raise NotImplementedError(opcode)
+        try:
+            handler, args = self.handlers[node.opcode]
+        except KeyError:
+            raise NotImplementedError(node.opcode) from None
+        return handler(self, node, *args)
 
-    def visit_when_program_starts(self, node: dict) -> WhenProgramStartsNode:
+    @visits("flipperevents_whenProgramStarts")
+    def visit_when_program_starts(self, node: Block) -> WhenProgramStartsNode:
         """Constructs the AST representation of the WhenProgramStarts node.
         :param node: The Node representation.
         """
-        next_node = self.visit_node(node["next"])
-        return WhenProgramStartsNode(node["x"], node["y"], next_node)
+        return WhenProgramStartsNode(node.x, node.y, None)
 
-    def visit_run_motor_for_duration(self, node: dict) -> RunMotorForDurationNode:
+    @visits("flippermotor_motorTurnForDirection")
+    def visit_run_motor_for_duration(self, node: Block) -> RunMotorForDurationNode:
         """Constructs the AST representation of the RunMotorForDuration node.
         :param node: The Node representation.
         :return: The AST representation.
@@ -384,39 +305,34 @@ class Visitor:
         direction = self.visit_run_motor_for_duration_direction(node)
         value = self.visit_run_motor_for_duration_value(node)
         unit = self.visit_run_motor_for_duration_unit(node)
-        next_node = self.visit_node(node["next"])
-        return RunMotorForDurationNode(ports, direction, value, unit, next_node)
+        return RunMotorForDurationNode(ports, direction, value, unit, None)
 
-    def visit_run_motor_for_duration_port(self, node: dict) -> list:
+    def visit_run_motor_for_duration_port(self, node: Block) -> list:
         """Parses the ports that are being used by the RunMotorForDurationNode.
         :param node: The Node representation.
         :return: List of all the port names (single characters).
         """
-        port_specifier = node["inputs"]["PORT"][1]
+        port_specifier = node.inputs["PORT"]
         if isinstance(port_specifier, list):
             return VariableNode(port_specifier[1], port_specifier[2])
         else:
-            ports = self.cst[port_specifier]["fields"][
-                "field_" + self.cst[port_specifier]["opcode"]
-            ][0]
+            ports = self.blocks[port_specifier].menu
             return ListLiteralNode(list(ports))
 
-    def visit_run_motor_for_duration_direction(self, node: dict) -> TurnDirection:
+    def visit_run_motor_for_duration_direction(self, node: Block) -> TurnDirection:
         """Parses the direction that is being used by the RunMotorForDurationNode.
         :param node: The Node representation.
         :return: The direction that is being used.
         """
-        direction = self.cst[node["inputs"]["DIRECTION"][1]]["fields"][
-            "field_flippermotor_custom-icon-direction"
-        ][0]
+        direction = self.blocks[node.inputs["DIRECTION"]].menu
         return TurnDirection[direction.upper()]
 
-    def visit_run_motor_for_duration_unit(self, node: dict) -> Unit:
+    def visit_run_motor_for_duration_unit(self, node: Block) -> Unit:
         """Parses the unit that is being used by the RunMotorForDurationNode.
         :param node: The Node representation.
         :return: The unit that is being used.
         """
-        unit = node["fields"]["UNIT"][0]
+        unit = node.fields["UNIT"]
         return Unit[unit.upper()]
 
     def visit_input(self, val) -> Node:
@@ -440,24 +356,29 @@ class Visitor:
         else:
             return self.visit_node(val)
 
-    def visit_run_motor_for_duration_value(self, node: dict) -> Node:
+    def visit_run_motor_for_duration_value(self, node: Block) -> Node:
         """Parses the value that is being used by the RunMotorForDurationNode.
         :param node: The Node representation.
         :return: The node that that specifies the value that should be used. (Could be an entire subtree, in the case of an equation).
         """
-        return self.visit_input(node["inputs"]["VALUE"][1])
+        return self.visit_input(node.inputs["VALUE"])
 
-    def visit_operator(self, op: Operation, node: dict) -> ArithmeticalNode:
+    @visits("operator_add", Operation.PLUS)
+    @visits("operator_subtract", Operation.MINUS)
+    @visits("operator_divide", Operation.DIVIDE)
+    @visits("operator_multiply", Operation.MULTIPLY)
+    def visit_operator(self, node: Block, op: Operation) -> ArithmeticalNode:
         """Constructs the AST representation of the Arithmetics node.
-        :param op: The operation of the arithmetic block
         :param node: The Node representation.
+        :param op: The operation of the arithmetic block
         :return: The AST representation.
         """
-        left_hand = self.visit_input(node["inputs"]["NUM1"][1])
-        right_hand = self.visit_input(node["inputs"]["NUM2"][1])
+        left_hand = self.visit_input(node.inputs["NUM1"])
+        right_hand = self.visit_input(node.inputs["NUM2"])
         return ArithmeticalNode(op, left_hand, right_hand)
 
-    def visit_motor_go_to_position(self, node: dict) -> MotorGoToPositionNode:
+    @visits("flippermotor_motorGoDirectionToPosition")
+    def visit_motor_go_to_position(self, node: Block) -> MotorGoToPositionNode:
         """Constructs the AST representation of the MotorGoToPosition node.
         :param node: The Node representation.
         :return: The AST representation.
@@ -465,56 +386,53 @@ class Visitor:
         ports = self.visit_run_motor_for_duration_port(node)
         direction = self.visit_motor_go_to_position_direction(node)
         value = self.visit_motor_go_to_position_value(node)
-        next_node = self.visit_node(node["next"])
-        return MotorGoToPositionNode(ports, direction, value, next_node)
+        return MotorGoToPositionNode(ports, direction, value, None)
 
-    def visit_motor_go_to_position_direction(self, node: dict) -> GoDirection:
+    def visit_motor_go_to_position_direction(self, node: Block) -> GoDirection:
         """Parse the direction used by the MotorGoToPositionNode.
         :param node: The Node representation.
         :return: The direction that is being used.
         """
-        direction = node["fields"]["DIRECTION"][0]
+        direction = node.fields["DIRECTION"]
         return GoDirection[direction.upper()]
 
-    def visit_motor_go_to_position_value(self, node: dict) -> Node:
+    def visit_motor_go_to_position_value(self, node: Block) -> Node:
         """Parse the value used by the MotorGoToPositionNode.
         :param node: The Node representation.
         :return: The value that is being used.
         """
-        if len(node["inputs"]["POSITION"][1]) == 3:
-            return VariableNode(
-                node["inputs"]["POSITION"][1][1], node["inputs"]["POSITION"][1][2]
-            )
-        return self.visit_node(node["inputs"]["POSITION"][1])
+        if len(node.inputs["POSITION"]) == 3:
+            return VariableNode(node.inputs["POSITION"][1], node.inputs["POSITION"][2])
+        return self.visit_node(node.inputs["POSITION"])
 
-    def visit_motor_custom_angle(self, node: dict) -> NumericalNode:
+    @visits("flippermotor_custom-angle")
+    def visit_motor_custom_angle(self, node: Block) -> NumericalNode:
         """Parse the MotorCustomAngleNode.
         :param node: The Node representation.
         :return: The AST representation.
         """
-        return NumericalNode(
-            float(node["fields"]["field_flippermotor_custom-angle"][0])
-        )
+        return NumericalNode(float(node.menu))
 
-    def visit_start_motor(self, node: dict) -> StartMotorNode:
+    @visits("flippermotor_motorStartDirection")
+    def visit_start_motor(self, node: Block) -> StartMotorNode:
         """Constructs the AST representation of the StartMotor node.
         :param node: The Node representation.
         :return: The AST representation.
         """
         ports = self.visit_run_motor_for_duration_port(node)
         direction = self.visit_run_motor_for_duration_direction(node)
-        next_node = self.visit_node(node["next"])
-        return StartMotorNode(ports, direction, next_node)
+        return StartMotorNode(ports, direction, None)
 
-    def visit_stop_motor(self, node: dict) -> StopMotorNode:
+    @visits("flippermotor_motorStop")
+    def visit_stop_motor(self, node: Block) -> StopMotorNode:
         """Constructs the AST representation of the StopMotor node.
         :param node: The Node representation.
         :return: The AST representation.
         """
         ports = self.visit_run_motor_for_duration_port(node)
-        next_node = self.visit_node(node["next"])
-        return StopMotorNode(ports, next_node)
+        return StopMotorNode(ports, None)
 
+    @visits("flippermotor_motorSetSpeed")
     def visit_set_motor_speed(self, node) -> SetMotorSpeedNode:
         """Constructs the AST representation of the SetMotorSpeed node.
         :param node: The Node representation.
@@ -522,37 +440,36 @@ class Visitor:
         """
         ports = self.visit_run_motor_for_duration_port(node)
         value = self.visit_set_motor_speed_value(node)
-        next_node = self.visit_node(node["next"])
-        return SetMotorSpeedNode(ports, value, next_node)
+        return SetMotorSpeedNode(ports, value, None)
 
-    def visit_set_motor_speed_value(self, node: dict) -> Node:
+    def visit_set_motor_speed_value(self, node: Block) -> Node:
         """Parse the value used by the SetMotorSpeedNode.
         :param node: The Node representation.
         :return: The value that is being used.
         """
-        return self.visit_input(node["inputs"]["SPEED"][1])
+        return self.visit_input(node.inputs["SPEED"])
 
-    def visit_set_variable_to(self, node: dict) -> SetVariableToNode:
+    @visits("data_setvariableto")
+    def visit_set_variable_to(self, node: Block) -> SetVariableToNode:
         """Constructs the AST representation of the SetVariableTo node.
         :param node: The Node representation.
         :return: The AST representation.
         """
         # TODO: This needs to be fixed to also keep track of the variable ID and NAME
-        variable = node["fields"]["VARIABLE"][0]
+        variable = node.fields["VARIABLE"]
         value = self.visit_run_motor_for_duration_value(node)
-        next_node = self.visit_node(node["next"])
-        return SetVariableToNode(variable, value, next_node)
+        return SetVariableToNode(variable, value, None)
 
+    @visits("data_changevariableby")
     def visits_change_variable_by(self, node) -> ChangeVariableByNode:
         """Constructs the AST representation of the ChangeVariable node.
         :param node: The Node representation.
         :return: The AST representation.
         """
         # TODO: This needs to be fixed to also keep track of the variable ID and NAME
-        variable = node["fields"]["VARIABLE"][0]
+        variable = node.fields["VARIABLE"]
         value = self.visit_run_motor_for_duration_value(node)
-        next_node = self.visit_node(node["next"])
-        return ChangeVariableByNode(variable, value, next_node)
+        return ChangeVariableByNode(variable, value, None)
 
     def visit_add_to_list_value(self, node) -> Node:
         """Parses the value that is being used by the AddItemToList node.
@@ -560,27 +477,26 @@ class Visitor:
         :param node: The Node representation.
         :return: The node that that specifies the value that should be used. (Could be an entire subtree, in the case of an equation).
         """
-        if len(node["inputs"]["ITEM"][1]) == 3:
-            return VariableNode(
-                node["inputs"]["ITEM"][1][1], node["inputs"]["ITEM"][1][2]
-            )
+        if len(node.inputs["ITEM"]) == 3:
+            return VariableNode(node.inputs["ITEM"][1], node.inputs["ITEM"][2])
         else:
-            if isinstance(node["inputs"]["ITEM"][1], list):
-                return LiteralNode(node["inputs"]["ITEM"][1][1])
+            if isinstance(node.inputs["ITEM"], list):
+                return LiteralNode(node.inputs["ITEM"][1])
             else:
-                return self.visit_node(node["inputs"]["ITEM"][1])
+                return self.visit_node(node.inputs["ITEM"])
 
+    @visits("data_addtolist")
     def visit_add_to_list(self, node) -> AddItemToListNode:
         """Constructs the AST representation of the AddItemToList node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        variable = node["fields"]["LIST"][0]
+        variable = node.fields["LIST"]
         value = self.visit_add_to_list_value(node)
-        next_node = self.visit_node(node["next"])
-        return AddItemToListNode(variable, value, next_node)
+        return AddItemToListNode(variable, value, None)
 
+    @visits("flippermotor_absolutePosition")
     def visit_motor_position(self, node) -> MotorPositionNode:
         """Constructs the AST representation of the MotorPosition node.
 
@@ -588,9 +504,9 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        next_node = self.visit_node(node["next"])
-        return MotorPositionNode(port, next_node)
+        return MotorPositionNode(port, None)
 
+    @visits("flippermotor_speed")
     def visit_motor_speed(self, node) -> MotorSpeedNode:
         """Constructs the AST representation of the MotorSpeed node.
 
@@ -598,23 +514,21 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        next_node = self.visit_node(node["next"])
-        return MotorSpeedNode(port, next_node)
+        return MotorSpeedNode(port, None)
 
-    def visit_movement_ports(self, node: dict) -> Node:
+    def visit_movement_ports(self, node: Block) -> Node:
         """Parses the ports that are being used by the SetMovementMotorsNode.
         :param node: The Node representation.
         :return: List of all the port names (single characters).
         """
-        port_specifier = node["inputs"]["PAIR"][1]
+        port_specifier = node.inputs["PAIR"]
         if isinstance(port_specifier, list):
             return VariableNode(port_specifier[1], port_specifier[2])
         else:
-            ports = self.cst[port_specifier]["fields"][
-                "field_" + self.cst[port_specifier]["opcode"]
-            ][0]
+            ports = self.blocks[port_specifier].menu
             return ListLiteralNode(list(ports))
 
+    @visits("flippermove_setMovementPair")
     def visit_set_movement_motors(self, node) -> SetMovementMotorsNode:
         """Constructs the AST representation of the SetMovementMotors node.
 
@@ -622,27 +536,25 @@ class Visitor:
         :return: The AST representation.
         """
         ports = self.visit_movement_ports(node)
-        next_node = self.visit_node(node["next"])
-        return SetMovementMotorsNode(ports, next_node)
+        return SetMovementMotorsNode(ports, None)
 
-    def visit_move_for_duration_unit(self, node: dict) -> MovementUnit:
+    def visit_move_for_duration_unit(self, node: Block) -> MovementUnit:
         """Parses the unit that is being used by the MoveForDuration.
         :param node: The Node representation.
         :return: The unit that is being used.
         """
-        unit = node["fields"]["UNIT"][0]
+        unit = node.fields["UNIT"]
         return MovementUnit[unit.upper()]
 
-    def visit_move_for_duration_direction(self, node: dict) -> MovementDirection:
+    def visit_move_for_duration_direction(self, node: Block) -> MovementDirection:
         """Parses the direction that is being used by the MoveForDuration.
         :param node: The Node representation.
         :return: The direction that is being used.
         """
-        direction = self.cst[node["inputs"]["DIRECTION"][1]]["fields"][
-            "field_flippermove_custom-icon-direction"
-        ][0]
+        direction = self.blocks[node.inputs["DIRECTION"]].menu
         return MovementDirection[direction.upper()]
 
+    @visits("flippermove_move")
     def visit_move_for_duration(self, node) -> MoveForDurationNode:
         """Constructs the AST representation of the MoveForDuration node.
 
@@ -652,25 +564,24 @@ class Visitor:
         direction = self.visit_move_for_duration_direction(node)
         value = self.visit_run_motor_for_duration_value(node)
         unit = self.visit_move_for_duration_unit(node)
-        next_node = self.visit_node(node["next"])
-        return MoveForDurationNode(direction, value, unit, next_node)
+        return MoveForDurationNode(direction, value, unit, None)
 
-    def visit_move_with_steering_steering(self, node: dict) -> Node:
+    def visit_move_with_steering_steering(self, node: Block) -> Node:
         """Parses the value that is being used by the MoveWithSteeringNode.
         :param node: The Node representation.
         :return: The node that that specifies the value that should be used. (Could be an entire subtree, in the case of an equation).
         """
-        return self.visit_input(node["inputs"]["STEERING"][1])
+        return self.visit_input(node.inputs["STEERING"])
 
-    def visit_move_rotation_wheel(self, node: dict) -> Node:
+    @visits("flippermove_rotation-wheel")
+    def visit_move_rotation_wheel(self, node: Block) -> Node:
         """Parses the steering that is being used by the MoveWithSteeringNode.
         :param node: The Node representation.
         :return: A NumericalNode with the value of the steering.
         """
-        return NumericalNode(
-            float(node["fields"]["field_flippermove_rotation-wheel"][0])
-        )
+        return NumericalNode(float(node.menu))
 
+    @visits("flippermove_steer")
     def visit_move_with_steering(self, node) -> MoveWithSteeringNode:
         """Constructs the AST representation of the MoveWithSteering node.
 
@@ -680,9 +591,9 @@ class Visitor:
         steering = self.visit_move_with_steering_steering(node)
         value = self.visit_run_motor_for_duration_value(node)
         unit = self.visit_move_for_duration_unit(node)
-        next_node = self.visit_node(node["next"])
-        return MoveWithSteeringNode(steering, value, unit, next_node)
+        return MoveWithSteeringNode(steering, value, unit, None)
 
+    @visits("flippermove_startSteer")
     def visit_start_moving_with_steering(self, node) -> StartMovingWithSteering:
         """Constructs the AST representation of the StartMovingWithSteering node.
 
@@ -690,39 +601,39 @@ class Visitor:
         :return: The AST representation.
         """
         steering = self.visit_move_with_steering_steering(node)
-        next_node = self.visit_node(node["next"])
-        return StartMovingWithSteering(steering, next_node)
+        return StartMovingWithSteering(steering, None)
 
+    @visits("flippermove_stopMove")
     def visit_stop_moving(self, node) -> StopMovingNode:
         """Constructs the AST representation of the StopMoving node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        next_node = self.visit_node(node["next"])
-        return StopMovingNode(next_node)
+        return StopMovingNode(None)
 
+    @visits("flippermove_movementSpeed")
     def visit_set_movement_speed(self, node) -> SetMovementSpeedNode:
         """Constructs the AST representation of the SetMovementSpeed node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        value = self.visit_input(node["inputs"]["SPEED"][1])
-        next_node = self.visit_node(node["next"])
-        return SetMovementSpeedNode(value, next_node)
+        value = self.visit_input(node.inputs["SPEED"])
+        return SetMovementSpeedNode(value, None)
 
+    @visits("flippermove_setDistance")
     def visit_set_motor_rotation(self, node) -> SetMotorRotationNode:
         """Constructs the AST representation of the SetMotorRotation node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        value = self.visit_input(node["inputs"]["DISTANCE"][1])
-        unit = RotationUnit[node["fields"]["UNIT"][0].upper()]
-        next_node = self.visit_node(node["next"])
-        return SetMotorRotationNode(value, unit, next_node)
+        value = self.visit_input(node.inputs["DISTANCE"])
+        unit = RotationUnit[node.fields["UNIT"].upper()]
+        return SetMotorRotationNode(value, unit, None)
 
+    @visits("flipperdisplay_ledAnimation")
     def visit_start_animation(self, node) -> CommentNode:
         """If the best effort flag is true constructs a comment node that acts as a place holder and explains that animations are not supported yet.
         Else raise an NotImplementedError.
@@ -734,12 +645,12 @@ class Visitor:
                 "Animations are not supported yet, use the best_effort flag to generate code without animations."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the START ANIMATION block. Note: that animations are not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("flipperdisplay_ledAnimationUntilDone")
     def visit_play_animation_until_done(self, node) -> CommentNode:
         """If the best effort flag is true constructs a comment node that acts as a place holder and explains that animations are not supported yet.
         Else raise an NotImplementedError.
@@ -751,81 +662,78 @@ class Visitor:
                 "Animations are not supported yet, use the best_effort flag to generate code without animations."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the PLAY ANIMATION block. Note: that animations are not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("flipperdisplay_ledImageFor")
     def visit_turn_on_for_duration(self, node) -> TurnOnForDurationNode:
         """Constructs the AST representation of the TurnOnForDuration node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        image = self.cst[node["inputs"]["MATRIX"][1]]["fields"][
-            "field_flipperdisplay_custom-matrix"
-        ][0]
-        duration = self.visit_input(node["inputs"]["VALUE"][1])
-        next_node = self.visit_node(node["next"])
-        return TurnOnForDurationNode(image, duration, next_node)
+        image = self.blocks[node.inputs["MATRIX"]].menu
+        duration = self.visit_input(node.inputs["VALUE"])
+        return TurnOnForDurationNode(image, duration, None)
 
+    @visits("flipperdisplay_ledImage")
     def visit_turn_on(self, node) -> TurnOnNode:
         """Constructs the AST representation of the TurnOn node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        image = self.cst[node["inputs"]["MATRIX"][1]]["fields"][
-            "field_flipperdisplay_custom-matrix"
-        ][0]
-        next_node = self.visit_node(node["next"])
-        return TurnOnNode(image, next_node)
+        image = self.blocks[node.inputs["MATRIX"]].menu
+        return TurnOnNode(image, None)
 
+    @visits("flipperdisplay_ledText")
     def visit_write(self, node) -> WriteNode:
         """Constructs the AST representation of the Write node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        text = self.visit_input(node["inputs"]["TEXT"][1])
-        next_node = self.visit_node(node["next"])
-        return WriteNode(text, next_node)
+        text = self.visit_input(node.inputs["TEXT"])
+        return WriteNode(text, None)
 
+    @visits("flipperdisplay_displayOff")
     def visit_turn_off_pixels(self, node) -> TurnOffPixelsNode:
         """Constructs the AST representation of the TurnOffPixels node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        next_node = self.visit_node(node["next"])
-        return TurnOffPixelsNode(next_node)
+        return TurnOffPixelsNode(None)
 
+    @visits("flipperdisplay_ledSetBrightness")
     def visit_set_pixel_brightness(self, node) -> SetPixelBrightnessNode:
         """Constructs the AST representation of the SetPixelBrightness node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        brightness = self.visit_input(node["inputs"]["BRIGHTNESS"][1])
-        next_node = self.visit_node(node["next"])
-        return SetPixelBrightnessNode(brightness, next_node)
+        brightness = self.visit_input(node.inputs["BRIGHTNESS"])
+        return SetPixelBrightnessNode(brightness, None)
 
+    @visits("flipperdisplay_menu_ledMatrixIndex")
     def visit_set_pixel_matrix_index(self, node) -> NumericalNode:
-        return NumericalNode(float(node["fields"]["ledMatrixIndex"][0]))
+        return NumericalNode(float(node.fields["ledMatrixIndex"]))
 
+    @visits("flipperdisplay_ledOn")
     def visit_set_pixel(self, node) -> SetPixelNode:
         """Constructs the AST representation of the SetPixel node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        x = self.visit_input(node["inputs"]["X"][1])
-        y = self.visit_input(node["inputs"]["Y"][1])
-        brightness = self.visit_input(node["inputs"]["BRIGHTNESS"][1])
-        next_node = self.visit_node(node["next"])
-        return SetPixelNode(x, y, brightness, next_node)
+        x = self.visit_input(node.inputs["X"])
+        y = self.visit_input(node.inputs["Y"])
+        brightness = self.visit_input(node.inputs["BRIGHTNESS"])
+        return SetPixelNode(x, y, brightness, None)
 
+    @visits("flipperdisplay_ledRotateDirection")
     def visit_rotate_orientation(self, node) -> CommentNode:
         """If the best effort flag is true constructs a comment node that acts as a place holder and explains that rotations are not supported yet.
         Else raise an NotImplementedError.
@@ -837,12 +745,12 @@ class Visitor:
                 "Rotations are not supported yet, use the best_effort flag to generate code without rotations."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the ROTATE ORIENTATION block. Note: that rotations are not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("flipperdisplay_ledRotateOrientation")
     def visit_set_orientation(self, node) -> CommentNode:
         """If the best effort flag is true constructs a comment node that acts as a place holder and explains that rotations are not supported yet.
         Else raise an NotImplementedError.
@@ -854,12 +762,12 @@ class Visitor:
                 "Rotations are not supported yet, use the best_effort flag to generate code without rotations."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the SET ORIENTATION block. Note: that rotations are not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("flipperdisplay_centerButtonLight")
     def visit_set_center_button(self, node) -> SetCenterButtonNode:
         """Constructs the AST representation of the SetCenterButton node.
 
@@ -867,15 +775,11 @@ class Visitor:
         :return: The AST representation.
         """
 
-        color_index = int(
-            self.cst[node["inputs"]["COLOR"][1]]["fields"][
-                "field_flipperdisplay_color-selector-vertical"
-            ][0]
-        )
+        color_index = int(self.blocks[node.inputs["COLOR"]].menu)
         color = CenterButtonColor.at(color_index)
-        next_node = self.visit_node(node["next"])
-        return SetCenterButtonNode(color, next_node)
+        return SetCenterButtonNode(color, None)
 
+    @visits("flipperdisplay_ultrasonicLightUp")
     def visit_light_up_distance_sensor(self, node) -> LightUpDistanceSensorNode:
         """Constructs the AST representation of the LightUpDistanceSensor node.
 
@@ -883,12 +787,10 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        pattern = self.cst[node["inputs"]["VALUE"][1]]["fields"][
-            "field_flipperdisplay_led-selector"
-        ][0]
-        next_node = self.visit_node(node["next"])
-        return LightUpDistanceSensorNode(port, pattern, next_node)
+        pattern = self.blocks[node.inputs["VALUE"]].menu
+        return LightUpDistanceSensorNode(port, pattern, None)
 
+    @visits("data_deleteoflist")
     def visit_delete_item_in_list(self, node) -> DeleteItemInListNode:
         """Constructs the AST representation of the DeleteItemInList node.
 
@@ -896,105 +798,114 @@ class Visitor:
         :return: The AST representation.
         """
         # TODO: This needs to be fixed to also keep track of the variable ID and NAME
-        list = node["fields"]["LIST"][0]
-        index = self.visit_input(node["inputs"]["INDEX"][1])
-        next_node = self.visit_node(node["next"])
-        return DeleteItemInListNode(list, index, next_node)
+        list = node.fields["LIST"]
+        index = self.visit_input(node.inputs["INDEX"])
+        return DeleteItemInListNode(list, index, None)
 
+    @visits("data_deletealloflist")
     def visit_delete_all_items_in_list(self, node) -> DeleteAllItemsInListNode:
         """Constructs the AST representation of the DeleteAllItemsInList node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
-        next_node = self.visit_node(node["next"])
-        return DeleteAllItemsInListNode(list, next_node)
+        list = node.fields["LIST"]
+        return DeleteAllItemsInListNode(list, None)
 
+    @visits("data_lengthoflist")
     def visit_length_of_list(self, node) -> LengthOfListNode:
         """Constructs the AST representation of the LengthOfList node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
+        list = node.fields["LIST"]
         return LengthOfListNode(list)
 
+    @visits("data_itemoflist")
     def visit_item_at_index(self, node) -> ItemAtIndexNode:
         """Constructs the AST representation of the ItemAtIndex node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
-        index = self.visit_input(node["inputs"]["INDEX"][1])
+        list = node.fields["LIST"]
+        index = self.visit_input(node.inputs["INDEX"])
         return ItemAtIndexNode(list, index)
 
+    @visits("data_insertatlist")
     def visit_insert_at_index(self, node) -> InsertItemAtIndexNode:
         """Constructs the AST representation of the InsertItemAtIndex node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
-        item = self.visit_input(node["inputs"]["ITEM"][1])
-        index = self.visit_input(node["inputs"]["INDEX"][1])
-        next_node = self.visit_node(node["next"])
-        return InsertItemAtIndexNode(list, item, index, next_node)
+        list = node.fields["LIST"]
+        item = self.visit_input(node.inputs["ITEM"])
+        index = self.visit_input(node.inputs["INDEX"])
+        return InsertItemAtIndexNode(list, item, index, None)
 
+    @visits("data_replaceitemoflist")
     def visit_replace_item_at_index(self, node) -> ReplaceItemAtIndexNode:
         """Constructs the AST representation of the ReplaceItemAtIndex node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
-        index = self.visit_input(node["inputs"]["INDEX"][1])
-        item = self.visit_input(node["inputs"]["ITEM"][1])
-        next_node = self.visit_node(node["next"])
-        return ReplaceItemAtIndexNode(list, index, item, next_node)
+        list = node.fields["LIST"]
+        index = self.visit_input(node.inputs["INDEX"])
+        item = self.visit_input(node.inputs["ITEM"])
+        return ReplaceItemAtIndexNode(list, index, item, None)
 
+    @visits("data_itemnumoflist")
     def visit_index_of_item(self, node) -> IndexOfItemNode:
         """Constructs the AST representation of the IndexOfItem node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
-        item = self.visit_input(node["inputs"]["ITEM"][1])
+        list = node.fields["LIST"]
+        item = self.visit_input(node.inputs["ITEM"])
         return IndexOfItemNode(list, item)
 
+    @visits("control_if")
     def visit_if_then(self, node) -> IfThenNode:
         """Constructs the AST representation of the IfThen node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        condition = self.visit_input(node["inputs"]["CONDITION"][1])
-        body = self.visit_node(node["inputs"]["SUBSTACK"][1])
-        next_node = self.visit_node(node["next"])
-        return IfThenNode(condition, body, next_node)
+        condition = self.visit_input(node.inputs["CONDITION"])
+        body = self.visit_node(node.inputs["SUBSTACK"])
+        return IfThenNode(condition, body, None)
 
+    @visits("data_listcontainsitem")
     def visit_list_contains_item(self, node) -> ListContainsNode:
         """Constructs the AST representation of the ListContainsItem node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        list = node["fields"]["LIST"][0]
-        item = self.visit_input(node["inputs"]["ITEM"][1])
+        list = node.fields["LIST"]
+        item = self.visit_input(node.inputs["ITEM"])
         return ListContainsNode(list, item)
 
+    @visits("operator_random")
     def visit_pick_random(self, node) -> PickRandomNumberNode:
         """Constructs the AST representation of the PickRandom node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        low = self.visit_input(node["inputs"]["FROM"][1])
-        high = self.visit_input(node["inputs"]["TO"][1])
+        low = self.visit_input(node.inputs["FROM"])
+        high = self.visit_input(node.inputs["TO"])
         return PickRandomNumberNode(low, high)
 
+    @visits("operator_lt", ComparisonOperator.LESS)
+    @visits("operator_equals", ComparisonOperator.EQUAL)
+    @visits("operator_gt", ComparisonOperator.GREATER)
+    @visits("operator_and", ComparisonOperator.AND)
+    @visits("operator_or", ComparisonOperator.OR)
     def visit_comparison(self, node, operator) -> ComparisonNode:
         """Constructs the AST representation of the Comparison node.
 
@@ -1002,88 +913,97 @@ class Visitor:
         :param operator: The operator of the comparison.
         :return: The AST representation.
         """
-        left = self.visit_input(node["inputs"]["OPERAND1"][1])
-        right = self.visit_input(node["inputs"]["OPERAND2"][1])
+        left = self.visit_input(node.inputs["OPERAND1"])
+        right = self.visit_input(node.inputs["OPERAND2"])
         return ComparisonNode(operator, left, right)
 
+    @visits("operator_not")
     def visit_not_node(self, node) -> NotNode:
         """Constructs the AST representation of the Not node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        operand = self.visit_input(node["inputs"]["OPERAND"][1])
+        operand = self.visit_input(node.inputs["OPERAND"])
         return NotNode(operand)
 
+    @visits("flipperoperator_isInBetween")
     def visit_is_between(self, node) -> IsBetweenNode:
         """Constructs the AST representation of the IsBetween node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        value = self.visit_input(node["inputs"]["VALUE"][1])
-        low = self.visit_input(node["inputs"]["LOW"][1])
-        high = self.visit_input(node["inputs"]["HIGH"][1])
+        value = self.visit_input(node.inputs["VALUE"])
+        low = self.visit_input(node.inputs["LOW"])
+        high = self.visit_input(node.inputs["HIGH"])
         return IsBetweenNode(value, low, high)
 
+    @visits("operator_join")
     def visit_join_strings(self, node) -> JoinStringsNode:
         """Constructs the AST representation of the JoinStrings node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        string1 = self.visit_input(node["inputs"]["STRING1"][1])
-        string2 = self.visit_input(node["inputs"]["STRING2"][1])
+        string1 = self.visit_input(node.inputs["STRING1"])
+        string2 = self.visit_input(node.inputs["STRING2"])
         return JoinStringsNode(string1, string2)
 
+    @visits("operator_letter_of")
     def visit_letter_of_string(self, node) -> LetterOfStringNode:
         """Constructs the AST representation of the LetterOfString node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        index = self.visit_input(node["inputs"]["LETTER"][1])
-        string = self.visit_input(node["inputs"]["STRING"][1])
+        index = self.visit_input(node.inputs["LETTER"])
+        string = self.visit_input(node.inputs["STRING"])
         return LetterOfStringNode(index, string)
 
+    @visits("operator_length")
     def visit_length_of_string(self, node) -> LengthOfStringNode:
         """Constructs the AST representation of the LengthOfString node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        string = self.visit_input(node["inputs"]["STRING"][1])
+        string = self.visit_input(node.inputs["STRING"])
         return LengthOfStringNode(string)
 
+    @visits("operator_contains")
     def visit_string_contains(self, node) -> StringContainsNode:
         """Constructs the AST representation of the StringContains node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        string1 = self.visit_input(node["inputs"]["STRING1"][1])
-        string2 = self.visit_input(node["inputs"]["STRING2"][1])
+        string1 = self.visit_input(node.inputs["STRING1"])
+        string2 = self.visit_input(node.inputs["STRING2"])
         return StringContainsNode(string1, string2)
 
+    @visits("operator_mod")
     def visit_mod(self, node) -> ModNode:
         """Constructs the AST representation of the Mod node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        dividend = self.visit_input(node["inputs"]["NUM1"][1])
-        divisor = self.visit_input(node["inputs"]["NUM2"][1])
+        dividend = self.visit_input(node.inputs["NUM1"])
+        divisor = self.visit_input(node.inputs["NUM2"])
         return ModNode(dividend, divisor)
 
+    @visits("operator_round")
     def visit_round(self, node) -> RoundNode:
         """Constructs the AST representation of the Round node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        num = self.visit_input(node["inputs"]["NUM"][1])
+        num = self.visit_input(node.inputs["NUM"])
         return RoundNode(num)
 
+    @visits("operator_mathop")
     def visit_unary_math_function(self, node) -> UnaryMathFunctionNode:
         """Constructs the AST representation of the MathFunction node.
 
@@ -1091,10 +1011,11 @@ class Visitor:
         :param function: The function of the UnaryMathFunction.
         :return: The AST representation.
         """
-        function = UnaryFunction.parse(node["fields"]["OPERATOR"][0])
-        num = self.visit_input(node["inputs"]["NUM"][1])
+        function = UnaryFunction.parse(node.fields["OPERATOR"])
+        num = self.visit_input(node.inputs["NUM"])
         return UnaryMathFunctionNode(function, num)
 
+    @visits("flipperoperator_mathFunc2Params")
     def visit_binary_math_function(self, node) -> BinaryMathFunctionNode:
         """Constructs the AST representation of the MathFunction node.
 
@@ -1102,117 +1023,119 @@ class Visitor:
         :param function: The function of the BinaryMathFunction.
         :return: The AST representation.
         """
-        function = BinaryFunction.parse(node["fields"]["TYPE"][0])
-        num1 = self.visit_input(node["inputs"]["ARG1"][1])
-        num2 = self.visit_input(node["inputs"]["ARG2"][1])
+        function = BinaryFunction.parse(node.fields["TYPE"])
+        num1 = self.visit_input(node.inputs["ARG1"])
+        num2 = self.visit_input(node.inputs["ARG2"])
         return BinaryMathFunctionNode(function, num1, num2)
 
+    @visits("control_wait")
     def visit_for_seconds(self, node) -> WaitForSecondsNode:
         """Constructs the AST representation of the WaitForSeconds node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        seconds = self.visit_input(node["inputs"]["DURATION"][1])
-        next_node = self.visit_node(node["next"])
-        return WaitForSecondsNode(seconds, next_node)
+        seconds = self.visit_input(node.inputs["DURATION"])
+        return WaitForSecondsNode(seconds, None)
 
+    @visits("control_wait_until")
     def visit_wait_until(self, node) -> WaitUntilNode:
         """Constructs the AST representation of the WaitUntil node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        condition = self.visit_input(node["inputs"]["CONDITION"][1])
-        next_node = self.visit_node(node["next"])
-        return WaitUntilNode(condition, next_node)
+        condition = self.visit_input(node.inputs["CONDITION"])
+        return WaitUntilNode(condition, None)
 
+    @visits("control_repeat")
     def visit_repeat_loop(self, node) -> RepeatLoopNode:
         """Constructs the AST representation of the RepeatLoop node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        times = self.visit_input(node["inputs"]["TIMES"][1])
-        body = self.visit_node(node["inputs"]["SUBSTACK"][1])
-        next_node = self.visit_node(node["next"])
-        return RepeatLoopNode(times, body, next_node)
+        times = self.visit_input(node.inputs["TIMES"])
+        body = self.visit_node(node.inputs["SUBSTACK"])
+        return RepeatLoopNode(times, body, None)
 
+    @visits("control_forever")
     def visit_forever_loop(self, node) -> ForeverLoopNode:
         """Constructs the AST representation of the ForeverLoop node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        body = self.visit_node(node["inputs"]["SUBSTACK"][1])
-        next_node = self.visit_node(node["next"])
-        return ForeverLoopNode(body, next_node)
+        body = self.visit_node(node.inputs["SUBSTACK"])
+        return ForeverLoopNode(body, None)
 
+    @visits("control_if_else")
     def visit_if_else(self, node) -> IfElseNode:
         """Constructs the AST representation of the IfElse node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        condition = self.visit_input(node["inputs"]["CONDITION"][1])
-        body = self.visit_node(node["inputs"]["SUBSTACK"][1])
-        else_body = self.visit_node(node["inputs"]["SUBSTACK2"][1])
-        next_node = self.visit_node(node["next"])
-        return IfElseNode(condition, body, else_body, next_node)
+        condition = self.visit_input(node.inputs["CONDITION"])
+        body = self.visit_node(node.inputs["SUBSTACK"])
+        else_body = self.visit_node(node.inputs["SUBSTACK2"])
+        return IfElseNode(condition, body, else_body, None)
 
+    @visits("control_repeat_until")
     def visit_repeat_until(self, node) -> RepeatUntilNode:
         """Constructs the AST representation of the RepeatUntil node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        condition = self.visit_input(node["inputs"]["CONDITION"][1])
-        body = self.visit_node(node["inputs"]["SUBSTACK"][1])
-        next_node = self.visit_node(node["next"])
-        return RepeatUntilNode(condition, body, next_node)
+        condition = self.visit_input(node.inputs["CONDITION"])
+        body = self.visit_node(node.inputs["SUBSTACK"])
+        return RepeatUntilNode(condition, body, None)
 
+    @visits("flippercontrol_fork")
     def visit_do_this_and_this(self, node) -> CommentNode:
         if not self.best_effort:
             raise NotImplementedError(
                 "Parallelism is not supported, use the best_effort flag to generate code without rotations."
             )
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the DO THIS AND THIS block. Note: that parallelism is not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("flippercontrol_stopOtherStacks")
     def visit_stop_other_stacks(self, node) -> CommentNode:
         if not self.best_effort:
             raise NotImplementedError(
                 "Parallelism is not supported, use the best_effort flag to generate code without rotations."
             )
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the STOP OTHER STACKS block. Note: that parallelism is not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
-    def visit_stop(self, node) -> CommentNode:
+    @visits("flippercontrol_stop")
+    def visit_stop(self, node) -> StopNode:
         if not self.best_effort:
             raise NotImplementedError(
                 "Parallelism is not supported, use the best_effort flag to generate code without rotations."
             )
-        next_node = self.visit_node(node["next"])
-        return CommentNode(
+        return StopNode(
             "# Placeholder for the STOP block. Note: that parallelism is not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("flippersensors_ismotion")
     def visit_hub_is_shaken(self, node) -> HubInteractionNode:
         """Constructs the AST representation of the HubInteraction node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        interaction = HubInteraction[node["fields"]["MOTION"][0].upper()]
+        interaction = HubInteraction[node.fields["MOTION"].upper()]
         return HubInteractionNode(interaction)
 
+    @visits("flippersensors_isColor")
     def visit_is_color(self, node) -> IsColorNode:
         """Constructs the AST representation of the IsColor node.
 
@@ -1220,14 +1143,11 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        color_index = int(
-            self.cst[node["inputs"]["VALUE"][1]]["fields"][
-                "field_flippersensors_color-selector"
-            ][0]
-        )
+        color_index = int(self.blocks[node.inputs["VALUE"]].menu)
         color = SensorColor.at(color_index)
         return IsColorNode(port, color)
 
+    @visits("flippersensors_color")
     def visit_color(self, node) -> ColorNode:
         """Constructs the AST representation of the Color node.
 
@@ -1237,6 +1157,7 @@ class Visitor:
         port = self.visit_run_motor_for_duration_port(node)
         return ColorNode(port)
 
+    @visits("flippersensors_isReflectivity")
     def visit_is_reflectivity(self, node) -> IsReflectionNode:
         """Constructs the AST representation of the IsReflection node.
 
@@ -1244,10 +1165,11 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        comparator = ReflectionComparator.parse(node["fields"]["COMPARATOR"][0])
-        value = self.visit_input(node["inputs"]["VALUE"][1])
+        comparator = ReflectionComparator.parse(node.fields["COMPARATOR"])
+        value = self.visit_input(node.inputs["VALUE"])
         return IsReflectionNode(port, comparator, value)
 
+    @visits("flippersensors_reflectivity")
     def visit_reflectivity(self, node) -> ReflectedLightNode:
         """Constructs the AST representation of the ReflectedLight node.
 
@@ -1257,6 +1179,7 @@ class Visitor:
         port = self.visit_run_motor_for_duration_port(node)
         return ReflectedLightNode(port)
 
+    @visits("flippersensors_isDistance")
     def visit_is_distance(self, node) -> IsDistanceNode:
         """Constructs the AST representation of the IsDistance node.
 
@@ -1264,11 +1187,12 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        comparator = DistanceComparator.parse(node["fields"]["COMPARATOR"][0])
-        value = self.visit_input(node["inputs"]["VALUE"][1])
-        unit = DistanceUnit.parse(node["fields"]["UNIT"][0])
+        comparator = DistanceComparator.parse(node.fields["COMPARATOR"])
+        value = self.visit_input(node.inputs["VALUE"])
+        unit = DistanceUnit.parse(node.fields["UNIT"])
         return IsDistanceNode(port, comparator, value, unit)
 
+    @visits("flippersensors_distance")
     def visit_distance(self, node) -> DistanceNode:
         """Constructs the AST representation of the Distance node.
 
@@ -1276,9 +1200,10 @@ class Visitor:
         :return: The AST representation.
         """
         port = self.visit_run_motor_for_duration_port(node)
-        unit = DistanceUnit.parse(node["fields"]["UNIT"][0])
+        unit = DistanceUnit.parse(node.fields["UNIT"])
         return DistanceNode(port, unit)
 
+    @visits("flippersensors_motion")
     def visit_gesture(self, node) -> GestureNode:
         """Constructs the AST representation of the Gesture node.
 
@@ -1287,15 +1212,17 @@ class Visitor:
         """
         return GestureNode()
 
+    @visits("flippersensors_isorientation")
     def visit_is_orientation(self, node) -> IsOrientationNode:
         """Constructs the AST representation of the IsOrientation node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        comparator = HubOrientation[node["fields"]["ORIENTATION"][0].upper()]
+        comparator = HubOrientation[node.fields["ORIENTATION"].upper()]
         return IsOrientationNode(comparator)
 
+    @visits("flippersensors_orientation")
     def visit_orientation(self, node) -> OrientationNode:
         """Constructs the AST representation of the Orientation node.
 
@@ -1304,34 +1231,37 @@ class Visitor:
         """
         return OrientationNode()
 
+    @visits("flippersensors_resetYaw")
     def visit_reset_yaw(self, node) -> SetYawAngleNode:
         """Constructs the AST representation of the ResetYaw node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        next_node = self.visit_node(node["next"])
-        return SetYawAngleNode(next_node)
+        return SetYawAngleNode(None)
 
+    @visits("flippersensors_buttonIsPressed")
     def visit_is_button_pressed(self, node) -> IsButtonPressedNode:
         """Constructs the AST representation of the IsButtonPressed node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        button = ButtonType[node["fields"]["BUTTON"][0].upper()]
-        action = ButtonAction[node["fields"]["EVENT"][0].upper()]
+        button = ButtonType[node.fields["BUTTON"].upper()]
+        action = ButtonAction[node.fields["EVENT"].upper()]
         return IsButtonPressedNode(button, action)
 
+    @visits("flippersensors_orientationAxis")
     def visit_hub_angle(self, node) -> HubAngleNode:
         """Constructs the AST representation of the HubAngle node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        unit = AngleUnit[node["fields"]["AXIS"][0].upper()]
+        unit = AngleUnit[node.fields["AXIS"].upper()]
         return HubAngleNode(unit)
 
+    @visits("flippersensors_timer")
     def visit_hub_timer(self, node) -> TimerNode:
         """Constructs the AST representation of the HubTimer node.
 
@@ -1340,24 +1270,26 @@ class Visitor:
         """
         return TimerNode()
 
+    @visits("flippersensors_resetTimer")
     def visit_hub_reset_timer(self, node) -> ResetTimerNode:
         """Constructs the AST representation of the HubResetTimer node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        next_node = self.visit_node(node["next"])
-        return ResetTimerNode(next_node)
+        return ResetTimerNode(None)
 
+    @visits("sensing_keypressed")
     def visit_key_pressed(self, node) -> IsKeyPressedNode:
         """Constructs the AST representation of the IsKeyPressed node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        key = self.cst[node["inputs"]["KEY_OPTION"][1]]["fields"]["KEY_OPTION"][0]
+        key = self.blocks[node.inputs["KEY_OPTION"]].fields["KEY_OPTION"]
         return IsKeyPressedNode(key)
 
+    @visits("flippersound_playSoundUntilDone")
     def visit_play_sound(self, node) -> PlaySoundUntilDoneNode:
         """Constructs the AST representation of the PlaySound node.
 
@@ -1365,86 +1297,81 @@ class Visitor:
         :return: The AST representation.
         """
 
-        sound_json = self.cst[node["inputs"]["SOUND"][1]]["fields"][
-            "field_flippersound_sound-selector"
-        ][0]
+        sound_json = self.blocks[node.inputs["SOUND"]].menu
         sound_name = loads(sound_json)["name"]
-        next_node = self.visit_node(node["next"])
-        return PlaySoundUntilDoneNode(sound_name, next_node)
+        return PlaySoundUntilDoneNode(sound_name, None)
 
+    @visits("flippersound_playSound")
     def visit_start_sound(self, node) -> StartSoundNode:
         """Constructs the AST representation of the StartSound node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        sound_json = self.cst[node["inputs"]["SOUND"][1]]["fields"][
-            "field_flippersound_sound-selector"
-        ][0]
+        sound_json = self.blocks[node.inputs["SOUND"]].menu
         sound_name = loads(sound_json)["name"]
-        next_node = self.visit_node(node["next"])
-        return StartSoundNode(sound_name, next_node)
+        return StartSoundNode(sound_name, None)
 
+    @visits("flippersound_custom-piano")
     def visit_piano_node(self, node) -> NumericalNode:
         """Constructs the AST representation of the Piano node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        return NumericalNode(
-            float(node["fields"]["field_flippersound_custom-piano"][0])
-        )
+        return NumericalNode(float(node.menu))
 
+    @visits("flippersound_beepForTime")
     def visit_play_beep(self, node) -> PlayBeepNode:
         """Constructs the AST representation of the PlayBeep node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        pitch = self.visit_input(node["inputs"]["NOTE"][1])
-        duration = self.visit_input(node["inputs"]["DURATION"][1])
-        next_node = self.visit_node(node["next"])
-        return PlayBeepNode(pitch, duration, next_node)
+        pitch = self.visit_input(node.inputs["NOTE"])
+        duration = self.visit_input(node.inputs["DURATION"])
+        return PlayBeepNode(pitch, duration, None)
 
+    @visits("flippersound_beep")
     def visit_start_beep(self, node) -> StartBeepNode:
         """Constructs the AST representation of the StartBeep node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        pitch = self.visit_input(node["inputs"]["NOTE"][1])
-        next_node = self.visit_node(node["next"])
-        return StartBeepNode(pitch, next_node)
+        pitch = self.visit_input(node.inputs["NOTE"])
+        return StartBeepNode(pitch, None)
 
+    @visits("flippersound_stopSound")
     def visit_stop_sound(self, node) -> StopBeepNode:
         """Constructs the AST representation of the StopSound node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        next_node = self.visit_node(node["next"])
-        return StopBeepNode(next_node)
+        return StopBeepNode(None)
 
+    @visits("sound_setvolumeto")
     def visit_set_volume(self, node) -> SetVolumeNode:
         """Constructs the AST representation of the SetVolume node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        volume = self.visit_input(node["inputs"]["VOLUME"][1])
-        next_node = self.visit_node(node["next"])
-        return SetVolumeNode(volume, next_node)
+        volume = self.visit_input(node.inputs["VOLUME"])
+        return SetVolumeNode(volume, None)
 
+    @visits("sound_changevolumeby")
     def visit_change_volume(self, node) -> ChangeVolumeNode:
         """Constructs the AST representation of the ChangeVolume node.
 
         :param node: The Node representation.
         :return: The AST representation.
         """
-        volume = self.visit_input(node["inputs"]["VOLUME"][1])
-        next_node = self.visit_node(node["next"])
-        return ChangeVolumeNode(volume, next_node)
+        volume = self.visit_input(node.inputs["VOLUME"])
+        return ChangeVolumeNode(volume, None)
 
+    @visits("sound_volume")
     def visit_volume(self, node) -> VolumeNode:
         """Constructs the AST representation of the Volume node.
 
@@ -1453,38 +1380,38 @@ class Visitor:
         """
         return VolumeNode()
 
+    @visits("sound_changeeffectby")
     def visit_change_effect(self, node) -> CommentNode:
         if not self.best_effort:
             raise NotImplementedError(
                 "Pitch effects are not supported, use the best_effort flag to generate code without pitch effects."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the CHANGE PITCH block. Note: that pitch effects are not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("sound_seteffectto")
     def visit_set_effect(self, node) -> CommentNode:
         if not self.best_effort:
             raise NotImplementedError(
                 "Pitch effects are not supported, use the best_effort flag to generate code without pitch effects."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the SET PITCH block. Note: that pitch effects are not supported in Python at the moment.",
-            next_node,
+            None,
         )
 
+    @visits("sound_cleareffects")
     def visit_clear_effects(self, node) -> CommentNode:
         if not self.best_effort:
             raise NotImplementedError(
                 "Pitch effects are not supported, use the best_effort flag to generate code without pitch effects."
             )
 
-        next_node = self.visit_node(node["next"])
         return CommentNode(
             "# Placeholder for the CLEAR PITCH block. Note: that pitch effects are not supported in Python at the moment.",
-            next_node,
+            None,
         )
@@ -1,5 +1,15 @@
 # Test to check that the AST is generated correctly.
 
+import re
+import sys
+
+from pytest import raises
+
+from src.__main__ import run
+from src.abstract_syntax_tree import CommentNode
+from src.abstract_syntax_tree.movement import StopMovingNode
+from src.bench.synthetic import ProjectGenerator
+from src.compiler import compile_lms
 from src.json_parser import extract_json, filter_json
 from src.visitor import Visitor
 
@@ -20,6 +30,15 @@ def helper(filename: str, directory: str = ".") -> str:
     return abstract_syntax_tree.tree_representation()
 
 
+def helper_with(visitor_class, filename: str, directory: str = ".") -> str:
+    """Same as helper, but uses an instance of visitor_class to generate the AST."""
+    concrete_syntax_tree = filter_json(
+        extract_json(f"tests/inputs/{directory}/{filename}/{filename}.lms")
+    )
+    abstract_syntax_tree = visitor_class(best_effort=True).visit(concrete_syntax_tree)
+    return abstract_syntax_tree.tree_representation()
+
+
 # ---------- Base ----------
 def test_ast_empty():
     assert (
@@ -4506,3 +4525,170 @@ def test_ast_list_contains_variable():
 5 -> 8
 8 -> 9}"""
     )
+
+
+# ---------- Dispatch ----------
+def test_ast_dispatch_table_is_built_once():
+    assert Visitor.dispatch_table() is Visitor.dispatch_table()
+    assert len(Visitor.dispatch_table()) == 99
+
+
+def test_ast_dispatch_unknown_opcode():
+    cst = filter_json(
+        extract_json("tests/inputs/Events/when_program_starts/when_program_starts.lms")
+    )
+    hat_id, hat = next(iter(cst["blocks"].items()))
+    hat["next"] = "unknown"
+    cst["blocks"]["unknown"] = {
+        "opcode": "flipperdisplay_unknownBlock",
+        "next": None,
+        "parent": hat_id,
+        "inputs": {},
+        "fields": {},
+        "shadow": False,
+        "topLevel": False,
+    }
+    with raises(NotImplementedError, match="flipperdisplay_unknownBlock"):
+        Visitor(best_effort=True).visit(cst)
+
+
+def test_ast_dispatch_register():
+    class PluginVisitor(Visitor):
+        pass
+
+    def visit_when_color(visitor, node, color):
+        return CommentNode(f"# When color {color}", None)
+
+    cst = filter_json(
+        extract_json("tests/inputs/Events/when_program_starts/when_program_starts.lms")
+    )
+    next(iter(cst["blocks"].values()))["opcode"] = "flipperevents_whenColor"
+
+    PluginVisitor.register("flipperevents_whenColor", visit_when_color, "red")
+    assert "flipperevents_whenColor" not in Visitor.dispatch_table()
+    assert (
+        PluginVisitor(best_effort=True).visit(cst).tree_representation()
+        == """digraph {rankdir="TB"
+0 [label="CommentNode('# When color red')"]
+}"""
+    )
+
+
+def test_ast_dispatch_subclass_override():
+    class PluginVisitor(Visitor):
+        def visit_when_program_starts(self, node):
+            return CommentNode("# Start", None)
+
+    assert (
+        helper_with(PluginVisitor, "when_program_starts", "Events")
+        == """digraph {rankdir="TB"
+0 [label="CommentNode('# Start')"]
+}"""
+    )
+
+
+# ---------- Long stacks ----------
+def test_ast_long_stack():
+    # Much longer than the recursion limit, to check the stack is not visited recursively
+    length = 5 * sys.getrecursionlimit()
+    blocks = {
+        "hat": {
+            "opcode": "flipperevents_whenProgramStarts",
+            "next": "0",
+            "parent": None,
+            "inputs": {},
+            "fields": {},
+            "shadow": False,
+            "topLevel": True,
+            "x": 0,
+            "y": 0,
+        }
+    }
+    for i in range(length):
+        blocks[str(i)] = {
+            "opcode": "flippermove_stopMove",
+            "next": str(i + 1) if i + 1 < length else None,
+            "parent": str(i - 1) if i else "hat",
+            "inputs": {},
+            "fields": {},
+            "shadow": False,
+            "topLevel": False,
+        }
+
+    abstract_syntax_tree = Visitor(best_effort=True).visit({"blocks": blocks})
+
+    node = abstract_syntax_tree.hat_nodes[0].next
+    count = 0
+    while node:
+        assert isinstance(node, StopMovingNode)
+        node = node.next
+        count += 1
+    assert count == length
+
+
+def test_ast_nodes():
+    concrete_syntax_tree = filter_json(
+        extract_json("tests/inputs/Control/if_then_else/if_then_else.lms")
+    )
+    abstract_syntax_tree = Visitor(best_effort=True).visit(concrete_syntax_tree)
+    # Same nodes in the same order as in the representation
+    assert [str(node) for node in abstract_syntax_tree.nodes()] == re.findall(
+        r'^\d+ \[label="(.*)"\]$', abstract_syntax_tree.tree_representation(), re.M
+    )
+
+
+def test_ast_write_tree_representation(tmp_path):
+    concrete_syntax_tree = filter_json(
+        extract_json("tests/inputs/Control/if_then_else/if_then_else.lms")
+    )
+    abstract_syntax_tree = Visitor(best_effort=True).visit(concrete_syntax_tree)
+    representation = abstract_syntax_tree.tree_representation()
+
+    file_name = str(tmp_path / "if_then_else")
+    assert (
+        abstract_syntax_tree.tree_representation(file_name)
+        == f"The representation is written to {file_name}.gv"
+    )
+    with open(file_name + ".gv") as file:
+        assert file.read() == representation
+
+    # The command line streams the representation to --ast-filename
+    ast_filename = str(tmp_path / "cli.gv")
+    run(
+        [
+            "tests/inputs/Control/if_then_else/if_then_else.lms",
+            "--ast",
+            "--ast-filename",
+            ast_filename,
+        ]
+    )
+    with open(ast_filename) as file:
+        assert file.read() == representation
+
+
+def test_ast_print_tree_representation(capsys, monkeypatch):
+    filename = "tests/inputs/Control/if_then_else/if_then_else.lms"
+    representation = compile_lms(filename, ast=True).ast_representation
+
+    # Without --ast-filename the representation is streamed to stdout, it is never built as a whole
+    def build(self, file_name=None):
+        raise AssertionError("The representation should be streamed")
+
+    monkeypatch.setattr("src.abstract_syntax_tree.AST.tree_representation", build)
+    run([filename, "--ast"])
+    assert (
+        f"---------- Begin: AST Representation ----------\n{representation}\n---------- End: AST Representation ----------\n"
+        in capsys.readouterr().out
+    )
+
+
+def test_ast_write_tree_representation_long_stack(monkeypatch):
+    # Stacks that are much longer than the recursion limit can still be represented
+    project = ProjectGenerator(5000, depth=0).generate()
+    abstract_syntax_tree = Visitor(best_effort=False).visit(filter_json(project))
+    # Spool the connections to disk almost right away
+    monkeypatch.setattr("src.abstract_syntax_tree.SPOOL_THRESHOLD", 64)
+    representation = abstract_syntax_tree.tree_representation()
+    assert representation.count(" [label=") == len(list(abstract_syntax_tree.nodes()))
+    assert representation.count(" -> ") == representation.count(" [label=") - 1
+    assert representation.endswith("}")
@@ -0,0 +1,64 @@
+# Tests to check that directories of .lms files are compiled correctly in batch.
+import shutil
+
+from src.batch import compile_all, find_inputs
+from src.code_generator import CodeGenerator
+from src.json_parser import extract_json, filter_json
+from src.visitor import Visitor
+
+
+def copy_inputs(directory: str, destination) -> str:
+    """Copies a directory of test inputs so the outputs can be written next to them.
+
+    :param directory: The folder in tests/inputs that should be copied.
+    :param destination: The folder to copy to.
+    :return: The path of the copy.
+    """
+    return shutil.copytree(f"tests/inputs/{directory}", f"{destination}/{directory}")
+
+
+def expected_code(filename: str) -> str:
+    abstract_syntax_tree = Visitor(True).visit(filter_json(extract_json(filename)))
+    return CodeGenerator().generate(abstract_syntax_tree)
+
+
+def test_batch_find_inputs(tmp_path):
+    directory = copy_inputs("Events", tmp_path)
+    assert find_inputs(directory) == [
+        f"{directory}/when_program_starts/when_program_starts.lms"
+    ]
+
+
+def test_batch_sequential(tmp_path):
+    inputs = find_inputs(copy_inputs("Control", tmp_path))
+    results = list(compile_all(inputs, jobs=1, ast=True))
+
+    assert len(results) == len(inputs)
+    assert all(result.succeeded for result in results)
+    for filename in inputs:
+        with open(filename[: -len(".lms")] + ".py") as file:
+            assert file.read() == expected_code(filename)
+        with open(filename[: -len(".lms")] + ".gv") as file:
+            assert file.read().startswith('digraph {rankdir="TB"')
+
+
+def test_batch_parallel(tmp_path):
+    inputs = find_inputs(copy_inputs("Sound", tmp_path))
+    results = list(compile_all(inputs, jobs=2))
+
+    assert sorted(result.input_filename for result in results) == inputs
+    assert all(result.succeeded for result in results)
+
+
+def test_batch_existing_output(tmp_path):
+    inputs = find_inputs(copy_inputs("Events", tmp_path))
+    assert all(result.succeeded for result in compile_all(inputs, jobs=1))
+
+    # Without overwrite the existing outputs are left alone and reported
+    results = list(compile_all(inputs, jobs=1))
+    assert not results[0].succeeded
+    assert "FileExistsError" in results[0].error
+
+    assert all(
+        result.succeeded for result in compile_all(inputs, jobs=1, overwrite=True)
+    )
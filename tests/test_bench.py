@@ -0,0 +1,67 @@
+# Tests to check that the benchmarks run and measure what they should.
+from src.abstract_syntax_tree import Node
+from src.bench import corpus_files
+from src.bench.__main__ import STAGES, benchmark, main, percentile, report
+from src.bench.memory import measure
+from src.bench.startup import DEFERRED_MODULES, IMPORT_BUDGET, import_times
+
+
+def node_classes(cls=Node):
+    # All node modules are imported by the visitor
+    yield cls
+    for subclass in cls.__subclasses__():
+        if subclass.__module__.startswith("src."):
+            yield from node_classes(subclass)
+
+
+def test_bench_nodes_have_no_dict():
+    for cls in node_classes():
+        assert "__slots__" in cls.__dict__, cls.__name__
+        assert not hasattr(object.__new__(cls), "__dict__"), cls.__name__
+
+
+def test_bench_memory():
+    report = measure(corpus_files("tests/inputs/Control"))
+    assert report.files == len(corpus_files("tests/inputs/Control"))
+    assert report.nodes > 0
+    assert report.slots_bytes < report.dict_bytes
+
+
+def test_bench_startup():
+    times = import_times(["src.__main__"])
+    # Nothing that is only needed to compile should be imported to parse the arguments
+    assert [module for module in DEFERRED_MODULES if module in times] == []
+    assert times["src.__main__"] < IMPORT_BUDGET
+
+
+def test_bench_percentile():
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile(list(range(101)), 0.95) == 95
+    assert percentile([1, 2], 0.95) == 1.95
+    assert percentile([7], 0.95) == 7
+
+
+def test_bench_stages():
+    results = benchmark(corpus_files("tests/inputs/Sensors"), repeat=1)
+    assert results["files"] + len(results["skipped"]) == len(
+        corpus_files("tests/inputs/Sensors")
+    )
+    # Key pressed has no Python equivalent
+    assert list(results["skipped"]) == [
+        "tests/inputs/Sensors/key_pressed/key_pressed.lms"
+    ]
+    assert list(results["stages"]) == STAGES
+    for stage in STAGES:
+        timing = results["stages"][stage]["time"]
+        assert 0 <= timing["median"] <= timing["p95"] <= timing["total"]
+
+    # Compared with itself nothing changed
+    assert "+0.0%" in report(results, results)
+
+
+def test_bench_no_files(tmp_path, capsys):
+    assert main(str(tmp_path), repeat=1) == 1
+    assert capsys.readouterr().out == f"No files to benchmark in {tmp_path}.\n"
+    # Files that are all skipped leave nothing to summarize either
+    results = benchmark(["tests/inputs/Sensors/key_pressed/key_pressed.lms"], repeat=1)
+    assert results["files"] == 0 and results["stages"] == {}
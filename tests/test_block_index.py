@@ -0,0 +1,135 @@
+# Tests to check that the block index is built correctly and that every stack is compiled.
+import pytest
+
+from src.block_index import BlockIndex
+from src.code_generator import CodeGenerator
+from src.compiler import compile_json
+from src.json_parser import extract_json, filter_json
+from src.visitor import Visitor
+
+
+def block(opcode: str, parent: str = None, next: str = None, **kwargs) -> dict:
+    return {
+        "opcode": opcode,
+        "next": next,
+        "parent": parent,
+        "inputs": {},
+        "fields": {},
+        "shadow": False,
+        "topLevel": parent is None,
+        **kwargs,
+    }
+
+
+def test_block_index():
+    cst = filter_json(
+        extract_json(
+            "tests/inputs/Motors/stop_motor_port_list/stop_motor_port_list.lms"
+        )
+    )
+    index = BlockIndex(cst["blocks"])
+    assert len(index) == 4
+    # The port selector is a top-level shadow block, not the start of a stack
+    assert index.hats == ["0_1RNOXdpfpvURoD1cRq"]
+    assert index.with_opcode("flippermotor_multiple-port-selector") == [
+        "GOfxB5?J$oTT-5BelR7O"
+    ]
+    assert index.with_opcode("flippermotor_motorStart") == []
+    assert index.parent("m0K!Zz!)w%w3kT_m4Dfi") == "M67S%iae(6c[;U6^!j,/"
+    assert index.parent("0_1RNOXdpfpvURoD1cRq") is None
+    assert index.root("m0K!Zz!)w%w3kT_m4Dfi") == "0_1RNOXdpfpvURoD1cRq"
+    assert "GOfxB5?J$oTT-5BelR7O" in index
+
+
+def test_block_records():
+    cst = filter_json(
+        extract_json(
+            "tests/inputs/Motors/stop_motor_port_list/stop_motor_port_list.lms"
+        )
+    )
+    index = BlockIndex(cst["blocks"])
+    hat = index["0_1RNOXdpfpvURoD1cRq"]
+    assert hat.opcode == "flipperevents_whenProgramStarts"
+    assert (hat.x, hat.y) == (-130, 120)
+    assert hat.next == "M67S%iae(6c[;U6^!j,/"
+
+    # The inputs are unpacked to the block id or the value that is used
+    add_to_list = index["M67S%iae(6c[;U6^!j,/"]
+    assert add_to_list.inputs == {"ITEM": [10, "A"]}
+    assert add_to_list.fields == {"LIST": "my_list"}
+    assert add_to_list.menu is None
+    stop = index["m0K!Zz!)w%w3kT_m4Dfi"]
+    assert stop.inputs == {"PORT": [13, "my_list", "CJn,IAVC=+vf/3D@2XX*"]}
+    assert (stop.x, stop.y) == (None, None)
+
+    # The field of a menu block is its value
+    selector = index["GOfxB5?J$oTT-5BelR7O"]
+    assert selector.menu == "A"
+    assert selector.fields == {}
+    assert selector.shadow and selector.top_level and not selector.is_hat()
+
+
+def test_block_index_multiple_stacks():
+    blocks = {
+        "first": block("flipperevents_whenProgramStarts", next="stop", x=0, y=0),
+        "stop": block("flippermove_stopMove", "first"),
+        "loose": block("flippermove_stopMove"),
+        "second": block("flipperevents_whenProgramStarts", next="text", x=0, y=200),
+        "text": block(
+            "flipperdisplay_ledText", "second", inputs={"TEXT": [1, [10, "Hi"]]}
+        ),
+        # Loose variable reporters are stored as lists
+        "reporter": [12, "variable", "variable-id", 0, 0],
+    }
+    index = BlockIndex(blocks)
+    assert index.hats == ["first", "second"]
+    assert index.with_opcode("flippermove_stopMove") == ["stop", "loose"]
+    assert "reporter" not in index
+
+    abstract_syntax_tree = Visitor(best_effort=False).visit({"blocks": blocks})
+    assert len(abstract_syntax_tree.hat_nodes) == 2
+    code = CodeGenerator().generate(abstract_syntax_tree)
+    # Both stacks are generated, in order, and the loose stack is left out
+    assert (
+        """# Write your program here.
+motor_pair.stop()
+hub.light_matrix.write('Hi')
+"""
+        in code
+    )
+
+
+def test_unsupported_hat():
+    cst = filter_json(extract_json("tests/inputs/Control/if_then/if_then.lms"))
+    cst["blocks"]["button"] = block("flipperevents_whenButton", next="stop", x=0, y=400)
+    cst["blocks"]["stop"] = block("flippermove_stopMove", "button")
+    # The stack of the unsupported hat is replaced by a placeholder, the other stack is still generated
+    code = compile_json(cst, best_effort=True).code
+    assert "# Placeholder for the stack of the flipperevents_whenButton block." in code
+    assert "motor_pair.stop()" not in code
+    assert "hub.light_matrix.write" in code
+    with pytest.raises(NotImplementedError, match="flipperevents_whenButton"):
+        compile_json(cst, best_effort=False)
+
+
+def test_stack_after_forever_loop():
+    blocks = {
+        "first": block("flipperevents_whenProgramStarts", next="loop", x=0, y=0),
+        "loop": block("control_forever", "first", inputs={"SUBSTACK": [2, "stop"]}),
+        "stop": block("flippermove_stopMove", "loop"),
+        "second": block("flipperevents_whenProgramStarts", next="text", x=0, y=200),
+        "text": block(
+            "flipperdisplay_ledText", "second", inputs={"TEXT": [1, [10, "Hi"]]}
+        ),
+    }
+    code = CodeGenerator().generate(
+        Visitor(best_effort=False).visit({"blocks": blocks})
+    )
+    assert (
+        """while True:
+\tmotor_pair.stop()
+# Note: This stack never runs, since the stacks run after each other and the stack before it never ends.
+hub.light_matrix.write('Hi')
+"""
+        in code
+    )
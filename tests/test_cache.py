@@ -0,0 +1,72 @@
+# Tests to check that compiled projects are cached correctly.
+import os
+
+from src.cache import CompilationCache
+from src.compiler import compile_lms
+from src.json_parser import extract_json, filter_json
+from src.visitor import Visitor
+
+FILENAME = "tests/inputs/Control/if_then/if_then.lms"
+
+
+def test_cache_hit(tmp_path, monkeypatch):
+    cache = CompilationCache(str(tmp_path))
+    miss = compile_lms(FILENAME, ast=True, cache=cache)
+    assert not miss.cached
+
+    # On a hit neither the AST nor the code should be generated
+    def fail(self, cst):
+        raise AssertionError("The project should not be visited")
+
+    monkeypatch.setattr(Visitor, "visit", fail)
+    hit = compile_lms(FILENAME, ast=True, cache=cache)
+    assert hit.cached
+    assert hit.code == miss.code
+    assert hit.ast_representation == miss.ast_representation
+
+
+def test_cache_miss_without_ast(tmp_path):
+    cache = CompilationCache(str(tmp_path))
+    compile_lms(FILENAME, cache=cache)
+    # The AST representation was not cached the first time
+    assert not compile_lms(FILENAME, ast=True, cache=cache).cached
+    assert compile_lms(FILENAME, ast=True, cache=cache).cached
+
+
+def test_cache_key():
+    concrete_syntax_tree = filter_json(extract_json(FILENAME))
+    key = CompilationCache.key(concrete_syntax_tree, False, True)
+    assert key == CompilationCache.key(concrete_syntax_tree, False, True)
+    assert key != CompilationCache.key(concrete_syntax_tree, True, True)
+    assert key != CompilationCache.key(concrete_syntax_tree, False, False)
+    assert key != CompilationCache.key(concrete_syntax_tree, False, True, True)
+
+    concrete_syntax_tree["variables"]["id"] = ["my_variable", 0]
+    assert key != CompilationCache.key(concrete_syntax_tree, False, True)
+
+
+def test_cache_eviction(tmp_path):
+    cache = CompilationCache(str(tmp_path), max_size=100)
+    cache.store("old", "py", "a" * 60)
+    os.utime(cache.path("old", "py"), (0, 0))
+    cache.store("new", "py", "b" * 60)
+
+    # The least recently used entry is evicted to get below the cap
+    assert cache.load("old", "py") is None
+    assert cache.load("new", "py") == "b" * 60
+    assert cache.size() == 60
+
+
+def test_cache_eviction_keeps_stored(tmp_path):
+    cache = CompilationCache(str(tmp_path), max_size=100)
+    cache.store("old", "py", "a" * 10)
+    # Stored at the same time as the older entry
+    cache.store("new", "py", "b" * 60)
+    timestamp = os.stat(cache.path("old", "py")).st_mtime
+    os.utime(cache.path("new", "py"), (timestamp, timestamp))
+    # Bigger than the cache by itself, the code of the same key is kept as well
+    cache.store("new", "gv", "c" * 200)
+
+    assert cache.load("old", "py") is None
+    assert cache.load("new", "py") == "b" * 60
+    assert cache.load("new", "gv") == "c" * 200
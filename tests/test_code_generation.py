@@ -1,7 +1,14 @@
 # Test to check that the Code is generated correctly
+import sys
+
 from pytest import raises
 
-from src.code_generator import CodeGenerator
+from src.abstract_syntax_tree import AST, Node, NumericalNode
+from src.abstract_syntax_tree.events import WhenProgramStartsNode
+from src.abstract_syntax_tree.motors import StartMotorNode, TurnDirection
+from src.abstract_syntax_tree.movement import StopMovingNode
+from src.abstract_syntax_tree.variables import ListLiteralNode
+from src.code_generator import CodeBuffer, CodeGenerator
 from src.json_parser import extract_json, filter_json
 from src.visitor import Visitor
 
@@ -2233,7 +2240,7 @@ def test_code_repeat_loop_base():
 hub = MSHub()
 
 # Write your program here.
-for _ in range(3.0):
+for _ in range(int(3.0)):
 \thub.light_matrix.write('Y')
 \thub.light_matrix.write('_')
 
@@ -2251,7 +2258,7 @@ hub = MSHub()
 
 # Write your program here.
 my_variable = 2.0
-for _ in range(my_variable):
+for _ in range(int(my_variable)):
 \thub.light_matrix.write('Y')
 \thub.light_matrix.write('_')
 
@@ -4440,3 +4447,71 @@ if my_variable in my_list:
 
 """
     )
+
+
+# ---------- Dispatch ----------
+def test_code_dispatch_unknown_node():
+    with raises(NotImplementedError, match="Currently no code can be generated for"):
+        CodeGenerator().visit(Node())
+
+
+def test_code_dispatch_node_subclass():
+    class IntegerNode(NumericalNode):
+        pass
+
+    assert CodeGenerator.handler_for(IntegerNode) is CodeGenerator.handler_for(
+        NumericalNode
+    )
+    assert CodeGenerator().visit(IntegerNode(3)) == 3
+
+
+def test_code_dispatch_generator_subclass():
+    class VerboseCodeGenerator(CodeGenerator):
+        def visit_numerical_node(self, node: NumericalNode):
+            return f"float({node.value})"
+
+    assert VerboseCodeGenerator().visit(NumericalNode(3.0)) == "float(3.0)"
+    assert CodeGenerator().visit(NumericalNode(3.0)) == 3.0
+
+
+# ---------- Long stacks ----------
+def test_code_long_stack():
+    # Much longer than the recursion limit, to check the stack is not generated recursively
+    length = 5 * sys.getrecursionlimit()
+    node = None
+    for _ in range(length):
+        node = StopMovingNode(node)
+    ast = AST()
+    ast.hat_nodes.append(WhenProgramStartsNode(0, 0, node))
+
+    code = CodeGenerator().generate(ast)
+    assert code.count("motor_pair.stop()\n") == length
+
+
+def test_code_next_after_multiple_ports():
+    ast = AST()
+    ast.hat_nodes.append(
+        WhenProgramStartsNode(
+            0,
+            0,
+            StartMotorNode(
+                ListLiteralNode(["A", "B"]),
+                TurnDirection.CLOCKWISE,
+                StopMovingNode(None),
+            ),
+        )
+    )
+
+    code = CodeGenerator().generate(ast)
+    assert code.count("motor_pair.stop()\n") == 1
+
+
+def test_code_buffer():
+    buffer = CodeBuffer()
+    buffer.add("while True:")
+    buffer.indent()
+    buffer.add("a = 1", "b = 2")
+    buffer.dedent()
+    buffer.add("c = 3")
+    assert len(buffer) == 4
+    assert str(buffer) == "while True:\n\ta = 1\n\tb = 2\nc = 3\n"
@@ -1,7 +1,14 @@
 # Tests to check if the json is extracted correctly from the .lms input files.
 
+import gc
 import json
+import math
+import zipfile
 
+from pytest import raises
+
+import src.json_parser
+from src.garbage_collector import gc_paused
 from src.json_parser import extract_json
 
 
@@ -1179,3 +1186,66 @@ def test_extract_json_list_contains_base():
 
 def test_extract_json_list_contains_variable():
     helper("list_contains_variable", "Variables")
+
+
+# ---------- Extraction modes ----------
+def repack(filename: str, directory: str, destination, compression: int) -> str:
+    """Copies a test input while storing the inner scratch.sb3 with the given compression.
+
+    :param filename: The name of the file that should be copied.
+    :param directory: The folder that the file is in.
+    :param destination: The folder to write the copy to.
+    :param compression: The compression that should be used for scratch.sb3.
+    :return: The path of the copy.
+    """
+    source = f"tests/inputs/{directory}/{filename}/{filename}.lms"
+    target = f"{destination}/{filename}.lms"
+    with zipfile.ZipFile(source) as original, zipfile.ZipFile(target, "w") as copy:
+        for info in original.infolist():
+            copy.writestr(info.filename, original.read(info), compress_type=compression)
+    return target
+
+
+def test_extract_json_stored_inner_archive(tmp_path):
+    path = repack("if_then_else", "Control", tmp_path, zipfile.ZIP_STORED)
+    with open("tests/inputs/Control/if_then_else/project.json", "r") as file:
+        assert extract_json(path) == json.load(file)
+
+
+def test_extract_json_spooled_to_disk():
+    with open("tests/inputs/Control/if_then_else/project.json", "r") as file:
+        assert extract_json(
+            "tests/inputs/Control/if_then_else/if_then_else.lms", spool_threshold=0
+        ) == json.load(file)
+
+
+def test_loads(monkeypatch):
+    data = b'{"blocks": {"id": {"opcode": "control_wait", "x": -1.5}}, "unicode": "\\u00e9"}'
+    expected = json.loads(data)
+    assert src.json_parser.loads(data) == expected
+    # Without orjson the json module is used
+    monkeypatch.setattr(src.json_parser, "orjson", None)
+    assert src.json_parser.loads(data) == expected
+
+
+def test_loads_not_strict():
+    # orjson rejects NaN, the json module does not
+    assert math.isnan(src.json_parser.loads(b'{"value": NaN}')["value"])
+    with raises(json.JSONDecodeError):
+        src.json_parser.loads(b'{"value": }')
+
+
+def test_gc_paused():
+    assert gc.isenabled()
+    with gc_paused():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with gc_paused():
+            pass
+        # A collector that was already paused is left paused
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,499 @@
+# Tests to check that the optimizer rewrites the AST correctly.
+from src.__main__ import run
+from src.abstract_syntax_tree import (
+    AST,
+    BooleanLiteralNode,
+    CommentNode,
+    LiteralNode,
+    NumericalNode,
+)
+from src.abstract_syntax_tree.control import (
+    ForeverLoopNode,
+    IfElseNode,
+    IfThenNode,
+    RepeatLoopNode,
+    RepeatUntilNode,
+    StopNode,
+    WaitUntilNode,
+)
+from src.abstract_syntax_tree.events import WhenProgramStartsNode
+from src.abstract_syntax_tree.light import SetPixelBrightnessNode, TurnOnNode
+from src.abstract_syntax_tree.motors import (
+    RunMotorForDurationNode,
+    StartMotorNode,
+    StopMotorNode,
+    TurnDirection,
+    Unit,
+)
+from src.abstract_syntax_tree.movement import SetMovementSpeedNode
+from src.abstract_syntax_tree.operators import (
+    ArithmeticalNode,
+    BinaryFunction,
+    BinaryMathFunctionNode,
+    ComparisonNode,
+    ComparisonOperator,
+    IsBetweenNode,
+    JoinStringsNode,
+    ModNode,
+    NotNode,
+    Operation,
+    RoundNode,
+    UnaryFunction,
+    UnaryMathFunctionNode,
+)
+from src.abstract_syntax_tree.sensors import (
+    DistanceComparator,
+    DistanceNode,
+    DistanceUnit,
+    IsColorNode,
+    IsDistanceNode,
+    IsReflectionNode,
+    ReflectedLightNode,
+    ReflectionComparator,
+    SensorColor,
+)
+from src.abstract_syntax_tree.variables import (
+    ChangeVariableByNode,
+    DeleteItemInListNode,
+    ListLiteralNode,
+    SetVariableToNode,
+    VariableNode,
+)
+from src.code_generator import CodeGenerator
+from src.compiler import compile_lms
+from src.optimizer import Optimizer
+from src.optimizer.type_inference import Type, TypeInference
+
+
+def program(filename: str, directory: str = "Operators") -> str:
+    """Compiles an input with the optimizer and returns the code after '# Write your program here.'."""
+    code = compile_lms(
+        f"tests/inputs/{directory}/{filename}/{filename}.lms", optimize=True
+    ).code
+    return code.split("# Write your program here.\n")[1].strip()
+
+
+def fold(value) -> str:
+    """Optimizes an AST that sets a variable to value and returns the code of the value."""
+    ast = AST()
+    ast.hat_nodes.append(
+        WhenProgramStartsNode(0, 0, SetVariableToNode("x", value, None))
+    )
+    code = CodeGenerator(optimize=True).generate(Optimizer().optimize(ast))
+    return code.split("x = ")[1].strip()
+
+
+# ---------- Constant folding ----------
+def test_constant_folding_arithmetic():
+    assert program("arithmetic") == "motor_a.run_for_rotations(0.5999999999999996)"
+
+
+def test_constant_folding_math_function():
+    assert program("math_function_sqrt") == "hub.light_matrix.write(2)"
+    assert program("math_function_pow") == "hub.light_matrix.write(8)"
+
+
+def test_constant_folding_comparison():
+    # The if block is replaced by its body, since its condition is always true
+    assert program("and") == "hub.light_matrix.write('Y')"
+    # The folded comparison is negated as well
+    assert program("not") == "hub.light_matrix.write('Y')"
+
+
+def test_constant_folding_strings():
+    assert program("join_strings_base") == "hub.light_matrix.write('HelloWorld')"
+    assert program("letter_of_string_base") == "hub.light_matrix.write('a')"
+    assert program("length_of_string_base") == "hub.light_matrix.write(5)"
+
+
+def test_constant_folding_partial():
+    # Only the constant part of the expression is folded
+    value = ArithmeticalNode(
+        Operation.PLUS,
+        VariableNode("y", "y"),
+        ArithmeticalNode(Operation.MULTIPLY, NumericalNode(2.0), NumericalNode(3.0)),
+    )
+    assert fold(value) == "(y + 6)"
+
+
+def test_constant_folding_errors():
+    # The hub should still raise the error when the code runs
+    assert (
+        fold(ArithmeticalNode(Operation.DIVIDE, NumericalNode(1.0), NumericalNode(0.0)))
+        == "(1 / 0)"
+    )
+    assert (
+        fold(UnaryMathFunctionNode(UnaryFunction.SQRT, NumericalNode(-1.0)))
+        == "math.sqrt(-1)"
+    )
+    assert (
+        fold(ArithmeticalNode(Operation.PLUS, LiteralNode("a"), NumericalNode(1.0)))
+        == "('a' + 1)"
+    )
+
+
+def test_constant_folding_unrepresentable():
+    # Values that can't be written as a constant are not folded
+    power = BinaryMathFunctionNode(
+        BinaryFunction.POW, NumericalNode(-8.0), NumericalNode(0.5)
+    )
+    assert fold(power) == "pow(-8, 0.5)"
+    join = JoinStringsNode(LiteralNode("it"), LiteralNode("'s"))
+    assert fold(join) == "'it' + ''s'"
+
+
+def test_constant_folding_join_in_operator():
+    # The join is not parenthesized, folding it would change what the operator applies to
+    join = JoinStringsNode(LiteralNode("a"), LiteralNode("b"))
+    assert fold(ModNode(VariableNode("y", "y"), join)) == "y % 'a' + 'b'"
+    # 3 * 'a' + 'b' is 'aaab', the folded 3 * 'ab' would be 'ababab'
+    join = JoinStringsNode(LiteralNode("a"), LiteralNode("b"))
+    assert (
+        fold(ArithmeticalNode(Operation.MULTIPLY, NumericalNode(3), join))
+        == "(3 * 'a' + 'b')"
+    )
+
+
+def test_constant_folding_boolean():
+    comparison = ComparisonNode(
+        ComparisonOperator.LESS, NumericalNode(1.0), NumericalNode(2.0)
+    )
+    ast = AST()
+    ast.hat_nodes.append(
+        WhenProgramStartsNode(0, 0, SetVariableToNode("x", comparison, None))
+    )
+    Optimizer().optimize(ast)
+    folded = ast.hat_nodes[0].next.value
+    assert isinstance(folded, BooleanLiteralNode) and folded.value is True
+    assert str(folded) == "BooleanLiteralNode(True)"
+    assert fold(NotNode(comparison)) == "False"
+    assert fold(NotNode(VariableNode("y", "y"))) == "not y"
+
+
+# ---------- Dead code elimination ----------
+def stack(*nodes):
+    """Links the nodes through their next pointer, behind a WhenProgramStarts node."""
+    for node, next in zip(nodes, nodes[1:]):
+        node.next = next
+    return WhenProgramStartsNode(0, 0, nodes[0] if nodes else None)
+
+
+def comment(text: str) -> CommentNode:
+    return CommentNode(f"# {text}", None)
+
+
+def eliminate(*nodes) -> tuple:
+    """Optimizes a stack of nodes and returns the code of the program and the report."""
+    ast = AST()
+    ast.hat_nodes.append(stack(*nodes))
+    optimizer = Optimizer()
+    code = CodeGenerator(optimize=True).generate(optimizer.optimize(ast))
+    return code.split("# Write your program here.\n")[1].strip(), optimizer.report
+
+
+def test_dead_code_after_forever_loop():
+    loop = ForeverLoopNode(stack(comment("a")).next, None)
+    code, report = eliminate(loop, comment("b"), comment("c"))
+    assert code == "while True:\n\t# a"
+    assert report == ["Removed 2 unreachable block(s) after a forever loop."]
+
+
+def test_dead_code_after_stop():
+    stop = StopNode("# Placeholder for the STOP block.", None)
+    code, report = eliminate(comment("a"), stop, comment("b"))
+    assert code == "# a\n# Placeholder for the STOP block."
+    assert report == ["Removed 1 unreachable block(s) after a stop block."]
+
+
+def test_dead_code_empty_bodies():
+    condition = ComparisonNode(
+        ComparisonOperator.LESS, VariableNode("y", "y"), NumericalNode(1.0)
+    )
+    code, report = eliminate(
+        IfThenNode(condition, None, None),
+        IfElseNode(condition, None, comment("a"), None),
+        RepeatUntilNode(condition, None, None),
+    )
+    assert code == "if not (y < 1):\n\t# a\nwait_until(lambda: (y < 1))"
+    assert report == [
+        "Removed an if block with an empty body.",
+        "Removed the empty body of an if else block.",
+        "Replaced a repeat until block with an empty body by a wait until block.",
+    ]
+
+
+def test_dead_code_constant_condition():
+    # The if block is folded away, the forever loop in its body ends the stack
+    condition = ComparisonNode(
+        ComparisonOperator.GREATER, NumericalNode(2.0), NumericalNode(1.0)
+    )
+    loop = ForeverLoopNode(stack(comment("a")).next, None)
+    code, report = eliminate(
+        IfElseNode(condition, loop, comment("b"), None), comment("c")
+    )
+    assert code == "while True:\n\t# a"
+    assert report == [
+        "Removed the else body of an if else block, the condition is always True.",
+        "Removed 1 unreachable block(s) after a forever loop.",
+    ]
+
+
+def test_optimize_report(capsys):
+    run(["tests/inputs/Control/if_then/if_then.lms", "--optimize"])
+    captured = capsys.readouterr()
+    assert "Replaced an if block by its body" in captured.err
+    assert "Replaced an if block" not in captured.out
+
+
+# ---------- Type inference ----------
+def test_integer_literals():
+    assert program("repeat_loop_base", "Control").startswith("for _ in range(3):")
+    assert (
+        program("pick_random_number_base") == "hub.light_matrix.write(randint(1, 10))"
+    )
+
+
+def test_repeat_loop_count():
+    # A count that is not known to be an int is converted, range() only accepts ints
+    set_y = SetVariableToNode("y", NumericalNode(1.5), None)
+    loop_y = RepeatLoopNode(VariableNode("y", "y"), comment("a"), None)
+    distance = DistanceNode(ListLiteralNode(["A"]), DistanceUnit.CM)
+    loop_distance = RepeatLoopNode(distance, comment("b"), None)
+    code, _ = eliminate(set_y, loop_y, loop_distance)
+    assert "for _ in range(int(y)):" in code
+    assert "for _ in range(int(distance_sensor_a.get_distance_cm())):" in code
+
+    ast = AST()
+    ast.hat_nodes.append(
+        stack(
+            RepeatLoopNode(VariableNode("y", "y"), comment("a"), None),
+            RepeatLoopNode(
+                DistanceNode(ListLiteralNode(["A"]), DistanceUnit.CM),
+                comment("b"),
+                None,
+            ),
+        )
+    )
+    code = CodeGenerator().generate(ast)
+    assert "for _ in range(int(y)):" in code
+    assert "for _ in range(int(distance_sensor_a.get_distance_cm())):" in code
+
+
+def test_type_inference_variables():
+    # x only ever holds ints, y might hold a float
+    set_x = SetVariableToNode("x", NumericalNode(1), None)
+    change_x = ChangeVariableByNode(
+        "x",
+        ArithmeticalNode(Operation.MULTIPLY, VariableNode("x", "x"), NumericalNode(2)),
+        None,
+    )
+    set_y = SetVariableToNode(
+        "y",
+        ArithmeticalNode(Operation.PLUS, VariableNode("x", "x"), NumericalNode(0.5)),
+        None,
+    )
+    ast = AST()
+    ast.hat_nodes.append(stack(set_x, change_x, set_y))
+    types = TypeInference(ast)
+    assert types.variables == {"x": Type.INT, "y": Type.FLOAT}
+    assert types.type_of(VariableNode("z", "z")) is Type.UNKNOWN
+    assert (
+        types.type_of(
+            ArithmeticalNode(
+                Operation.DIVIDE, VariableNode("x", "x"), VariableNode("x", "x")
+            )
+        )
+        is Type.FLOAT
+    )
+    assert types.type_of(RoundNode(VariableNode("y", "y"))) is Type.INT
+
+
+def test_type_inference_conversions():
+    # The int(...) is only left out if the value is known to be an int
+    set_x = SetVariableToNode("x", NumericalNode(90.0), None)
+    set_y = SetVariableToNode("y", NumericalNode(0.5), None)
+    speed_x = SetMovementSpeedNode(VariableNode("x", "x"), None)
+    speed_y = SetMovementSpeedNode(VariableNode("y", "y"), None)
+    code, _ = eliminate(set_x, set_y, speed_x, speed_y)
+    lines = code.split("\n")
+    assert lines[0] == "x = 90"
+    assert lines[2] == "motor_pair.set_default_speed(x)"
+    assert (
+        lines[3]
+        == "motor_pair.set_default_speed(int(y))  # Note: This method expects an integer so wee need to convert the value."
+    )
+
+    # The note that the index starts with 0 is kept without the conversion
+    delete = DeleteItemInListNode("list", NumericalNode(2), None)
+    code, _ = eliminate(delete)
+    assert code.strip() == "del list[2 - 1]  # Note: This method starts with 0 not 1."
+
+
+# ---------- Constant pool ----------
+def test_constant_pool():
+    code = compile_lms("tests/inputs/Sensors/color/color.lms", optimize=True).code
+    assert (
+        "_COLOR_CODES = {None:-1, 'black':0, 'violet':1, 'blue':3, 'cyan':4, 'green':5, 'yellow': 7, 'red':9, 'white':10}"
+        in code
+    )
+    assert "hub.light_matrix.write(_COLOR_CODES[color_sensor_a.get_color()])" in code
+
+
+def test_constant_pool_once():
+    code_generator = CodeGenerator(optimize=True)
+    assert code_generator.generate_constant("_TABLE", "{1:2}") == "_TABLE"
+    assert code_generator.generate_constant("_TABLE", "{1:2}") == "_TABLE"
+    # Another structure gets another name
+    assert code_generator.generate_constant("_TABLE", "{3:4}") == "_TABLE_1"
+    assert str(code_generator.objects_code) == "_TABLE = {1:2}\n_TABLE_1 = {3:4}\n"
+    # Without optimizing the structure is used where it is needed
+    assert CodeGenerator().generate_constant("_TABLE", "{1:2}") == "{1:2}"
+
+
+def test_optimize_off():
+    code = compile_lms("tests/inputs/Operators/arithmetic/arithmetic.lms").code
+    assert "(1.0 + (2.0 - (3.0 * (4.0 / 5.0))))" in code
+    code = compile_lms("tests/inputs/Light/set_pixel_base/set_pixel_base.lms").code
+    assert "set_pixel(int(1.0)-1, int(1.0)-1, int(100.0))" in code
+
+
+# ---------- Light matrix images ----------
+def test_image_decoded():
+    code = compile_lms(
+        "tests/inputs/Light/turn_on_custom/turn_on_custom.lms", optimize=True
+    ).code
+    assert (
+        "_IMAGE = ((0, 0, 0), (1, 0, 0), (2, 0, 0), (3, 0, 0), (4, 0, 0), (0, 1, 0), (1, 1, 100),"
+        in code
+    )
+    assert "_turn_on_pattern" not in code
+    assert code.endswith("_turn_on_pixels(_IMAGE)\n\n")
+
+
+def test_image_once():
+    ast = AST()
+    ast.hat_nodes.append(
+        stack(
+            TurnOnNode("9" * 25, None),
+            TurnOnNode("0" * 25, None),
+            TurnOnNode("9" * 25, None),
+            SetPixelBrightnessNode(NumericalNode(50), None),
+            TurnOnNode("9" * 25, None),
+        )
+    )
+    code = CodeGenerator(optimize=True).generate(ast)
+    # Every helper and every image is generated once
+    assert code.count("def _turn_on_pixels(pixels):") == 1
+    assert code.count("def _turn_on_levels(pixels, brightness):") == 1
+    program = code.split("# Write your program here.\n")[1].strip()
+    assert program.split("\n") == [
+        "_turn_on_pixels(_IMAGE)",
+        "_turn_on_pixels(_IMAGE_1)",
+        "_turn_on_pixels(_IMAGE)",
+        "_brightness = 50",
+        "_turn_on_levels(_IMAGE_2, _brightness)",
+    ]
+    assert "_IMAGE_2 = ((0, 0, 9), (1, 0, 9)," in code
+
+
+# ---------- Device objects ----------
+def test_device_objects_shared():
+    ast = AST()
+    ast.hat_nodes.append(
+        stack(
+            StartMotorNode(ListLiteralNode(["A"]), TurnDirection.CLOCKWISE, None),
+            StopMotorNode(VariableNode("ports", "ports"), None),
+            StopMotorNode(VariableNode("ports", "ports"), None),
+        )
+    )
+    code = CodeGenerator(optimize=True).generate(ast)
+    # The object of the fixed port is the one the variable port gets
+    assert "motor_a = Motor('A')\n_devices = {(Motor, 'A'): motor_a}\n" in code
+    assert code.count("def _device(constructor, port):") == 1
+    assert code.count("\t_device(Motor, port).stop()") == 2
+
+
+def test_device_objects_off():
+    code = compile_lms(
+        "tests/inputs/Motors/stop_motor_port_variable/stop_motor_port_variable.lms"
+    ).code
+    assert "\tMotor(port).stop()" in code
+    assert "_device" not in code
+
+
+# ---------- Sensor reads ----------
+def test_sensor_reads_shared():
+    port = ListLiteralNode(["A"])
+    distance = DistanceNode(port, DistanceUnit.CM)
+    condition = ComparisonNode(
+        ComparisonOperator.OR,
+        IsBetweenNode(distance, NumericalNode(10), NumericalNode(20)),
+        IsDistanceNode(
+            port, DistanceComparator.GREATER, NumericalNode(50), DistanceUnit.CM
+        ),
+    )
+    code, _ = eliminate(SetVariableToNode("x", condition, None))
+    assert code.split("\n") == [
+        "_distance_sensor_a_distance_cm = distance_sensor_a.get_distance_cm()",
+        "x = (10 <= _distance_sensor_a_distance_cm <= 20 or _distance_sensor_a_distance_cm > 50)",
+    ]
+
+
+def test_sensor_reads_else_if_chain():
+    port = ListLiteralNode(["B"])
+    inner = IfElseNode(
+        IsReflectionNode(port, ReflectionComparator.LESS, NumericalNode(60)),
+        comment("grey"),
+        comment("white"),
+        None,
+    )
+    # The body reads the sensor again, after the decision
+    outer = IfElseNode(
+        IsReflectionNode(port, ReflectionComparator.LESS, NumericalNode(30)),
+        SetVariableToNode("y", ReflectedLightNode(port), None),
+        inner,
+        None,
+    )
+    code, _ = eliminate(outer)
+    assert code.split("\n") == [
+        "_color_sensor_b_reflected_light = color_sensor_b.get_reflected_light()",
+        "if _color_sensor_b_reflected_light < 30:",
+        "\ty = color_sensor_b.get_reflected_light()",
+        "else:",
+        "\tif _color_sensor_b_reflected_light < 60:",
+        "\t\t# grey",
+        "\telse:",
+        "\t\t# white",
+    ]
+
+
+def test_sensor_reads_not_shared():
+    # The condition of a wait until block is evaluated again and again
+    port = ListLiteralNode(["C"])
+    condition = ComparisonNode(
+        ComparisonOperator.AND,
+        IsColorNode(port, SensorColor.RED),
+        IsColorNode(port, SensorColor.RED),
+    )
+    code, _ = eliminate(WaitUntilNode(condition, None))
+    assert code.count("color_sensor_c.get_color()") == 2
+    # Without optimizing every read is generated
+    ast = AST()
+    ast.hat_nodes.append(stack(SetVariableToNode("x", condition, None)))
+    assert CodeGenerator().generate(ast).count("color_sensor_c.get_color()") == 2
+
+
+def test_sensor_reads_motor_block():
+    # The ports of the motor block are not expressions that are generated
+    distance = DistanceNode(ListLiteralNode(["A"]), DistanceUnit.CM)
+    motor = RunMotorForDurationNode(
+        ListLiteralNode(["B"]),
+        TurnDirection.CLOCKWISE,
+        ArithmeticalNode(Operation.PLUS, distance, distance),
+        Unit.DEGREES,
+        None,
+    )
+    code, _ = eliminate(motor)
+    assert code.startswith(
+        "_distance_sensor_a_distance_cm = distance_sensor_a.get_distance_cm()\nmotor_b.run_for_degrees(int((_distance_sensor_a_distance_cm + _distance_sensor_a_distance_cm)))"
+    )
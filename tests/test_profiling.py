@@ -0,0 +1,50 @@
+# Tests to check that compilations are profiled correctly.
+import json
+
+from src.__main__ import run
+from src.compiler import compile_lms
+from src.profiling import profile_file
+
+FILENAME = "tests/inputs/Control/if_then_else/if_then_else.lms"
+
+
+def test_profile():
+    compilation, profile = profile_file(FILENAME, ast=True)
+    expected = compile_lms(FILENAME, ast=True)
+    assert compilation.code == expected.code
+    assert compilation.ast_representation == expected.ast_representation
+
+    stages = ["read", "decode", "filter", "visit", "generate", "tree_representation"]
+    assert list(profile.durations) == stages
+    assert list(profile.peaks) == stages
+    assert profile.node_counts == {
+        "WhenProgramStartsNode": 1,
+        "IfElseNode": 1,
+        "ComparisonNode": 1,
+        "NumericalNode": 2,
+        "WriteNode": 2,
+        "LiteralNode": 2,
+    }
+    assert profile.opcode_counts == {
+        "flipperevents_whenProgramStarts": 1,
+        "control_if_else": 1,
+        "operator_equals": 1,
+        "flipperdisplay_ledText": 2,
+    }
+
+
+def test_profile_option(capsys):
+    run([FILENAME, "--profile", "--profile-format", "json"])
+    captured = capsys.readouterr()
+    assert compile_lms(FILENAME).code in captured.out
+
+    profile = json.loads(captured.err)
+    assert list(profile["stages"]) == ["read", "decode", "filter", "visit", "generate"]
+    assert profile["nodes"]["WriteNode"] == 2
+    assert profile["opcodes"]["control_if_else"] == 1
+
+    run([FILENAME, "--profile"])
+    assert "Stage" in capsys.readouterr().err
+    # The flag can come before the input file as well
+    run(["--profile", FILENAME])
+    assert "Stage" in capsys.readouterr().err
@@ -0,0 +1,156 @@
+# Tests to check that the compile server compiles the files it receives.
+import http.client
+import io
+import json
+import socket
+import threading
+import zipfile
+
+from src.code_generator import CodeGenerator
+from src.json_parser import extract_json, filter_json
+from src.server import CompileServer, UnixCompileServer
+from src.visitor import Visitor
+
+FILENAME = "tests/inputs/Control/if_then/if_then.lms"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def start(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def post(connection, path: str, body: bytes):
+    connection.request("POST", path, body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def read_input(filename: str = FILENAME) -> bytes:
+    with open(filename, "rb") as file:
+        return file.read()
+
+
+def expected(filename: str = FILENAME):
+    abstract_syntax_tree = Visitor(True).visit(filter_json(extract_json(filename)))
+    return CodeGenerator().generate(abstract_syntax_tree), abstract_syntax_tree
+
+
+def test_server_compile():
+    server = start(CompileServer(("127.0.0.1", 0), jobs=1))
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        status, response = post(connection, "/compile?ast=1", read_input())
+        code, abstract_syntax_tree = expected()
+        assert status == 200
+        assert response["code"] == code
+        assert response["ast"] == abstract_syntax_tree.tree_representation()
+        assert not response["cached"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_invalid_input():
+    server = start(CompileServer(("127.0.0.1", 0), jobs=1))
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        status, response = post(connection, "/compile", b"not a zip file")
+        assert status == 400
+        assert response["error"].startswith("BadZipFile")
+
+        status, response = post(connection, "/compile?safe=maybe", read_input())
+        assert status == 400
+        assert response["error"] == "ValueError: Invalid value for safe: maybe"
+
+        # A zip without the project.json
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("manifest.json", "{}")
+        status, response = post(connection, "/compile", buffer.getvalue())
+        assert status == 400
+        assert response["error"].startswith("ValueError: Invalid project: KeyError")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_content_length():
+    server = start(CompileServer(("127.0.0.1", 0), jobs=1))
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        for length, status in ((None, 411), ("ten", 400), ("-1", 400)):
+            connection.putrequest("POST", "/compile")
+            if length is not None:
+                connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == status
+            response.read()
+            connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_internal_error():
+    server = start(CompileServer(("127.0.0.1", 0), jobs=1))
+    try:
+        # A pool that can't compile anymore is an error of the server, not of the request
+        server.pool.shutdown()
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        status, response = post(connection, "/compile", read_input())
+        assert status == 500
+        assert response["error"].startswith("RuntimeError")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def fail_to_compile(*args, **kwargs):
+    raise KeyError("opcode")
+
+
+def test_server_compiler_error(monkeypatch):
+    # A KeyError of the compiler is a bug, unlike one of reading the project (the workers are forked with the patch)
+    monkeypatch.setattr("src.server.compile_json", fail_to_compile)
+    server = start(CompileServer(("127.0.0.1", 0), jobs=1))
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        status, response = post(connection, "/compile", read_input())
+        assert status == 500
+        assert response["error"] == "KeyError: 'opcode'"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_unix_socket(tmp_path):
+    path = str(tmp_path / "compile.sock")
+    server = start(UnixCompileServer(path, jobs=2))
+    try:
+        results = {}
+
+        def request(index):
+            status, response = post(UnixHTTPConnection(path), "/compile", read_input())
+            results[index] = (status, response["code"])
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {i: (200, expected()[0]) for i in range(4)}
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,71 @@
+# Tests to check that synthetic projects are valid and that the compiler scales linearly with their size.
+import time
+import tracemalloc
+
+from src.bench.synthetic import ProjectGenerator, generate_lms
+from src.code_generator import CodeGenerator
+from src.json_parser import extract_json, filter_json
+from src.visitor import Visitor
+
+
+def compile_project(project: dict) -> str:
+    abstract_syntax_tree = Visitor(False).visit(filter_json(project))
+    return CodeGenerator().generate(abstract_syntax_tree)
+
+
+def fastest_compile(project: dict, repeat: int = 3) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compile_project(project)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def peak_memory(project: dict) -> int:
+    tracemalloc.start()
+    try:
+        compile_project(project)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_synthetic_block_count():
+    for blocks in [1, 2, 3, 10, 100, 1000]:
+        for depth in [0, 1, 5]:
+            project = ProjectGenerator(blocks, depth, seed=blocks + depth).generate()
+            assert len(project["targets"][1]["blocks"]) == blocks
+            # Without best effort every block has to be translatable
+            compile(compile_project(project), "synthetic", "exec")
+
+
+def test_synthetic_options():
+    project = ProjectGenerator(500, depth=2, variables=3, seed=1).generate()
+    assert project == ProjectGenerator(500, depth=2, variables=3, seed=1).generate()
+    assert project != ProjectGenerator(500, depth=2, variables=3, seed=2).generate()
+    assert len(project["targets"][1]["variables"]) == 3
+
+    code = compile_project(project)
+    assert "\t\t\t" not in code  # Never nested deeper than 2 control blocks
+    assert "variable_3" not in code
+
+    mix = {"flippermove_stopMove": 1}
+    project = ProjectGenerator(50, mix=mix).generate()
+    assert compile_project(project).count("motor_pair.stop()\n") == 49
+
+
+def test_synthetic_lms(tmp_path):
+    filename = generate_lms(f"{tmp_path}/synthetic.lms", 200, seed=3)
+    project = ProjectGenerator(200, seed=3).generate()
+    assert filter_json(extract_json(filename)) == filter_json(project)
+
+
+def test_synthetic_scaling():
+    # Roughly linear: 8 times the blocks may take at most 3 times as long per block (quadratic would be 8 times)
+    small = ProjectGenerator(1000, seed=0).generate()
+    large = ProjectGenerator(8000, seed=0).generate()
+    compile_project(small)  # Warm up
+
+    assert fastest_compile(large) < 8 * 3 * fastest_compile(small)
+    assert peak_memory(large) < 8 * 2 * peak_memory(small)